@@ -1,58 +1,228 @@
-from pathlib import Path
-import shutil
-import tempfile
-import os
+import asyncio
+from typing import List
 
 from fastapi import APIRouter, Form, HTTPException, UploadFile, File, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+from starlette.background import BackgroundTask
 
-from app.utils.chamber_l500_converter import (
-    chamber_l500_convert,
-    validate_document as validate_chamber_l500,
-)
-from app.utils.l500_chamber_converter import (
-    l500_chamber_convert,
-    validate_document as validate_l500_chamber,
-)
+from app.utils.batch_conversion import BatchTooLarge, close_items, convert_batch, read_batch, write_batch_archive
+from app.utils.conversion_engine import CONVERTERS, ConversionError, convert_document
+from app.utils.conversion_pool import ConversionPoolFull, ConversionWorkerLost, conversion_pool
+from app.utils.job_queue import DONE, JobNotFound, job_queue
+from app.utils.metrics import track_conversion
+from app.utils.result_cache import conversion_key, result_cache
+from app.utils.temp_files import remove_file
+from app.utils.timing import new_timings
+from app.utils.upload_buffer import UploadTooLarge, read_upload
 
 router = APIRouter()
 
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def record_worker_timings(timings, summary):
+    """
+    Adds the stage timings measured in the conversion worker to ``timings``.
+
+    The time the request spent waiting for a worker and shipping the document
+    to and from it is recorded as "queue": the wall-clock "conversion" span
+    minus the worker's own "total".
+    """
+    timings.merge(summary)
+    worker_total = summary.get("durations_ms", {}).get("total")
+    if worker_total is not None and "conversion" in timings.durations:
+        timings.add("queue", max(timings.durations["conversion"] - worker_total / 1000, 0.0))
+
+
+def timing_headers(timings, headers):
+    """Returns ``headers`` with a Server-Timing header listing ``timings``, when there are any."""
+    server_timing = timings.server_timing()
+    if server_timing:
+        return {**headers, "Server-Timing": server_timing}
+    return headers
+
+
 @router.post("/convert")
 async def convert_document_endpoint(
     file: UploadFile = File(...),
     mode: str = Form(...),
     preview: bool = Query(False),
     download: bool = Query(False),
+    cache: bool = Query(True),
 ):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp_in:
-        shutil.copyfileobj(file.file, tmp_in)
-        tmp_in_path = tmp_in.name
+    if mode not in CONVERTERS:
+        raise HTTPException(status_code=400, detail="Invalid conversion mode")
+
+    with track_conversion("convert", mode) as tracked:
+        return await convert_upload(file, mode, cache, tracked)
+
 
+async def convert_upload(file, mode, cache, tracked):
+    timings = new_timings()
     try:
-        if mode == "l500_chamber":
-            is_valid, validation_message = await validate_l500_chamber(tmp_in_path)
-            if not is_valid:
-                raise HTTPException(status_code=400, detail=validation_message)
-            template_path = Path(__file__).resolve().parent.parent / "utils" / "templateDestination.docx"
-            output_path = await l500_chamber_convert(tmp_in_path, template_path)
+        with timings.span("upload"):
+            upload = await read_upload(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    tracked.size = upload.size
 
-        elif mode == "chamber_l500":
-            is_valid, validation_message = await validate_chamber_l500(tmp_in_path)
-            if not is_valid:
-                raise HTTPException(status_code=400, detail=validation_message)
-            template_path = Path(__file__).resolve().parent.parent / "utils" / "legal 500.doc"
-            output_path = await chamber_l500_convert(tmp_in_path, template_path)
+    # Identical uploads converted with the same template and converter
+    # version are answered from the result cache; ?cache=false skips it
+    cache_key = None
+    if cache and result_cache.enabled:
+        with timings.span("cache_lookup"):
+            cache_key = await asyncio.to_thread(conversion_key, mode, upload.source)
+            cached_path = result_cache.get(cache_key)
+        if cached_path is not None:
+            upload.close()
+            tracked.outcome = "cached"
+            timings.log("conversion", mode=mode, cache="HIT")
+            return FileResponse(
+                cached_path,
+                media_type=DOCX_MEDIA_TYPE,
+                filename="converted.docx",
+                headers=timing_headers(timings, {"X-Cache": "HIT"}),
+            )
+    cache_headers = {"X-Cache": "MISS" if cache_key else "BYPASS"}
 
-        else:
-            raise HTTPException(status_code=400, detail="Invalid conversion mode")
+    # Large uploads were spooled to disk; their result is written next to
+    # them instead of being sent back from the worker in memory
+    output_path = upload.path[:-len(".docx")] + "_result.docx" if upload.path else None
 
-        # DOWNLOAD: Return the actual DOCX
+    try:
+        with upload, timings.span("conversion"):
+            is_valid, message, output, summary = await conversion_pool.run(
+                convert_document, mode, upload.source, output_path
+            )
+    except ConversionPoolFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ConversionWorkerLost as e:
+        print(f"Error converting document: {e}")
+        if output_path:
+            remove_file(output_path)
+        raise HTTPException(
+            status_code=503,
+            detail="The conversion worker stopped unexpectedly, please try again.",
+            headers={"Retry-After": "5"},
+        )
+    except ConversionError as e:
+        print(f"Error converting document: {e}")
+        if output_path:
+            remove_file(output_path)
+        raise HTTPException(status_code=500, detail="The document could not be converted.")
+
+    tracked.summary = summary
+    record_worker_timings(timings, summary)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=message)
+
+    if cache_key:
+        with timings.span("cache_store"):
+            await asyncio.to_thread(result_cache.put, cache_key, output)
+    timings.log("conversion", mode=mode, cache=cache_headers["X-Cache"])
+    cache_headers = timing_headers(timings, cache_headers)
+
+    # DOWNLOAD: Return the actual DOCX
+    if output_path:
+        # The result file is deleted as soon as the response has been sent
         return FileResponse(
             output_path,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            media_type=DOCX_MEDIA_TYPE,
             filename="converted.docx",
+            headers=cache_headers,
+            background=BackgroundTask(remove_file, output_path),
         )
+    return Response(
+        output,
+        media_type=DOCX_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="converted.docx"', **cache_headers},
+    )
+
+
+@router.post("/convert/batch")
+async def convert_batch_endpoint(
+    files: List[UploadFile] = File(...),
+    mode: str = Form(...),
+):
+    """
+    Converts several documents, uploaded as .docx files and/or zips of them.
+
+    Returns a zip with the converted documents and a manifest.json giving the
+    status of every document; a document that fails does not fail the batch.
+    """
+    if mode not in CONVERTERS:
+        raise HTTPException(status_code=400, detail="Invalid conversion mode")
+
+    try:
+        items = await read_batch(files)
+    except BatchTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if not items:
+        raise HTTPException(status_code=400, detail="No documents to convert")
 
+    try:
+        await convert_batch(conversion_pool, mode, items)
+        archive_path = await asyncio.to_thread(write_batch_archive, mode, items)
     finally:
-        if os.path.exists(tmp_in_path):
-            os.remove(tmp_in_path)
+        close_items(items)
+
+    return FileResponse(
+        archive_path,
+        media_type="application/zip",
+        filename="converted.zip",
+        background=BackgroundTask(remove_file, archive_path),
+    )
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job_endpoint(
+    file: UploadFile = File(...),
+    mode: str = Form(...),
+):
+    """
+    Queues a conversion and returns its job id right away.
+
+    Poll GET /jobs/{job_id} until the status is no longer "queued" or
+    "running", then fetch the document from GET /jobs/{job_id}/result.
+    """
+    if mode not in CONVERTERS:
+        raise HTTPException(status_code=400, detail="Invalid conversion mode")
+
+    try:
+        upload = await read_upload(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    with upload:
+        job = await asyncio.to_thread(job_queue.submit, mode, upload)
+    job_queue.notify()
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def job_status_endpoint(job_id: str):
+    try:
+        return await asyncio.to_thread(job_queue.get, job_id)
+    except JobNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/jobs/{job_id}/result")
+async def job_result_endpoint(job_id: str):
+    try:
+        job, result_path = await asyncio.to_thread(job_queue.result, job_id)
+    except JobNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if job["status"] != DONE:
+        raise HTTPException(status_code=409, detail={"status": job["status"], "message": job["message"]})
+    # The result stays available until the job expires
+    return FileResponse(result_path, media_type=DOCX_MEDIA_TYPE, filename="converted.docx")
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job_endpoint(job_id: str):
+    try:
+        return await asyncio.to_thread(job_queue.cancel, job_id)
+    except JobNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,322 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+from dotenv import load_dotenv
+
+from app.utils.conversion_engine import ConversionError, convert_document
+from app.utils.conversion_pool import ConversionPoolFull
+from app.utils.metrics import observe_conversion
+from app.utils.temp_files import TEMP_FILE_PREFIX, remove_file
+from app.utils.timing import log_timings
+from app.utils.upload_buffer import (
+    MAX_UPLOAD_SIZE,
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_SPOOL_THRESHOLD,
+    UploadBuffer,
+    UploadTooLarge,
+    read_upload,
+)
+
+
+load_dotenv()
+
+# Maximum number of documents in one batch request, counting the documents inside zip uploads
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "100"))
+# Maximum total size in bytes of the documents of one batch request, once extracted from any zip
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", str(200 * 1024 * 1024)))
+
+MANIFEST_NAME = "manifest.json"
+
+
+class BatchTooLarge(Exception):
+    """Raised when a batch has more documents or more bytes than allowed."""
+
+
+class BatchItem:
+    """
+    One document of a batch and what became of it.
+
+    ``status`` is "pending" until the document has been converted, then one
+    of "converted", "invalid" (not a .docx or rejected by validation),
+    "too_large", "rejected" (the conversion queue was full) or "failed".
+    ``output`` holds the converted package as bytes or the path it was
+    written to.
+    """
+
+    def __init__(self, name, upload=None, status="pending", message=""):
+        self.name = name
+        self.upload = upload
+        self.status = status
+        self.message = message
+        self.output = None
+        self.output_name = None
+
+    def manifest_entry(self):
+        return {
+            "file": self.name,
+            "status": self.status,
+            "output": self.output_name,
+            "message": self.message,
+        }
+
+    def close(self):
+        """Deletes the temporary files of the upload and of its result."""
+        if self.upload is not None:
+            self.upload.close()
+        if isinstance(self.output, str):
+            remove_file(self.output)
+            self.output = None
+
+
+def close_items(items):
+    for item in items:
+        item.close()
+
+
+def is_zip_upload(upload):
+    filename = (upload.filename or "").lower()
+    return filename.endswith(".zip") or upload.content_type in ("application/zip", "application/x-zip-compressed")
+
+
+def extract_zip_member(archive, info, spool_threshold=UPLOAD_SPOOL_THRESHOLD):
+    """Copies one member of a zip archive into an UploadBuffer, spooling large ones to disk."""
+    with archive.open(info) as member:
+        if info.file_size <= spool_threshold:
+            data = member.read()
+            return UploadBuffer(data=data, size=len(data))
+        spool = tempfile.NamedTemporaryFile(prefix=TEMP_FILE_PREFIX, suffix=".docx", delete=False)
+        try:
+            with spool:
+                while True:
+                    chunk = member.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    spool.write(chunk)
+        except BaseException:
+            remove_file(spool.name)
+            raise
+        return UploadBuffer(path=spool.name, size=info.file_size)
+
+
+def extract_zip_items(upload, name, max_files, max_size, max_file_size=MAX_UPLOAD_SIZE):
+    """
+    Extracts the documents of a zip upload.
+
+    Directories, hidden files and macOS metadata are ignored. Members that
+    are not .docx files or are larger than ``max_file_size`` get an item
+    recording why they were not extracted.
+
+    Args:
+        upload (UploadBuffer): The zip upload.
+        name (str): Name of the zip, prefixed to the names of its members.
+        max_files (int): Number of documents the batch can still take.
+        max_size (int): Number of bytes the batch can still take.
+        max_file_size (int): Maximum uncompressed size of one document.
+
+    Returns:
+        List of BatchItem.
+
+    Raises:
+        BatchTooLarge: If the documents of the zip exceed ``max_files`` or
+            ``max_size``, judging by the sizes declared in the archive so that
+            nothing is extracted from an oversized one.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(upload.data) if upload.path is None else upload.path)
+    except zipfile.BadZipFile:
+        return [BatchItem(name, status="invalid", message="The file is not a valid zip archive.")]
+
+    with archive:
+        members = []
+        for info in archive.infolist():
+            base_name = os.path.basename(info.filename)
+            if info.is_dir() or not base_name or base_name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                continue
+            members.append(info)
+
+        extracted = [info for info in members if info.filename.lower().endswith(".docx") and info.file_size <= max_file_size]
+        if len(members) > max_files:
+            raise BatchTooLarge(f"{name} has more documents than the batch can take.")
+        if sum(info.file_size for info in extracted) > max_size:
+            raise BatchTooLarge(f"The documents of {name} exceed the maximum batch size.")
+
+        items = []
+        try:
+            for info in members:
+                item_name = f"{name}/{info.filename}"
+                if not info.filename.lower().endswith(".docx"):
+                    items.append(BatchItem(item_name, status="invalid", message="Not a .docx file."))
+                elif info.file_size > max_file_size:
+                    message = f"The file exceeds the maximum upload size of {max_file_size} bytes."
+                    items.append(BatchItem(item_name, status="too_large", message=message))
+                else:
+                    try:
+                        items.append(BatchItem(item_name, upload=extract_zip_member(archive, info)))
+                    except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+                        items.append(BatchItem(item_name, status="invalid", message=f"Could not extract the file: {e}"))
+        except BaseException:
+            close_items(items)
+            raise
+    return items
+
+
+async def read_batch(files, max_files=MAX_BATCH_FILES, max_size=MAX_BATCH_SIZE):
+    """
+    Reads the uploads of a batch request into BatchItems.
+
+    Documents larger than MAX_UPLOAD_SIZE are recorded as "too_large" instead
+    of failing the batch; zip uploads are replaced by the documents they
+    contain.
+
+    Args:
+        files (list): The FastAPI UploadFiles, .docx files or zips of them.
+        max_files (int): Maximum number of documents.
+        max_size (int): Maximum total size in bytes of the documents.
+
+    Returns:
+        List of BatchItem, in upload order.
+
+    Raises:
+        BatchTooLarge: If the batch exceeds ``max_files`` or ``max_size``.
+    """
+    items = []
+    size = 0
+    try:
+        for upload in files:
+            name = upload.filename or f"document{len(items) + 1}.docx"
+            if is_zip_upload(upload):
+                try:
+                    archive = await read_upload(upload, max_size=max_size)
+                except UploadTooLarge:
+                    raise BatchTooLarge(f"The batch exceeds the maximum size of {max_size} bytes.")
+                with archive:
+                    extracted = await asyncio.to_thread(
+                        extract_zip_items, archive, name, max_files - len(items), max_size - size,
+                    )
+                items += extracted
+                size += sum(item.upload.size for item in extracted if item.upload is not None)
+            else:
+                try:
+                    document = await read_upload(upload)
+                except UploadTooLarge as e:
+                    items.append(BatchItem(name, status="too_large", message=str(e)))
+                else:
+                    items.append(BatchItem(name, upload=document))
+                    size += document.size
+
+            if len(items) > max_files:
+                raise BatchTooLarge(f"The batch exceeds the maximum of {max_files} documents.")
+            if size > max_size:
+                raise BatchTooLarge(f"The batch exceeds the maximum size of {max_size} bytes.")
+    except BaseException:
+        close_items(items)
+        raise
+    return items
+
+
+async def convert_batch(pool, mode, items):
+    """
+    Converts the pending items of a batch on the conversion pool.
+
+    At most one document per worker is submitted at a time, so a batch never
+    fills the pool's queue on its own and single-document requests still get
+    a slot. Every document gets its own status; a failure never stops the
+    others. Workers share their parsed templates and the normalization cache
+    across the whole batch.
+
+    Args:
+        pool (ConversionPool): The pool to run the conversions on.
+        mode (str): Conversion mode, one of the keys of CONVERTERS.
+        items (list): BatchItems as returned by read_batch.
+    """
+    semaphore = asyncio.Semaphore(pool.workers)
+
+    async def convert_item(item):
+        # Spooled documents get their result written next to them, like in /convert
+        output_path = item.upload.path[:-len(".docx")] + "_result.docx" if item.upload.path else None
+        size = item.upload.size
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                with item.upload:
+                    is_valid, message, output, summary = await pool.run(
+                        convert_document, mode, item.upload.source, output_path
+                    )
+            except ConversionPoolFull as e:
+                item.status, item.message = "rejected", str(e)
+                observe_conversion("batch", mode, item.status, size=size)
+                return
+            except ConversionError as e:
+                print(f"Error converting {item.name}: {e}")
+                item.status, item.message = "failed", "The document could not be converted."
+                observe_conversion("batch", mode, item.status, time.perf_counter() - start, size)
+            else:
+                log_timings("conversion", summary, mode=mode, file=item.name)
+                item.message = message
+                if is_valid:
+                    item.status, item.output = "converted", output
+                else:
+                    item.status = "invalid"
+                observe_conversion("batch", mode, item.status, time.perf_counter() - start, size, summary)
+                return
+        if output_path:
+            remove_file(output_path)
+
+    for item in items:
+        if item.status != "pending":
+            # Not a document, or too large to be converted
+            observe_conversion("batch", mode, item.status)
+    await asyncio.gather(*[convert_item(item) for item in items if item.status == "pending"])
+
+
+def output_name(name, taken):
+    """Returns the name of the result of document ``name`` in the archive, unique among ``taken``."""
+    stem = os.path.splitext(os.path.basename(name))[0] or "document"
+    candidate = f"{stem}_converted.docx"
+    number = 2
+    while candidate in taken:
+        candidate = f"{stem}_converted_{number}.docx"
+        number += 1
+    taken.add(candidate)
+    return candidate
+
+
+def write_batch_archive(mode, items):
+    """
+    Writes the converted documents of a batch and its manifest to a zip.
+
+    The results are already compressed .docx packages, so they are stored as
+    they are instead of being deflated a second time.
+
+    Returns:
+        Path of the temporary zip file; the caller deletes it.
+    """
+    taken = {MANIFEST_NAME}
+    archive_file = tempfile.NamedTemporaryFile(prefix=TEMP_FILE_PREFIX, suffix=".zip", delete=False)
+    try:
+        with archive_file, zipfile.ZipFile(archive_file, "w") as archive:
+            for item in items:
+                if item.status != "converted":
+                    continue
+                item.output_name = output_name(item.name, taken)
+                if isinstance(item.output, bytes):
+                    archive.writestr(item.output_name, item.output, compress_type=zipfile.ZIP_STORED)
+                else:
+                    archive.write(item.output, item.output_name, compress_type=zipfile.ZIP_STORED)
+
+            manifest = {
+                "mode": mode,
+                "total": len(items),
+                "converted": sum(item.status == "converted" for item in items),
+                "files": [item.manifest_entry() for item in items],
+            }
+            archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+    except BaseException:
+        remove_file(archive_file.name)
+        raise
+    return archive_file.name
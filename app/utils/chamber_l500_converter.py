@@ -1,6 +1,7 @@
 from docx import Document
 from docx.shared import RGBColor, Pt
 from lxml import etree
+import copy
 import zipfile
 from docx.oxml.ns import qn
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING, WD_UNDERLINE
@@ -10,16 +11,37 @@ import io
 import os
 import sys
 import re
-from openai import OpenAI
 from dotenv import load_dotenv
 
+from app.utils.docx_io import open_document, save_document
+from app.utils.normalization import normalization_service
+from app.utils.normalization_rules import normalize_advising, normalize_lawyers
+from app.utils.docx_index import get_source_cell_index, invalidate_source_cell_index, xpath
+from app.utils.field_mapping import CHAMBER_L500_FIELDS, CHAMBER_L500_MATTER_FIELDS, conversion_plan
+from app.utils.hyperlink_pool import DEFAULT_HYPERLINK_URL, get_hyperlink_pool, source_hyperlink_url
+from app.utils.paragraph_formatting import ParagraphPropertiesTranslator
+from app.utils.run_formatting import run_format_translator
+from app.utils.table_index import (
+    TableView,
+    add_table_row,
+    body_table,
+    clone_element,
+    get_body_table_index,
+    get_table_text_index,
+    new_empty_paragraph,
+    new_page_break_paragraph,
+    remove_table_row,
+    replicate_table,
+    set_cell_text,
+    table_rows_changed,
+    table_text_changed,
+    write_cell_text,
+)
+from app.utils.timing import count, stage, timed
+
 
 load_dotenv()
 
-client = OpenAI(
-    # This is the default and can be omitted
-    api_key=os.getenv("OPENAI_API_KEY"),
-)
 template_Lawyer = """
         Steve Bobbins -> Steve Bobbins
         Steve Bobbins (Partner) -> Steve Bobbins (Partner)
@@ -44,32 +66,41 @@ template_advising = """
     De Brauw (ANGELA SMITH and his team) advising SOMETHING.COM  -> De Brauw (ANGELA SMITH and his team) - advising SOMETHING.COM
     Smaller firm advising the employee\nFOURTY FIVE advising the insurance company of FOURTY SIX -> Smaller firm - advising the employee; FOURTY FIVE - advising the insurance company of FOURTY SIX
 """
+normalization_service.register_rules(template_Lawyer, normalize_lawyers)
+normalization_service.register_rules(template_advising, normalize_advising)
+
 # Define the template for formatting
 def format_with_openai(input_str, template):
-    # Construct the prompt with detailed instructions for formatting
-    
-    prompt = f"""
-    In order to process strings, strings must be converted into a specific form according to their meaning.
-    Given the following template rules:
-    {template}
-    
-    Now, please format the following input according to these rules:
-    {input_str}
-
-    Return only the formatted output in the required format. No explanation is necessary.
-    """
-    
-    # Request a response from the OpenAI API (using GPT-4)
-    response = client.responses.create(
-    model="gpt-3.5-turbo",
-    instructions="You are a helpful assistant that can handle various strings.",
-    input=prompt,
-)
     if input_str is None or input_str == "":
         return ""
-    # Return the formatted result from the response
-    else:
-        return response.output_text
+    return normalization_service.normalize_all([(input_str, template)])[0]
+
+def normalize_matter_texts(source_doc, source_table_indices):
+    """
+    Extracts and normalizes the lawyer and firm strings of several matter tables at once.
+
+    All strings of the document go to the normalization service together, so
+    they are sent in a few concurrent batched requests instead of one blocking
+    request per string.
+
+    Args:
+        source_doc: The source Document object.
+        source_table_indices: Indices of the source matter tables.
+
+    Returns:
+        dict mapping each table index to its normalized
+        (lead partner, other key members, other firms advising) strings.
+    """
+    items = []
+    for source_table_index in source_table_indices:
+        items.append((extract_cell_text(source_doc, source_table_index, 10, 0), template_Lawyer))
+        items.append((extract_cell_text(source_doc, source_table_index, 12, 0), template_Lawyer))
+        items.append((extract_cell_text(source_doc, source_table_index, 14, 0), template_advising))
+    outputs = normalization_service.normalize_all(items)
+    return {
+        source_table_index: tuple(outputs[3 * i:3 * i + 3])
+        for i, source_table_index in enumerate(source_table_indices)
+    }
 
 practiceArea_text = ""
 location_text = ""
@@ -108,6 +139,8 @@ def delete_table_row(document: Document, table_index, row_index: int) -> None:
         # Remove the specified row
         row_to_delete = rows[row_index]
         table_element.remove(row_to_delete)
+        invalidate_source_cell_index(document)
+        table_rows_changed(table_element)
         
     except Exception as e:
         raise RuntimeError(f"Failed to delete row: {str(e)}") from e
@@ -205,35 +238,17 @@ def extract_cell_text(source_doc, source_table_index, source_row_index, source_c
         A string containing the cell's text content, or None if extraction fails.
     """
     try:
-        # ===== SOURCE CONTENT EXTRACTION =====
-        try:
-            source_xml_content = source_doc.part.blob
-            source_tree = etree.fromstring(source_xml_content)
-        except Exception as e:
-            print(f"Error parsing source document XML: {str(e)}")
-            return None
-
         ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
         
-        # ===== SOURCE CELL VALIDATION =====
-        source_tables = source_tree.xpath('//w:tbl', namespaces=ns)
-        if source_table_index >= len(source_tables) or source_table_index < 0:
-            print(f"Error: Source table index {source_table_index} out of range (0-{len(source_tables)-1})")
-            return None
-
-        source_rows = source_tables[source_table_index].xpath('.//w:tr', namespaces=ns)
-        if source_row_index >= len(source_rows) or source_row_index < 0:
-            print(f"Error: Source row index {source_row_index} out of range (0-{len(source_rows)-1})")
-            return None
-
-        source_cells = source_rows[source_row_index].xpath('.//w:tc', namespaces=ns)
-        if source_col_index >= len(source_cells) or source_col_index < 0:
-            print(f"Error: Source column index {source_col_index} out of range (0-{len(source_cells)-1})")
+        # ===== SOURCE CELL LOOKUP =====
+        try:
+            source_cell = get_source_cell_index(source_doc).cell(source_table_index, source_row_index, source_col_index)
+        except IndexError as e:
+            print(f"Error: {e}")
             return None
 
         # ===== TEXT EXTRACTION =====
-        source_cell = source_cells[source_col_index]
-        text_elements = source_cell.xpath('.//w:t', namespaces=ns)
+        text_elements = xpath(source_cell, './/w:t')
         
         # Join all text elements with spaces
         cell_text = ' '.join([elem.text for elem in text_elements if elem.text])
@@ -249,13 +264,15 @@ def copy_cell_content_to_target_cell(source_doc, source_table_index, source_row_
     """
     Copies cell content with formatting from one cell to another cell in a target Document object.
     """
+    count("cells_copied")
     try:
         # ===== TARGET CELL VALIDATION =====
-        if not hasattr(target_doc, 'tables') or target_table_index >= len(target_doc.tables) or target_table_index < 0:
-            print(f"Error: Target table index {target_table_index} out of range (0-{len(target_doc.tables)-1})")
+        target_tables = get_body_table_index(target_doc)
+        if target_table_index >= len(target_tables) or target_table_index < 0:
+            print(f"Error: Target table index {target_table_index} out of range (0-{len(target_tables)-1})")
             return False
             
-        target_table = target_doc.tables[target_table_index]
+        target_table = body_table(target_doc, target_table_index)
         if target_row_index >= len(target_table.rows) or target_row_index < 0:
             print(f"Error: Target row index {target_row_index} out of range (0-{len(target_table.rows)-1})")
             return False
@@ -267,151 +284,51 @@ def copy_cell_content_to_target_cell(source_doc, source_table_index, source_row_
             
         target_cell = target_row.cells[target_col_index]
         
-        # ===== SOURCE CONTENT EXTRACTION =====
+        # ===== SOURCE CELL LOOKUP =====
         try:
-            source_xml_content = source_doc.part.blob
-            source_tree = etree.fromstring(source_xml_content)
-            
-        except Exception as e:
-            print(f"Error parsing source document XML: {str(e)}")
+            source_cell = get_source_cell_index(source_doc).cell(source_table_index, source_row_index, source_col_index)
+        except IndexError as e:
+            print(f"Error: {e}")
             return False
 
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+    table_text_changed(target_table._tbl)
+    return copy_cell_content(source_cell, target_cell, source_doc.part)
+
+def copy_cell_content(source_cell, target_cell, source_part=None):
+    """
+    Copies the paragraphs of a source ``w:tc`` element, with their formatting, into a target _Cell.
+
+    ``source_part`` is the part of the source document holding the cell; it
+    resolves the URLs of the copied hyperlinks.
+    """
+    try:
         ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
               'wp': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
               'xml': 'http://www.w3.org/XML/1998/namespace'}
-        
-        # ===== SOURCE CELL VALIDATION =====
-        source_tables = source_tree.xpath('//w:tbl', namespaces=ns)
-        if source_table_index >= len(source_tables) or source_table_index < 0:
-            print(f"Error: Source table index {source_table_index} out of range (0-{len(source_tables)-1})")
-            return False
 
-        source_rows = source_tables[source_table_index].xpath('.//w:tr', namespaces=ns)
-        if source_row_index >= len(source_rows) or source_row_index < 0:
-            print(f"Error: Source row index {source_row_index} out of range (0-{len(source_rows)-1})")
-            return False
-
-        source_cells = source_rows[source_row_index].xpath('.//w:tc', namespaces=ns)
-        if source_col_index >= len(source_cells) or source_col_index < 0:
-            print(f"Error: Source column index {source_col_index} out of range (0-{len(source_cells)-1})")
-            return False
-
-        source_cell = source_cells[source_col_index]
-        source_paragraphs = source_cell.xpath('.//w:p', namespaces=ns)
+        source_paragraphs = xpath(source_cell, './/w:p')
         
         # ===== CONTENT COPYING =====
         target_cell.text = ""  # Clear target cell
 
 
-        first_paragraph = True
-        n = 0
-        pre_left = ''
-        pre_hanging = ''
+        translator = ParagraphPropertiesTranslator('2', len(source_paragraphs))
         for i, paragraph in enumerate(source_paragraphs):
             
             # Create or get paragraph
-            if first_paragraph:
+            if i == 0:
                 new_paragraph = target_cell.paragraphs[0]
-                first_paragraph = False
             else:
                 new_paragraph = target_cell.add_paragraph()
                     
             # Copy paragraph formatting
-            ppr = paragraph.find('.//w:pPr', namespaces=ns)
-            if ppr is not None:
-                new_ppr = new_paragraph._element.get_or_add_pPr()
-                
-                numpr = ppr.find('.//w:numPr', namespaces=ns)
-                if numpr is not None:
-                    try:
-                        ilvl = numpr.find('.//w:ilvl', namespaces=ns)
-                        numId = numpr.find('.//w:numId', namespaces=ns)
-                        if ilvl is not None and numId is not None:
-                            # new_paragraph.paragraph_format.left_indent = Pt(18 * int(ilvl.get(qn('w:val'))) + 35)
-                            new_numpr = etree.SubElement(new_ppr, qn('w:numPr'))
-                            etree.SubElement(new_numpr, qn('w:ilvl'), {qn('w:val'): ilvl.get(qn('w:val'))})
-                            etree.SubElement(new_numpr, qn('w:numId'), {qn('w:val'): '2'})
-                    except Exception as e:
-                        print(f"Warning: Could not copy numbering - {str(e)}")
-                
-                rpr = ppr.find('.//w:rPr', namespaces=ns)
-                if rpr is not None:
-                    color = rpr.find('.//w:color', namespaces=ns)
-                    if color is not None:
-                        if not new_paragraph.runs:
-                            new_paragraph.add_run('')
-                        
-                        for run in new_paragraph.runs:
-                            rPr = run._r.get_or_add_rPr()
-                            etree.SubElement(rPr, qn('w:color'), {qn('w:val'): color.get(qn('w:val'))})
-                
-                # Copy the pStyle if it exists
-                pstyle = ppr.find('.//w:pStyle', namespaces=ns)
-                if pstyle is not None:
-                    
-                    new_style = etree.SubElement(new_ppr, qn('w:pStyle'))
-                    style_name = pstyle.get(qn('w:val'))
-                    new_style.set(qn('w:val'), style_name)
-                    
-                # indent handling
-                ind = ppr.find('.//w:ind', namespaces=ns)
-                if ind is not None and numpr is None:
-                    new_ind = etree.SubElement(new_ppr, qn('w:ind'))
-                    
-                    left = ind.get(qn('w:left'))
-                    # print(type(left))
-                    if left is not None:
-                        new_ind.set(qn('w:left'), left)
-                        pre_left = left
-                        n = i
-                    hanging = ind.get(qn('w:hanging'))
-                    if hanging is not None:
-                        new_ind.set(qn('w:hanging'), hanging)
-                        pre_hanging = hanging
-                    
-                
-                if i == n + 1 and numpr is None:
-                    # Create new indentation element
-                    new_ind = etree.SubElement(new_ppr, qn('w:ind'))
-                    if pre_left is not None:
-                        new_ind.set(qn('w:left'), pre_left)
-                    if pre_hanging is not None:
-                        new_ind.set(qn('w:hanging'), pre_hanging)
-                
-                # Spacing handling
-                spacing = ppr.find('.//w:spacing', namespaces=ns)
-                is_last_paragraph = (i == len(source_paragraphs) - 1)
-                is_empty = not paragraph.xpath('.//w:r/w:t', namespaces=ns)
-
-                if spacing is not None:
-                    # Space before
-                    before = spacing.get(qn('w:before'))
-                    if before is not None:
-                        new_paragraph.paragraph_format.space_before = Pt(min(int(before)/20, 6))  # Max 6pt
-                    
-                    # Space after (none for last paragraph)
-                    after = spacing.get(qn('w:after'))
-                    if after is not None and not is_last_paragraph:
-                        new_paragraph.paragraph_format.space_after = Pt(min(int(after)/20, 6))  # Max 6pt
-                    else:
-                        new_paragraph.paragraph_format.space_after = Pt(0)
-
-                    # Line spacing
-                    line = spacing.get(qn('w:line'))
-                    if line is not None:
-                        line_rule = spacing.get(qn('w:lineRule'), 'auto')
-                        line_val = int(line)
-                        if line_rule == 'exact':
-                            new_paragraph.paragraph_format.line_spacing = Pt(line_val/20)
-                        elif line_rule == 'atLeast':
-                            new_paragraph.paragraph_format.line_spacing_rule = WD_LINE_SPACING.AT_LEAST
-                            new_paragraph.paragraph_format.line_spacing = Pt(line_val/20)
-                        else:  # auto or multiple
-                            new_paragraph.paragraph_format.line_spacing = line_val/240  # 240 = 12pt*20
-                else:
-                    new_paragraph.paragraph_format.space_after = Pt(0)
-
-            process_paragraph(paragraph, new_paragraph, ns)
+            translator.translate(i, paragraph, new_paragraph._p)
+
+            process_paragraph(paragraph, new_paragraph, ns, source_part)
             
         return True
 
@@ -419,7 +336,7 @@ def copy_cell_content_to_target_cell(source_doc, source_table_index, source_row_
         print(f"Error: {e}")
         return False
 
-def process_paragraph(paragraph, new_paragraph, ns):
+def process_paragraph(paragraph, new_paragraph, ns, source_part=None):
     # Track both types of hyperlinks
     in_field_hyperlink = False
     in_modern_hyperlink = False
@@ -430,13 +347,13 @@ def process_paragraph(paragraph, new_paragraph, ns):
     }
     
     # Process all elements in original order
-    for element in paragraph.xpath('./*', namespaces=ns):
+    for element in xpath(paragraph, './*'):
         # Reset modern hyperlink flag at start of each element
         in_modern_hyperlink = False
         
         # Check for modern hyperlink (w:hyperlink element)
         if element.tag.endswith('}hyperlink'):
-            process_modern_hyperlink(element, new_paragraph, ns)
+            process_modern_hyperlink(element, new_paragraph, ns, source_part)
             in_modern_hyperlink = True
             continue
         
@@ -475,30 +392,20 @@ def process_paragraph(paragraph, new_paragraph, ns):
                 if not in_field_hyperlink and not in_modern_hyperlink:
                     process_regular_run(run, new_paragraph, ns)
 
-def process_modern_hyperlink(hyperlink, new_paragraph, ns):
-    part = new_paragraph.part
-    rels = part.rels
-    
-    # Generate unique rId
-    next_rId = f"rId{len(rels) + 1}"
-    
-    # Add relationship
-    rels.add_relationship(
-        "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink",
-        "http://www.google.com",  # Default URL
-        is_external=True,
-        rId=next_rId
-    )
+def process_modern_hyperlink(hyperlink, new_paragraph, ns, source_part=None):
+    # One relationship per URL in the target part
+    url = source_hyperlink_url(hyperlink, source_part) or DEFAULT_HYPERLINK_URL
+    next_rId = get_hyperlink_pool(new_paragraph.part).rid(url)
     
     # Create hyperlink element
     hyperlink_copy = OxmlElement('w:hyperlink')
     hyperlink_copy.set(qn('r:id'), next_rId)
     
     # Copy all runs from original hyperlink
-    for run in hyperlink.xpath('.//w:r', namespaces=ns):
+    for run in xpath(hyperlink, './/w:r'):
         run_copy = OxmlElement('w:r')
         for child in run:
-            run_copy.append(etree.fromstring(etree.tostring(child)))
+            run_copy.append(copy.deepcopy(child))
         
         # Apply hyperlink formatting
         rPr = run_copy.find('w:rPr', namespaces=ns) or OxmlElement('w:rPr')
@@ -636,52 +543,8 @@ def process_regular_run(run, new_paragraph, ns):
     if text_element is not None and text_element.text:
         new_run = new_paragraph.add_run(text_element.text)
         
-        # Default formatting
-        new_run.font.name = "Times New Roman"
-        new_run.font.size = Pt(11)
-        
-        # Copy run formatting
-        rpr = run.find('.//w:rPr', namespaces=ns)
-        if rpr is not None:
-            # Color
-            color_element = rpr.find('.//w:color', namespaces=ns)
-            if color_element is not None and color_element.get(qn('w:val')):
-                color_hex = color_element.get(qn('w:val'))
-                try:
-                    new_run.font.color.rgb = RGBColor.from_string(color_hex)
-                except ValueError:
-                    pass
-
-            # Bold/Italic
-            if rpr.find('.//w:b', namespaces=ns) is not None:
-                new_run.bold = True
-            if rpr.find('.//w:i', namespaces=ns) is not None:
-                new_run.italic = True
-                
-            # Underline
-            underline_element = rpr.find('.//w:u', namespaces=ns)
-            if underline_element is not None:
-                underline_val = underline_element.get(qn('w:val'))
-                underline_mapping = {
-                    'single': WD_UNDERLINE.SINGLE,
-                    'double': WD_UNDERLINE.DOUBLE,
-                    'thick': WD_UNDERLINE.THICK,
-                    'dotted': WD_UNDERLINE.DOTTED,
-                    'dash': WD_UNDERLINE.DASH,
-                    'dotDash': WD_UNDERLINE.DOT_DASH,
-                    'dotDotDash': WD_UNDERLINE.DOT_DOT_DASH,
-                    'wave': WD_UNDERLINE.WAVY,
-                    'none': WD_UNDERLINE.NONE,
-                }
-                new_run.font.underline = underline_mapping.get(underline_val, WD_UNDERLINE.SINGLE)
-                
-                # Underline color
-                underline_color = underline_element.get(qn('w:color'))
-                if underline_color:
-                    try:
-                        new_run.font.underline_color.rgb = RGBColor.from_string(underline_color)
-                    except ValueError:
-                        pass
+        # Default font plus the color, bold, italic and underline of the source run
+        new_run._r.insert(0, run_format_translator.run_properties(run.find('.//w:rPr', namespaces=ns)))
 
 def copy_row_formatting(source_row, target_row):
     """
@@ -751,6 +614,7 @@ def insert_row_with_above_formatting_direct_xml(document: Document, table, row_i
             # Determine the insertion position: one index after the source row
             insert_position = source_index + 3
             table_element.insert(insert_position, new_row_xml)
+            table_rows_changed(table_element)
 
             return None
         else:
@@ -821,19 +685,8 @@ def find_tables_with_specific_string(doc, search_string):
     Returns:
         List of table indexes (0-based) where the string is found.
     """
-    matching_table_indexes = []
-
-    for i, table in enumerate(doc.tables):
-        for row in table.rows:
-            for cell in row.cells:
-                if search_string in cell.text.strip():
-                    matching_table_indexes.append(i)
-                    break  # No need to check other cells in this table
-            else:
-                continue  # Only triggers if inner loop didn't break
-            break  # Exit row loop if a match was found
-
-    return matching_table_indexes
+    # Cell texts are extracted once per document and shared by all lookups
+    return get_table_text_index(doc).find(search_string)
 
 def delete_table_with_paragraphs(doc, table_index, num_paragraphs_above=0, num_paragraphs_below=0):
     """
@@ -846,8 +699,8 @@ def delete_table_with_paragraphs(doc, table_index, num_paragraphs_above=0, num_p
         num_paragraphs_below (int): The number of paragraphs to delete below the table.
     """
     try:
-        table = doc.tables[table_index]
-        table_xml = table._element
+        tables = get_body_table_index(doc)
+        table_xml = tables[table_index]
         body = doc.element.body
 
         paragraphs_above_xml = []
@@ -872,6 +725,7 @@ def delete_table_with_paragraphs(doc, table_index, num_paragraphs_above=0, num_p
         for element in elements_to_remove:
             if element is not None:
                 body.remove(element)
+        tables.pop(table_index)
 
         doc.part._element = doc.element
 
@@ -885,49 +739,51 @@ def copy_table_with_paragraphs(source_doc, source_table_index, target_doc, targe
     Copies a specific table and its associated paragraphs (above and below) to a specific position in a target document.
     """
     try:
-        source_table = source_doc.tables[source_table_index]
-        table_xml = source_table._element 
+        table_xml = get_body_table_index(source_doc)[source_table_index]
 
         paragraphs_above_xml = []
         element = table_xml.getprevious()
-        count = 0
-        while element is not None and count < num_paragraphs_above:
+        found = 0
+        while element is not None and found < num_paragraphs_above:
             if element.tag.endswith('p'):
                 paragraphs_above_xml.insert(0, element)
-                count += 1
+                found += 1
             element = element.getprevious()
 
         paragraphs_below_xml = []
         element = table_xml.getnext()
-        count = 0
-        while element is not None and count < num_paragraphs_below:
+        found = 0
+        while element is not None and found < num_paragraphs_below:
             if element.tag.endswith('p'):
                 paragraphs_below_xml.append(element)
-                count += 1
+                found += 1
             element = element.getnext()
 
-        new_table_xml = etree.fromstring(etree.tostring(table_xml))
+        new_table_xml = clone_element(table_xml)
+        count("tables_cloned")
 
         target_body = target_doc.element.body
 
-        if target_index < len(target_doc.tables):  
-            target_table_xml = target_doc.tables[target_index]._element
-            insert_before = target_table_xml
-        else: 
+        target_tables = get_body_table_index(target_doc)
+        if target_index < len(target_tables):
+            insert_before = target_tables[target_index]
+        else:
             insert_before = None
 
         if insert_before is not None:
             for p_xml in paragraphs_above_xml:
-                target_body.insert(target_body.index(insert_before), p_xml)
-            target_body.insert(target_body.index(insert_before), new_table_xml)
+                insert_before.addprevious(p_xml)
+            insert_before.addprevious(new_table_xml)
             for p_xml in paragraphs_below_xml:
-                target_body.insert(target_body.index(insert_before), p_xml)
+                insert_before.addprevious(p_xml)
+            target_tables.insert(target_index, new_table_xml)
         else:
             for p_xml in paragraphs_above_xml:
                 target_body.append(p_xml)
             target_body.append(new_table_xml)
             for p_xml in paragraphs_below_xml:
                 target_body.append(p_xml)
+            target_tables.append(new_table_xml)
 
         target_doc.part._element = target_doc.element
 
@@ -945,15 +801,13 @@ def add_page_break_before_table(doc, table_index):
         table_index (int): The index of the table.
     """
     try:
-        table = doc.tables[table_index]
-        table_element = table._element
-        body = doc.element.body
+        table_element = get_body_table_index(doc)[table_index]
 
         new_paragraph = etree.Element(qn('w:p'))
         new_run = etree.SubElement(new_paragraph, qn('w:r'))
         new_br = etree.SubElement(new_run, qn('w:br'), {qn('w:type'): 'page'})
 
-        body.insert(body.index(table_element), new_paragraph)
+        table_element.addprevious(new_paragraph)
 
         doc.part._element = doc.element
 
@@ -972,14 +826,12 @@ def add_single_line_space_before_table(doc, table_index):
         table_index (int): The index of the table.
     """
     try:
-        table = doc.tables[table_index]
-        table_element = table._element
-        body = doc.element.body
+        table_element = get_body_table_index(doc)[table_index]
 
         new_paragraph = etree.Element(qn('w:p'))
         # An empty <w:p> element will create a line space
 
-        body.insert(body.index(table_element), new_paragraph)
+        table_element.addprevious(new_paragraph)
 
         doc.part._element = doc.element
 
@@ -1007,44 +859,81 @@ def write_text_to_cell(doc, table_index, row_index, cell_index, text, font_size,
                                      Defaults to None (no explicit color set).
     """
     try:
-        table = doc.tables[table_index]
-        cell = table.rows[row_index].cells[cell_index]
-        paragraph = cell.paragraphs[0]
-        run = paragraph.clear().add_run(text)
-
-        font = run.font
-        font.name = "Calibri (Body)"
-        font.size = Pt(font_size)
-        font.bold = bold
-
-        if font_color:
-            font.color.rgb = RGBColor(*font_color)
-
-        if alignment == "left":
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        elif alignment == "center":
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        elif alignment == "right":
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        else:
-            print("Warning: Invalid alignment specified. Defaulting to left.")
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
+        table = body_table(doc, table_index)
+        table_text_changed(table._tbl)
+        write_text_to_table_cell(table, row_index, cell_index, text, font_size, bold, alignment, font_color)
 
     except IndexError:
         print("Error: Table, row, or cell index out of range.")
     except Exception as e:
         print(f"Error: {e}")
-        
-def copy_publishable_matter_to_target(source_doc, target_doc, source_table_index, target_table_index):
-    
-    source_publishableMatter_table = source_doc.tables[source_table_index]
-    target_publishableMatter_table = target_doc.tables[target_table_index]
+
+def write_text_to_table_cell(table, row_index, cell_index, text, font_size, bold=True, alignment="left", font_color=None):
+    """
+    Same as write_text_to_cell for a Table object, which may not be part of the
+    document body yet (e.g. a copy being prepared by replicate_table).
+    """
+    cell = table.rows[row_index].cells[cell_index]
+    paragraph = cell.paragraphs[0]
+    run = paragraph.clear().add_run(text)
+
+    font = run.font
+    font.name = "Calibri (Body)"
+    font.size = Pt(font_size)
+    font.bold = bold
+
+    if font_color:
+        font.color.rgb = RGBColor(*font_color)
+
+    if alignment == "left":
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    elif alignment == "center":
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    elif alignment == "right":
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    else:
+        print("Warning: Invalid alignment specified. Defaulting to left.")
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
+
+@timed("matter_replication")
+def replicate_matter_tables(doc, table_index, count, title_prefix, first_page_break):
+    """
+    Turns the matter table at table_index into count numbered matter tables.
+
+    The copies are inserted after the prototype in one go, each titled
+    title_prefix + its number and preceded by a page break from the
+    first_page_break-th table of the run on (0-based, the prototype being 0).
+
+    Args:
+        doc (docx.Document): The Document object.
+        table_index (int): The index of the matter table used as prototype.
+        count (int): The total number of matter tables wanted.
+        title_prefix (str): Title text, followed by the matter number.
+        first_page_break (int): Position in the run of the first copy that gets a page break.
+    """
+    replicate_table(doc, table_index, count - 1,
+                    separator=lambda number: new_page_break_paragraph() if number >= first_page_break else None,
+                    prepare=lambda table, number: set_cell_text(table, 0, 0, title_prefix + str(number + 1)),
+                    prepare_prototype=lambda table: write_text_to_table_cell(table, 0, 0, "", 14, alignment="left"))
+    if count > 0:
+        write_text_to_cell(doc, table_index, 0, 0, title_prefix + "1", 14, alignment="left")
+
+def copy_publishable_matter_to_target(source_doc, target_doc, source_table_index, target_table_index, matter_texts=None):
+    """
+    Copies one matter table of the source document into a matter table of the target.
+
+    Args:
+        matter_texts (dict): Optional result of normalize_matter_texts. When it
+            covers source_table_index the pre-normalized strings are used,
+            otherwise they are normalized here.
+    """
+
+    source_publishableMatter_table = TableView(source_doc.tables[source_table_index])
+    target_publishableMatter_table = TableView(target_doc.tables[target_table_index])
     # print(target_table_index)
     # insert_row_with_above_formatting(target_publishableMatter_table, 22)
-    copy_cell_content_to_target_cell(source_doc, source_table_index, 2, 0, target_doc, target_table_index, 2, 0)
-    copy_cell_content_to_target_cell(source_doc, source_table_index, 4, 0, target_doc, target_table_index, 4, 0)
-    copy_cell_content_to_target_cell(source_doc, source_table_index, 6, 0, target_doc, target_table_index, 5, 1)
-    copy_cell_content_to_target_cell(source_doc, source_table_index, 8, 0, target_doc, target_table_index, 8, 0)
+    matter_plan = conversion_plan(CHAMBER_L500_MATTER_FIELDS, target_doc, target_table_index)
+    matter_plan.execute(source_doc, target_doc, copy_cell_content, source_table_index, target_table_index)
     i = 0
     n = len(target_publishableMatter_table.rows)
     is_test = source_publishableMatter_table.cell(1, 0).text.strip()
@@ -1052,32 +941,26 @@ def copy_publishable_matter_to_target(source_doc, target_doc, source_table_index
     otherKeymembers_text = ""
     otherFirmadvising_text = ""
     
+    if matter_texts is None or source_table_index not in matter_texts:
+        matter_texts = normalize_matter_texts(source_doc, [source_table_index])
+    leadPartner_text, otherKeymembers_text, otherFirmadvising_text = matter_texts[source_table_index]
     # if "Name of client – this will be publishable" in is_test:
-    leadPartner_text = extract_cell_text(source_doc, source_table_index, 10, 0)
-    otherKeymembers_text = extract_cell_text(source_doc, source_table_index, 12, 0)
-    otherFirmadvising_text = extract_cell_text(source_doc, source_table_index, 14, 0)
     # else:
     #     leadPartner_text = source_publishableMatter_table.cell(5, 0).text.strip()
     #     otherKeymembers_text = source_publishableMatter_table.cell(6, 0).text.strip()
     #     otherFirmadvising_text = source_publishableMatter_table.cell(7, 0).text.strip()
     # print(leadPartner_text)
-    if leadPartner_text != "":
-        leadPartner_text = format_with_openai(leadPartner_text, template_Lawyer)
     # print("LeadPartner_Text: ", leadPartner_text)
     # print(leadPartner_text)
     leadPartner_text_list = [item for item in leadPartner_text.split(';') if item]
     leadPartner_text_list_length = len(leadPartner_text_list)
     
-    if otherKeymembers_text != "":
-        otherKeymembers_text = format_with_openai(otherKeymembers_text, template_Lawyer)
     # print("Other Key Members: ", otherKeymembers_text, "\n")
     otherKeymembers_text_list = [item for item in otherKeymembers_text.split(';') if item]
     # print(otherKeymembers_text_list)
     otherKeymembers_text_list_length = len(otherKeymembers_text_list)
     # print(otherKeymembers_text_list)
     
-    if otherFirmadvising_text != "":
-        otherFirmadvising_text = format_with_openai(otherFirmadvising_text, template_advising)
     otherFirmadvising_text_list = [item for item in otherFirmadvising_text.split(';') if item]
     
     otherFirmadvising_text_list_length = len(otherFirmadvising_text_list)
@@ -1098,8 +981,8 @@ def copy_publishable_matter_to_target(source_doc, target_doc, source_table_index
                     temp_practiceArea_text = ""  
                 
                 try:
-                    target_publishableMatter_table.cell(i + j + 2, 0).text = temp_name_text
-                    target_publishableMatter_table.cell(i + j + 2, 4).text = temp_practiceArea_text
+                    write_cell_text(target_publishableMatter_table, i + j + 2, 0, temp_name_text)
+                    write_cell_text(target_publishableMatter_table, i + j + 2, 4, temp_practiceArea_text)
                 except IndexError:
                     print(f"IndexError: Unable to set text for row {i + j + 2}. Skipping this entry.")
                     continue
@@ -1119,8 +1002,8 @@ def copy_publishable_matter_to_target(source_doc, target_doc, source_table_index
                     temp_name_text = temp_keymembers_text 
                     temp_practiceArea_text = ""  
                 try:
-                    target_publishableMatter_table.cell(i + j + 2, 0).text = temp_name_text
-                    target_publishableMatter_table.cell(i + j + 2, 4).text = temp_practiceArea_text
+                    write_cell_text(target_publishableMatter_table, i + j + 2, 0, temp_name_text)
+                    write_cell_text(target_publishableMatter_table, i + j + 2, 4, temp_practiceArea_text)
                 except IndexError:
                     print(f"IndexError: Unable to set text for row {i + j + 2}. Skipping this entry.")
                     continue
@@ -1142,8 +1025,8 @@ def copy_publishable_matter_to_target(source_doc, target_doc, source_table_index
                 
                 # print(temp_name_text, temp_advising_text)
                 try:
-                    target_publishableMatter_table.cell(i + j + 2, 0).text = temp_name_text
-                    target_publishableMatter_table.cell(i + j + 2, 4).text = temp_advising_text
+                    write_cell_text(target_publishableMatter_table, i + j + 2, 0, temp_name_text)
+                    write_cell_text(target_publishableMatter_table, i + j + 2, 4, temp_advising_text)
                 except IndexError:
                     print(f"IndexError: Unable to set text for row {i + j + 2}. Skipping this entry.")
                     continue
@@ -1152,14 +1035,30 @@ def copy_publishable_matter_to_target(source_doc, target_doc, source_table_index
     copy_cell_content_to_target_cell(source_doc, source_table_index, 16, 0, target_doc, target_table_index, n - 1, 3)       
     
 
-async def chamber_l500_convert(source_docx_path, target_docx_path):
+def chamber_l500_convert(source_docx_path, target_docx_path, output=None):
+    """
+    Converts a Chambers submission into the Legal 500 template.
+
+    Args:
+        source_docx_path: Path, file-like object or loaded Document of the
+            Chambers document, normally already normalized by validate_document.
+        target_docx_path: Path, file-like object or loaded Document of the Legal 500 template.
+        output: Path or file-like object the result is saved to. Defaults to
+            "<source>_result.docx" next to the source file, which requires the
+            source to be a path.
+
+    Returns:
+        The output the result was saved to.
+    """
     # Load the source and target documents
-    source_doc = Document(source_docx_path)
-    target_doc = Document(target_docx_path)
+    source_doc = open_document(source_docx_path)
+    target_doc = open_document(target_docx_path)
+
+    stage("firm_details")
+    # Copy the fixed fields: firm and department names, department size,
+    # what the department is best known for and the coverage feedback
+    conversion_plan(CHAMBER_L500_FIELDS, target_doc).execute(source_doc, target_doc, copy_cell_content)
 
-    # Extract the Firm Name
-    copy_cell_content_to_target_cell(source_doc, 0, 1, 0,
-                                      target_doc, 0, 0, 0)
     # Extract the Practice Area
     target_practiceArea_table = source_doc.tables[1]
     global practiceArea_text 
@@ -1171,62 +1070,50 @@ async def chamber_l500_convert(source_docx_path, target_docx_path):
     location_text= target_location_table.cell(1, 0).text.strip()
     # print(location_text,"  ",  practiceArea_text)
     # Extract the Contact Details
-    source_contactDetail_table = source_doc.tables[3]
+    source_contactDetail_table = TableView(source_doc.tables[3])
     target_contactDetail_table = target_doc.tables[1]
     for i in range(len(target_contactDetail_table.rows) - 1, 1, -1):
         temp_row = target_contactDetail_table.rows[i]
-        target_contactDetail_table._element.remove(temp_row._element)
+        remove_table_row(target_contactDetail_table, temp_row)
     for i in range(2, len(source_contactDetail_table.rows)):
         if source_contactDetail_table.cell(i, 0).text.strip() != "":   
             if i < len(source_contactDetail_table.rows) - 3:
                 source_row = target_contactDetail_table.rows[1]
-                new_row = target_contactDetail_table.add_row()
+                new_row = add_table_row(target_contactDetail_table)
                 copy_row_formatting(source_row, new_row)
             copy_cell_content_to_target_cell(source_doc, 3, i, 0, target_doc, 1, i - 1, 0)
             copy_cell_content_to_target_cell(source_doc, 3, i, 1, target_doc, 1, i - 1, 2)
             copy_cell_content_to_target_cell(source_doc, 3, i, 2, target_doc, 1, i - 1, 3)
             
     
-    # Extract the Department Name    
-    copy_cell_content_to_target_cell(source_doc, 4, 1, 0, target_doc, 2, 0, 0)
-    
-    # Extract the Department Information
-    copy_cell_content_to_target_cell(source_doc, 5, 1, 0, target_doc, 4, 0, 1)
-    copy_cell_content_to_target_cell(source_doc, 5, 3, 0, target_doc, 4, 0, 4)
-    
     # Extract the Heads of Team(Department)
-    source_headsOfteam_table = source_doc.tables[6]
+    source_headsOfteam_table = TableView(source_doc.tables[6])
     target_headsOfteam_table = target_doc.tables[3]
     for i in range(len(target_headsOfteam_table.rows) - 1, 1, -1):
         temp_row = target_headsOfteam_table.rows[i]
-        target_headsOfteam_table._element.remove(temp_row._element)
+        remove_table_row(target_headsOfteam_table, temp_row)
     for i in range(2, len(source_headsOfteam_table.rows)):
         if source_headsOfteam_table.cell(i, 0).text.strip() != "":   
             if i < len(source_headsOfteam_table.rows) - 3:
                 source_row = target_headsOfteam_table.rows[1]
-                new_row = target_headsOfteam_table.add_row()
+                new_row = add_table_row(target_headsOfteam_table)
                 copy_row_formatting(source_row, new_row)
             copy_cell_content_to_target_cell(source_doc, 6, i, 0, target_doc, 3, i - 1, 0)
         
-    # Extract the factor of best department
-    copy_cell_content_to_target_cell(source_doc, 9, 1, 0, target_doc, 5, 0, 0)
-    
-    # Extract feedback in this practice area
-    copy_cell_content_to_target_cell(source_doc, 11, 1, 0, target_doc, 7, 0, 0)
-    
+    stage("clients")
     # Extract the publishable clients
     publishableClients_table_indexlist = find_tables_with_specific_string(source_doc, search_string="D0 – PUBLISHABLE CLIENTS")
     if len(publishableClients_table_indexlist) != 0:
         publishableClients_table_index = publishableClients_table_indexlist[0]
-        source_publishableClients_table = source_doc.tables[publishableClients_table_index]
+        source_publishableClients_table = TableView(source_doc.tables[publishableClients_table_index])
         target_publishableClients_table = target_doc.tables[8]
         for i in range(len(target_publishableClients_table.rows) - 1, 1, -1):
             temp_row = target_publishableClients_table.rows[i]
-            target_publishableClients_table._element.remove(temp_row._element)
+            remove_table_row(target_publishableClients_table, temp_row)
         for i in range(2, len(source_publishableClients_table.rows)):
             if source_publishableClients_table.cell(i, 0).text.strip() != "":
                 source_row = target_publishableClients_table.rows[1]
-                new_row = target_publishableClients_table.add_row()
+                new_row = add_table_row(target_publishableClients_table)
                 copy_row_formatting(source_row, new_row)
                 copy_cell_content_to_target_cell(source_doc, 12, i, 1, target_doc, 8, i - 1, 0)
                 copy_cell_content_to_target_cell(source_doc, 12, i, 2, target_doc, 8, i - 1, 1)
@@ -1236,15 +1123,15 @@ async def chamber_l500_convert(source_docx_path, target_docx_path):
     confidentialClients_table_indexlist = find_tables_with_specific_string(source_doc, search_string="E0 – CONFIDENTIAL CLIENTS")
     if len(confidentialClients_table_indexlist) != 0:
         confidentialClients_table_index = confidentialClients_table_indexlist[0]
-        source_confidentialClients_table = source_doc.tables[confidentialClients_table_index]
+        source_confidentialClients_table = TableView(source_doc.tables[confidentialClients_table_index])
         target_confidentialClients_table = target_doc.tables[9]
         for i in range(len(target_confidentialClients_table.rows) - 1, 1, -1):
             temp_row = target_confidentialClients_table.rows[i]
-            target_confidentialClients_table._element.remove(temp_row._element)
+            remove_table_row(target_confidentialClients_table, temp_row)
         for i in range(2, len(source_confidentialClients_table.rows)):
             if source_confidentialClients_table.cell(i, 1).text.strip() != "":
                 source_row = target_confidentialClients_table.rows[1]
-                new_row = target_confidentialClients_table.add_row()
+                new_row = add_table_row(target_confidentialClients_table)
                 copy_row_formatting(source_row, new_row)
                 copy_cell_content_to_target_cell(source_doc, confidentialClients_table_index, i, 1, target_doc, 9, i - 1, 0)
                 copy_cell_content_to_target_cell(source_doc, confidentialClients_table_index, i, 2, target_doc, 9, i - 1, 1)
@@ -1254,12 +1141,13 @@ async def chamber_l500_convert(source_docx_path, target_docx_path):
     if len(confidentialClients_table_indexlist) == 0:
         delete_table_with_paragraphs(target_doc, 9)
         
+    stage("ranked_lawyers")
     # Extract the information of Ranked and Unranked lawyers
     # Extract Leading Partner Information
     leadingPartner_num = 0
     nextGenerationPartner_num = 0
     leadingAssoaciate_num = 0
-    source_ranked_unrankedLawyers_table = source_doc.tables[8]
+    source_ranked_unrankedLawyers_table = TableView(source_doc.tables[8])
     source_ranked_unrankedLawyers_table_length = len(source_ranked_unrankedLawyers_table.rows)
     leadingPartner_indices = find_tables_with_specific_string(target_doc, search_string="Partner: leading partner")
     delete_table_with_paragraphs(target_doc, leadingPartner_indices[1])
@@ -1272,13 +1160,16 @@ async def chamber_l500_convert(source_docx_path, target_docx_path):
             # copy_cell_content_to_target_cell(source_doc, 8, i + 2, 1, target_doc, leadingAssociate_indices[i - leadingPartner_num], 4, 0)
             leadingAssoaciate_num += 1
     # print(leadingPartner_num)
-    for i in range(leadingPartner_num - 1):
-        copy_table_with_paragraphs(target_doc, leadingPartner_indices[0], target_doc, leadingPartner_indices[0] + i)
-    for i in range(leadingPartner_num):
-        add_single_line_space_before_table(target_doc, leadingPartner_indices[0] + i)
-        templeadingPartner_index = leadingPartner_indices[0] + i
-        temp_text = "Partner: leading partner " + str(i + 1)
+    # The copies go before the prototype, which becomes the last block
+    replicate_table(target_doc, leadingPartner_indices[0], leadingPartner_num - 1, before=True,
+                    separator=lambda number: new_empty_paragraph(),
+                    prepare=lambda table, number: write_text_to_table_cell(table, 0, 0, "Partner: leading partner " + str(number), 14, alignment="left", font_color=(255, 255, 255)))
+    if leadingPartner_num > 0:
+        templeadingPartner_index = leadingPartner_indices[0] + leadingPartner_num - 1
+        add_single_line_space_before_table(target_doc, templeadingPartner_index)
+        temp_text = "Partner: leading partner " + str(leadingPartner_num)
         write_text_to_cell(target_doc, templeadingPartner_index, 0, 0, temp_text, 14, alignment="left", font_color=(255, 255, 255))
+    for i in range(leadingPartner_num):
         copy_cell_content_to_target_cell(source_doc, 8, i + 2, 0, target_doc, leadingPartner_indices[0] + i, 2, 0)
         copy_cell_content_to_target_cell(source_doc, 8, i + 2, 3, target_doc, leadingPartner_indices[0] + i, 2, 2)
         copy_cell_content_to_target_cell(source_doc, 8, i + 2, 1, target_doc, leadingPartner_indices[0] + i, 4, 0)
@@ -1288,13 +1179,15 @@ async def chamber_l500_convert(source_docx_path, target_docx_path):
     # Extract Leading Associate Information
     leadingAssociate_indices = find_tables_with_specific_string(target_doc, search_string="Associate: leading associate")
     delete_table_with_paragraphs(target_doc, leadingAssociate_indices[1])
-    for i in range(leadingAssoaciate_num - 1):
-        copy_table_with_paragraphs(target_doc, leadingAssociate_indices[0], target_doc, leadingAssociate_indices[0] + i)
-    for i in range(leadingAssoaciate_num):
-        add_single_line_space_before_table(target_doc, leadingAssociate_indices[0] + i)
-        templeadingAssociate_index = leadingAssociate_indices[0] + i
-        temp_text = "Associate: leading associate " + str(i + 1)
+    replicate_table(target_doc, leadingAssociate_indices[0], leadingAssoaciate_num - 1, before=True,
+                    separator=lambda number: new_empty_paragraph(),
+                    prepare=lambda table, number: write_text_to_table_cell(table, 0, 0, "Associate: leading associate " + str(number), 14, alignment="left", font_color=(255, 255, 255)))
+    if leadingAssoaciate_num > 0:
+        templeadingAssociate_index = leadingAssociate_indices[0] + leadingAssoaciate_num - 1
+        add_single_line_space_before_table(target_doc, templeadingAssociate_index)
+        temp_text = "Associate: leading associate " + str(leadingAssoaciate_num)
         write_text_to_cell(target_doc, templeadingAssociate_index, 0, 0, temp_text, 14, alignment="left", font_color=(255, 255, 255))
+    for i in range(leadingAssoaciate_num):
         copy_cell_content_to_target_cell(source_doc, 8, i + leadingPartner_num + 2, 0, target_doc, leadingAssociate_indices[0] + i, 2, 0)
         copy_cell_content_to_target_cell(source_doc, 8, i + leadingPartner_num + 2, 3, target_doc, leadingAssociate_indices[0] + i, 2, 2)
         copy_cell_content_to_target_cell(source_doc, 8, i + leadingPartner_num + 2, 1, target_doc, leadingAssociate_indices[0] + i, 4, 0)
@@ -1304,23 +1197,25 @@ async def chamber_l500_convert(source_docx_path, target_docx_path):
     nextGenerationPartner_indices = find_tables_with_specific_string(target_doc, search_string="Partner: next generation partner")
     ranked_unrankedLawyers_indices = leadingPartner_indices + nextGenerationPartner_indices
     
+    stage("hires_departures")
     # Extract Hires/Departures of partners in last 12 months
-    source_hiresDepartures_table = source_doc.tables[7]
+    source_hiresDepartures_table = TableView(source_doc.tables[7])
     target_hiresDepartures_table_indices = find_tables_with_specific_string(target_doc, search_string="Name (English)")
     target_hiresDepartures_table_index = target_hiresDepartures_table_indices[0]
     target_hiresDepartures_table = target_doc.tables[target_hiresDepartures_table_index]
     for i in range(len(target_hiresDepartures_table.rows) - 1, 1, -1):
         row = target_hiresDepartures_table.rows[i]
-        target_hiresDepartures_table._element.remove(row._element)
+        remove_table_row(target_hiresDepartures_table, row)
     for i in range(2, len(source_hiresDepartures_table.rows) - 1):
         if source_hiresDepartures_table.cell(i, 0).text.strip() != "": 
             source_row = target_hiresDepartures_table.rows[1]
-            new_row = target_hiresDepartures_table.add_row()
+            new_row = add_table_row(target_hiresDepartures_table)
             copy_row_formatting(source_row, new_row)
             copy_cell_content_to_target_cell(source_doc, 7, i, 0, target_doc, target_hiresDepartures_table_index, i - 1, 0)
             copy_cell_content_to_target_cell(source_doc, 7, i, 1, target_doc, target_hiresDepartures_table_index, i - 1, 2)
             copy_cell_content_to_target_cell(source_doc, 7, i, 2, target_doc, target_hiresDepartures_table_index, i - 1, 3)
         
+    stage("matters")
     # Extract Publishable Matter
     source_publishable_matter_indices = set(find_tables_with_specific_string(source_doc, search_string="Publishable Matter"))
     temp_indices = set(find_tables_with_specific_string(source_doc, search_string="D1 Name of client"))
@@ -1343,69 +1238,75 @@ async def chamber_l500_convert(source_docx_path, target_docx_path):
     target_publishable_matter_indices.sort()
     target_publishable_matter_index = target_publishable_matter_indices[0]
     # print(target_publishable_matter_indices)
+    
+    # Normalize the lawyer and firm strings of every matter in one go
+    stage("normalization")
     if publishable_matter_list_length != 0 and non_publishable_matter_list_length != 0:
-        for i in range(publishable_matter_list_length - 1):
-            copy_table_with_paragraphs(target_doc, target_publishable_matter_index, target_doc, target_publishable_matter_index + i + 1, num_paragraphs_above=0, num_paragraphs_below=0)
-        for i in range(non_publishable_matter_list_length - 1):
-            copy_table_with_paragraphs(target_doc, target_publishable_matter_index + publishable_matter_list_length, target_doc, target_publishable_matter_index + publishable_matter_list_length + i + 1, num_paragraphs_above=0, num_paragraphs_below=0)
-        for i in range(non_publishable_matter_list_length + publishable_matter_list_length - 2):
-            add_page_break_before_table(target_doc, target_publishable_matter_index + 2 + i)
-        for i in range(publishable_matter_list_length):
-            temp_text = "Publishable Matter " + str(i + 1)
-            write_text_to_cell(target_doc, i + target_publishable_matter_index, 0, 0, temp_text, 14, alignment="left")
-            # copy_publishable_matter_to_target(source_doc, target_doc, 13 + i, target_publishable_matter_index + i)
-        for i in range(non_publishable_matter_list_length):
-            temp_text = "Non-Publishable Matter " + str(i + 1)
-            write_text_to_cell(target_doc, i + target_publishable_matter_index + publishable_matter_list_length, 0, 0, temp_text, 14, alignment="left")
-            # copy_publishable_matter_to_target(source_doc, target_doc, 14 + i + publishable_matter_list_length, target_publishable_matter_index + publishable_matter_list_length + i) 
+        source_matter_table_indices = [13 + i for i in range(publishable_matter_list_length)]
+        source_matter_table_indices += [14 + i + publishable_matter_list_length for i in range(non_publishable_matter_list_length)]
+    elif non_publishable_matter_list_length == 0:
+        source_matter_table_indices = [13 + i for i in range(publishable_matter_list_length)]
+    else:
+        source_matter_table_indices = [13 + i for i in range(non_publishable_matter_list_length)]
+    matter_texts = normalize_matter_texts(source_doc, source_matter_table_indices)
+    stage("matters")
+    
+    # Every matter table from the third one on starts on a new page
+    if publishable_matter_list_length != 0 and non_publishable_matter_list_length != 0:
+        replicate_matter_tables(target_doc, target_publishable_matter_index, publishable_matter_list_length, "Publishable Matter ", 2)
+        if publishable_matter_list_length >= 2:
+            add_page_break_before_table(target_doc, target_publishable_matter_index + publishable_matter_list_length)
+        replicate_matter_tables(target_doc, target_publishable_matter_index + publishable_matter_list_length, non_publishable_matter_list_length, "Non-Publishable Matter ", 2 - publishable_matter_list_length)
         for i in range(publishable_matter_list_length):
-            copy_publishable_matter_to_target(source_doc, target_doc, 13 + i, target_publishable_matter_index + i)
+            copy_publishable_matter_to_target(source_doc, target_doc, 13 + i, target_publishable_matter_index + i, matter_texts)
         for i in range(non_publishable_matter_list_length):
-            copy_publishable_matter_to_target(source_doc, target_doc, 14 + i + publishable_matter_list_length, target_publishable_matter_index + publishable_matter_list_length + i)
+            copy_publishable_matter_to_target(source_doc, target_doc, 14 + i + publishable_matter_list_length, target_publishable_matter_index + publishable_matter_list_length + i, matter_texts)
     
     
     elif non_publishable_matter_list_length == 0:
         delete_table_with_paragraphs(target_doc, target_publishable_matter_indices[0] + 1)
-        for i in range(publishable_matter_list_length - 1):
-            copy_table_with_paragraphs(target_doc, target_publishable_matter_index, target_doc, target_publishable_matter_index + i + 1, num_paragraphs_above=0, num_paragraphs_below=0)
-        for i in range(publishable_matter_list_length - 2):
-            add_page_break_before_table(target_doc, target_publishable_matter_index + 2 + i)
-        for i in range(publishable_matter_list_length):
-            temp_text = "Publishable Matter " + str(i + 1)
-            write_text_to_cell(target_doc, i + target_publishable_matter_index, 0, 0, temp_text, 14, alignment="left")
+        replicate_matter_tables(target_doc, target_publishable_matter_index, publishable_matter_list_length, "Publishable Matter ", 2)
         for i in range(publishable_matter_list_length):
-            copy_publishable_matter_to_target(source_doc, target_doc, 13 + i, target_publishable_matter_index + i)
+            copy_publishable_matter_to_target(source_doc, target_doc, 13 + i, target_publishable_matter_index + i, matter_texts)
         
         
     else: 
         delete_table_with_paragraphs(target_doc, target_publishable_matter_index)
-        for i in range(non_publishable_matter_list_length - 1):
-            copy_table_with_paragraphs(target_doc, target_publishable_matter_index, target_doc, target_publishable_matter_index + i + 1, num_paragraphs_above=0, num_paragraphs_below=0)
-        for i in range(non_publishable_matter_list_length - 2):
-            add_page_break_before_table(target_doc, target_publishable_matter_index + 2 + i)
+        replicate_matter_tables(target_doc, target_publishable_matter_index, non_publishable_matter_list_length, "Non-Publishable Matter ", 2)
         for i in range(non_publishable_matter_list_length):
-            temp_text = "Non-Publishable Matter " + str(i + 1)
-            write_text_to_cell(target_doc, i + target_publishable_matter_index + publishable_matter_list_length, 0, 0, temp_text, 14, alignment="left")
-            # copy_publishable_matter_to_target(source_doc, target_doc, 14 + i + publishable_matter_list_length, target_publishable_matter_index + publishable_matter_list_length + i)
-        for i in range(non_publishable_matter_list_length):
-            copy_publishable_matter_to_target(source_doc, target_doc, 13 + i, target_publishable_matter_index + i)
+            copy_publishable_matter_to_target(source_doc, target_doc, 13 + i, target_publishable_matter_index + i, matter_texts)
     
     
+    stage("save")
     # Save the modified target document
     global result_path
-    file_name_without_extension = os.path.splitext(source_docx_path)[0]
-    file_name = f"{file_name_without_extension}_result.docx"
-    target_doc.save(file_name)
-    print(f"Content copied successfully. Result saved to: {file_name}")
-    return file_name
+    if output is None:
+        file_name_without_extension = os.path.splitext(source_docx_path)[0]
+        output = f"{file_name_without_extension}_result.docx"
+    save_document(target_doc, output)
+    stage(None)
+    print(f"Content copied successfully. Result saved to: {output}")
+    return output
     
     # Verify the file was created
     if not os.path.exists(result_path):
         raise FileNotFoundError(f"Failed to create output file at {result_path}")
 
-async def validate_document(source_path):
-    
-    source_doc = Document(source_path)
+def validate_document(source_doc):
+    """
+    Validates the matter numbering of a Chambers submission and normalizes it in place.
+
+    Rows above the matter headings are removed from the matter tables so
+    the document can be handed straight to chamber_l500_convert.
+
+    Args:
+        source_doc: Loaded Document, path or file-like object of the submission.
+            A Document is modified in place.
+
+    Returns:
+        (is_valid, message)
+    """
+    source_doc = open_document(source_doc)
     publishable_matter_indices = set(find_tables_with_specific_string(source_doc, search_string="Publishable Matter"))
     temp_indices = set(find_tables_with_specific_string(source_doc, search_string="Name of client"))
     publishable_matter_indices = list(publishable_matter_indices.intersection(temp_indices))
@@ -1425,7 +1326,7 @@ async def validate_document(source_path):
     # print(matter_indices)
     for i in range(matter_indices_length):
         matter_table_index = matter_indices[i]
-        matter_table = source_doc.tables[matter_table_index]
+        matter_table = TableView(source_doc.tables[matter_table_index])
         matter_table_length = len(matter_table.rows)
         top = 0
         for j in range(matter_table_length):
@@ -1488,16 +1389,7 @@ async def validate_document(source_path):
             # Construct the final message
             message = f"{non_publishable_str} was written wrong. Please rewrite it."
             return False, message          
-        # # Save the modified target document
-    if not publisahble_matter_table_missing_numbers and not non_publisahble_matter_table_missing_numbers:
-        try:
-            file_name_without_extension = os.path.splitext(source_path)[0]
-            source_doc.save(f"{file_name_without_extension}_processed.docx")
-            return True, "The document is valid."
-        except Exception as e:
-            print(f"Error saving the document: {e}")
-            # sys.exit(1)
-            return False
+    return True, "The document is valid."
 
 # Example usage
 # if __name__ == "__main__":
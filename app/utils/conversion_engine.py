@@ -0,0 +1,110 @@
+import io
+import os
+import time
+from pathlib import Path
+
+from app.utils.chamber_l500_converter import (
+    chamber_l500_convert,
+    validate_document as validate_chamber_l500,
+)
+from app.utils.l500_chamber_converter import (
+    l500_chamber_convert,
+    validate_document as validate_l500_chamber,
+)
+from app.utils.docx_io import open_document
+from app.utils.template_cache import TemplateCache
+from app.utils.timing import count, new_timings, recording, span
+
+
+UTILS_DIR = Path(__file__).resolve().parent
+
+TEMPLATE_PATHS = {
+    "l500_chamber": UTILS_DIR / "templateDestination.docx",
+    "chamber_l500": UTILS_DIR / "legal 500.doc",
+}
+
+CONVERTERS = {
+    "l500_chamber": (validate_l500_chamber, l500_chamber_convert),
+    "chamber_l500": (validate_chamber_l500, chamber_l500_convert),
+}
+
+# Part of the result cache key: bump it whenever a change to the converters
+# alters their output, so that results of the previous code are not served
+CONVERTER_VERSION = "4"
+
+# Parsed templates, loaded once per worker
+template_cache = TemplateCache(TEMPLATE_PATHS)
+
+
+class ConversionError(Exception):
+    """
+    Raised by convert_document when a conversion fails.
+
+    Exceptions raised inside a worker process are pickled back to the parent,
+    and some (e.g. OpenAI client errors) cannot be unpickled, which would break
+    the whole pool. Failures are therefore reported with this plain exception.
+    """
+
+
+def load_templates():
+    """Parses every conversion template into the cache. Used as the worker initializer."""
+    template_cache.load()
+
+
+def warm_up(delay=0.0):
+    """
+    No-op job used to start workers ahead of the first request.
+
+    The short delay keeps each worker busy long enough for the pool to start
+    a new one for the next warm-up job.
+    """
+    time.sleep(delay)
+    return os.getpid()
+
+
+def convert_document(mode, source, output_path=None):
+    """
+    Validates and converts an uploaded document.
+
+    Runs inside a conversion worker. Small uploads travel as bytes, large ones
+    as the path of the file they were spooled to (see UploadBuffer). The
+    output comes back as bytes unless ``output_path`` is given, in which case
+    it is written there so large results don't have to be pickled.
+
+    Args:
+        mode (str): Conversion mode, one of the keys of CONVERTERS.
+        source (bytes or str): The uploaded .docx package, or its path.
+        output_path (str): Optional path to write the result to.
+
+    Returns:
+        (is_valid, message, output, timings): output is the converted package
+        as bytes, or ``output_path`` if one was given, and None when the
+        document failed validation. timings is the Timings.as_dict() summary
+        of the stages run in the worker ({} when timing is off); its "total"
+        covers the whole call.
+
+    Raises:
+        ConversionError: If validation or conversion raised an exception.
+    """
+    validate, convert = CONVERTERS[mode]
+
+    timings = new_timings()
+    with recording(timings), span("total"):
+        try:
+            # The upload is parsed once: validation normalizes it in place and
+            # the same document is then converted
+            with span("parse"):
+                source_doc = open_document(io.BytesIO(source) if isinstance(source, bytes) else source)
+            count("source_tables", len(source_doc.tables))
+            with span("validate"):
+                is_valid, message = validate(source_doc)
+            if is_valid:
+                output = output_path or io.BytesIO()
+                with span("template_copy"):
+                    target_doc = template_cache.get(mode)
+                convert(source_doc, target_doc, output)
+        except Exception as e:
+            raise ConversionError(f"{type(e).__name__}: {e}") from None
+    if not is_valid:
+        return False, message, None, timings.as_dict()
+    return True, message, output_path or output.getvalue(), timings.as_dict()
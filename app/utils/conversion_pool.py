@@ -0,0 +1,120 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from app.utils.conversion_engine import ConversionError, load_templates, warm_up
+
+
+load_dotenv()
+
+# Number of conversions that may run at the same time
+CONVERSION_WORKERS = int(os.getenv("CONVERSION_WORKERS", str(os.cpu_count() or 1)))
+# Number of conversions that may wait for a free worker before new ones are rejected
+CONVERSION_QUEUE_SIZE = int(os.getenv("CONVERSION_QUEUE_SIZE", "16"))
+# "process" runs conversions on a process pool so they scale across cores,
+# "thread" keeps them in this process (useful for debugging)
+CONVERSION_EXECUTOR = os.getenv("CONVERSION_EXECUTOR", "process")
+
+
+class ConversionPoolFull(Exception):
+    """Raised when a conversion is submitted while every worker and queue slot is taken."""
+
+
+class ConversionWorkerLost(ConversionError):
+    """
+    Raised when the worker running a conversion died (e.g. killed for memory).
+
+    A ConversionError, so callers that handle failed conversions handle it
+    too; the pool has been replaced by the time it is raised, so the
+    conversion may be submitted again.
+    """
+
+
+class ConversionPool:
+    """
+    Bounded worker pool that keeps blocking conversion work off the event loop.
+
+    At most ``workers`` jobs run concurrently and at most ``queue_size`` more may
+    wait for a free worker. Submitting beyond that raises ConversionPoolFull so
+    the caller can shed load instead of queueing without bound.
+
+    With the "process" executor every worker is a separate process that loads
+    the conversion templates once when it starts, so conversion throughput
+    scales with the number of cores instead of being bound by the GIL.
+    """
+
+    def __init__(self, workers=CONVERSION_WORKERS, queue_size=CONVERSION_QUEUE_SIZE, executor=CONVERSION_EXECUTOR):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown conversion executor: {executor}")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor = executor
+        self._executor = self._new_executor()
+        # Only touched from the event loop thread, so no lock is needed
+        self._pending = 0
+
+    def _new_executor(self):
+        if self.executor == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=load_templates,
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="conversion",
+            initializer=load_templates,
+        )
+
+    @property
+    def in_flight(self):
+        """Number of jobs currently running on a worker."""
+        return min(self._pending, self.workers)
+
+    @property
+    def queue_depth(self):
+        """Number of jobs waiting for a free worker."""
+        return max(self._pending - self.workers, 0)
+
+    async def start(self):
+        """Starts every worker up front so the first requests don't pay for it."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self._executor, warm_up, 0.2) for _ in range(self.workers)
+        ])
+
+    async def run(self, func, *args):
+        """
+        Runs ``func(*args)`` on a worker and returns its result.
+
+        With the process executor ``func`` and its arguments must be picklable.
+
+        Raises:
+            ConversionPoolFull: If all workers are busy and the queue is full.
+            ConversionWorkerLost: If the worker running the job died.
+        """
+        if self._pending >= self.workers + self.queue_size:
+            raise ConversionPoolFull(f"Conversion queue is full ({self.queue_size} waiting)")
+        self._pending += 1
+        executor = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenExecutor as e:
+            # A worker died (e.g. killed for memory); replace the pool so
+            # later jobs don't all fail with the same error
+            if self._executor is executor:
+                print("Conversion pool is broken, starting a new one")
+                self._executor = self._new_executor()
+            raise ConversionWorkerLost(f"The conversion worker stopped unexpectedly: {e}") from e
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+conversion_pool = ConversionPool()
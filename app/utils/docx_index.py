@@ -0,0 +1,97 @@
+from lxml import etree
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+NS = {'w': W_NS, 'v': 'urn:schemas-microsoft-com:vml'}
+
+_find_tables = etree.XPath('//w:tbl', namespaces=NS)
+_find_rows = etree.XPath('.//w:tr', namespaces=NS)
+_find_cells = etree.XPath('.//w:tc', namespaces=NS)
+_compiled = {}
+
+
+def xpath(element, path):
+    """
+    Evaluates a ``w:``/``v:``-prefixed XPath expression against an element.
+
+    Works for both plain lxml elements and python-docx oxml elements, whose
+    ``xpath`` method does not accept a ``namespaces`` argument. Expressions are
+    compiled once and reused.
+    """
+    find = _compiled.get(path)
+    if find is None:
+        find = _compiled[path] = etree.XPath(path, namespaces=NS)
+    return find(element)
+
+
+class SourceCellIndex:
+    """
+    Build-once index of the ``w:tc`` elements of a source document.
+
+    The converters address source cells by ``(table, row, col)`` using the same
+    semantics as the ``//w:tbl``, ``.//w:tr`` and ``.//w:tc`` XPath scans they
+    used to run on every copy: tables are counted in document order (including
+    nested ones) and rows/cells are all descendants of their parent. The index
+    reads the live element tree of the document, so no serialization or
+    re-parsing is needed, and each table is scanned at most once.
+    """
+
+    def __init__(self, doc):
+        self._tables = _find_tables(doc.element)
+        self._rows = {}
+        self._cells = {}
+
+    @property
+    def table_count(self):
+        return len(self._tables)
+
+    def rows(self, table_index):
+        """Returns the ``w:tr`` elements of a table, scanning it on first access."""
+        if table_index >= len(self._tables) or table_index < 0:
+            raise IndexError(f"Source table index {table_index} out of range (0-{len(self._tables)-1})")
+        rows = self._rows.get(table_index)
+        if rows is None:
+            rows = self._rows[table_index] = _find_rows(self._tables[table_index])
+        return rows
+
+    def cells(self, table_index, row_index):
+        """Returns the ``w:tc`` elements of a table row."""
+        key = (table_index, row_index)
+        cells = self._cells.get(key)
+        if cells is None:
+            rows = self.rows(table_index)
+            if row_index >= len(rows) or row_index < 0:
+                raise IndexError(f"Source row index {row_index} out of range (0-{len(rows)-1})")
+            cells = self._cells[key] = _find_cells(rows[row_index])
+        return cells
+
+    def cell(self, table_index, row_index, col_index):
+        """
+        Returns the ``w:tc`` element at ``(table_index, row_index, col_index)``.
+
+        Raises:
+            IndexError: If any of the indices is out of range.
+        """
+        cells = self.cells(table_index, row_index)
+        if col_index >= len(cells) or col_index < 0:
+            raise IndexError(f"Source column index {col_index} out of range (0-{len(cells)-1})")
+        return cells[col_index]
+
+
+def get_source_cell_index(doc):
+    """
+    Returns the cached SourceCellIndex of a document, building it on first use.
+
+    The index lives on the Document object itself, so it is scoped to a single
+    conversion and released together with the source document.
+    """
+    index = getattr(doc, '_source_cell_index', None)
+    if index is None:
+        index = SourceCellIndex(doc)
+        doc._source_cell_index = index
+    return index
+
+
+def invalidate_source_cell_index(doc):
+    """Drops the cached index after the document's tables or rows were modified."""
+    doc._source_cell_index = None
@@ -0,0 +1,49 @@
+import os
+
+from docx import Document
+from docx.document import Document as DocumentObject
+from dotenv import load_dotenv
+
+from app.utils.docx_writer import write_document
+
+
+load_dotenv()
+
+# zlib level of the parts a conversion changed: 0 stores them uncompressed, 1 is the fastest, 9 the smallest
+OUTPUT_COMPRESSION_LEVEL = int(os.getenv("OUTPUT_COMPRESSION_LEVEL", "6"))
+
+
+def open_document(source):
+    """
+    Returns a python-docx Document for a path, a file-like object or a Document.
+
+    Already loaded documents (e.g. copies handed out by the template cache) are
+    returned as they are, so callers can accept any of the three.
+    """
+    if isinstance(source, DocumentObject):
+        return source
+    return Document(source)
+
+
+def save_document(document, output, compress_level=None):
+    """
+    Saves a Document to a path or a binary file-like object.
+
+    Copies handed out by the template cache know their template's package:
+    the parts the conversion left as they were are copied from it still
+    compressed, and only the others are compressed again. Other documents are
+    saved by python-docx.
+
+    Args:
+        document: The Document to save.
+        output: Path or binary file-like object.
+        compress_level (int): zlib level of the changed parts, 0 (store) to 9;
+            defaults to OUTPUT_COMPRESSION_LEVEL.
+    """
+    template = getattr(document, '_template_package', None)
+    if template is None:
+        document.save(output)
+        return
+    if compress_level is None:
+        compress_level = OUTPUT_COMPRESSION_LEVEL
+    write_document(document, output, template, compress_level)
@@ -0,0 +1,194 @@
+import io
+import os
+import struct
+import time
+import zipfile
+import zlib
+
+from docx.opc.pkgwriter import PackageWriter
+
+
+# Zip header layouts, see APPNOTE.TXT sections 4.3.7, 4.3.12 and 4.3.16
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_OF_CENTRAL_DIRECTORY = struct.Struct("<IHHHHIIH")
+_LOCAL_HEADER_SIGNATURE = 0x04034B50
+_CENTRAL_HEADER_SIGNATURE = 0x02014B50
+_END_OF_CENTRAL_DIRECTORY_SIGNATURE = 0x06054B50
+_ZIP_VERSION = 20
+_UTF8_FLAG = 0x800
+_ENCRYPTED_FLAG = 0x1
+_FILE_ATTRIBUTES = 0o600 << 16
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+
+class _Member:
+    """A zip entry: its compressed data and what the headers say about it."""
+
+    __slots__ = ("name", "method", "crc", "size", "data")
+
+    def __init__(self, name, method, crc, size, data):
+        self.name = name
+        self.method = method
+        self.crc = crc
+        self.size = size
+        self.data = data
+
+
+class _BlobRecorder:
+    """Stands in for python-docx's PhysPkgWriter and keeps what would be written."""
+
+    def __init__(self):
+        self.blobs = {}
+
+    def write(self, pack_uri, blob):
+        self.blobs[pack_uri.membername] = blob
+
+
+def _write_package(document, phys_writer):
+    # What OpcPackage.save does, with our own physical writer
+    package = document.part.package
+    parts = package.parts
+    for part in parts:
+        part.before_marshal()
+    PackageWriter._write_content_types_stream(phys_writer, parts)
+    PackageWriter._write_pkg_rels(phys_writer, package.rels)
+    PackageWriter._write_parts(phys_writer, parts)
+
+
+class TemplatePackage:
+    """
+    The zip entries of a template package, kept compressed.
+
+    Alongside each entry it keeps the bytes python-docx produces for that
+    member from the freshly parsed template. A member of a converted copy
+    that serializes to the same bytes was not changed by the conversion, so
+    PassthroughWriter can copy the template's compressed entry instead of
+    compressing it again.
+    """
+
+    def __init__(self, raw, document):
+        """
+        Args:
+            raw (bytes): The template .docx file.
+            document: The Document parsed from ``raw``, not yet modified.
+        """
+        self.members = {}
+        with zipfile.ZipFile(io.BytesIO(raw)) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or info.flag_bits & _ENCRYPTED_FLAG:
+                    continue
+                if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                    continue
+                # The local header may have a different extra field than the central one
+                name_length, extra_length = struct.unpack_from("<HH", raw, info.header_offset + 26)
+                start = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+                data = raw[start:start + info.compress_size]
+                self.members[info.filename] = _Member(info.filename, info.compress_type, info.CRC, info.file_size, data)
+        recorder = _BlobRecorder()
+        _write_package(document, recorder)
+        self.blobs = recorder.blobs
+
+    def unchanged_member(self, name, blob):
+        """Returns the template's entry for member ``name`` if ``blob`` is what the template has there, else None."""
+        template_blob = self.blobs.get(name)
+        if template_blob is None or (template_blob is not blob and template_blob != blob):
+            return None
+        return self.members.get(name)
+
+
+class PassthroughWriter:
+    """
+    Writes a .docx package, copying unchanged template members as they are.
+
+    Implements the ``write(pack_uri, blob)`` interface of python-docx's
+    PhysPkgWriter. Members whose content is the template's are written with
+    the template's compressed bytes; the others are deflated at
+    ``compress_level``, or stored when it is 0. ZIP64 is not supported, so
+    packages are limited to 4 GiB, far above any submission.
+    """
+
+    def __init__(self, stream, template=None, compress_level=6):
+        """
+        Args:
+            stream: Binary file-like object the package is written to.
+            template (TemplatePackage): Package of the template the document
+                was copied from, or None to compress every member.
+            compress_level (int): zlib level, 0 (store) to 9.
+        """
+        self.stream = stream
+        self.template = template
+        self.compress_level = compress_level
+        self.passed_through = 0
+        self.compressed = 0
+        self._central_directory = []
+        self._date_time = time.localtime(time.time())[:6]
+
+    def write(self, pack_uri, blob):
+        name = pack_uri.membername
+        member = self.template.unchanged_member(name, blob) if self.template is not None else None
+        if member is not None:
+            self.passed_through += 1
+        else:
+            member = self._compress(name, blob)
+            self.compressed += 1
+        self._write_member(member)
+
+    def _compress(self, name, blob):
+        if self.compress_level == 0:
+            return _Member(name, zipfile.ZIP_STORED, zlib.crc32(blob), len(blob), blob)
+        compressor = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15)
+        data = compressor.compress(blob) + compressor.flush()
+        return _Member(name, zipfile.ZIP_DEFLATED, zlib.crc32(blob), len(blob), data)
+
+    def _write_member(self, member):
+        offset = self.stream.tell()
+        if member.size > _ZIP32_LIMIT or len(member.data) > _ZIP32_LIMIT or offset > _ZIP32_LIMIT:
+            raise ValueError(f"{member.name} does not fit in a zip without ZIP64")
+        name = member.name.encode("utf-8")
+        flags = 0 if member.name.isascii() else _UTF8_FLAG
+        dos_time = self._date_time[3] << 11 | self._date_time[4] << 5 | self._date_time[5] // 2
+        dos_date = (self._date_time[0] - 1980) << 9 | self._date_time[1] << 5 | self._date_time[2]
+        self.stream.write(_LOCAL_HEADER.pack(
+            _LOCAL_HEADER_SIGNATURE, _ZIP_VERSION, flags, member.method, dos_time, dos_date,
+            member.crc, len(member.data), member.size, len(name), 0,
+        ))
+        self.stream.write(name)
+        self.stream.write(member.data)
+        self._central_directory.append(_CENTRAL_HEADER.pack(
+            _CENTRAL_HEADER_SIGNATURE, _ZIP_VERSION, _ZIP_VERSION, flags, member.method, dos_time, dos_date,
+            member.crc, len(member.data), member.size, len(name), 0, 0, 0, 0, _FILE_ATTRIBUTES, offset,
+        ) + name)
+
+    def close(self):
+        """Writes the central directory; the stream itself is left open."""
+        offset = self.stream.tell()
+        for header in self._central_directory:
+            self.stream.write(header)
+        size = self.stream.tell() - offset
+        count = len(self._central_directory)
+        self.stream.write(_END_OF_CENTRAL_DIRECTORY.pack(
+            _END_OF_CENTRAL_DIRECTORY_SIGNATURE, 0, 0, count, count, size, offset, 0,
+        ))
+
+
+def write_document(document, output, template=None, compress_level=6):
+    """
+    Saves a Document like ``Document.save``, through a PassthroughWriter.
+
+    Args:
+        document: The Document to save.
+        output: Path or binary file-like object.
+        template (TemplatePackage): Package of the template ``document`` was copied from, if any.
+        compress_level (int): zlib level of the members that are compressed, 0 (store) to 9.
+
+    Returns:
+        The PassthroughWriter, whose counters tell how many members were passed through.
+    """
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, "wb") as stream:
+            return write_document(document, stream, template, compress_level)
+    writer = PassthroughWriter(output, template, compress_level)
+    _write_package(document, writer)
+    writer.close()
+    return writer
@@ -0,0 +1,189 @@
+import threading
+
+from docx.table import Table, _Cell
+
+from app.utils.docx_index import get_source_cell_index
+from app.utils.table_index import get_body_table_index, table_text_changed
+from app.utils.timing import count
+
+
+# Fixed cells copied with their formatting from a Chambers submission into the
+# Legal 500 template: (field, (source table, row, column), (target table, row, column))
+CHAMBER_L500_FIELDS = (
+    ("firm_name", (0, 1, 0), (0, 0, 0)),
+    ("department_name", (4, 1, 0), (2, 0, 0)),
+    ("partner_count", (5, 1, 0), (4, 0, 1)),
+    ("other_lawyer_count", (5, 3, 0), (4, 0, 4)),
+    ("department_best_known_for", (9, 1, 0), (5, 0, 0)),
+    ("coverage_feedback", (11, 1, 0), (7, 0, 0)),
+)
+
+# Cells of a Chambers matter table copied into a Legal 500 matter table:
+# (field, (source row, column), (target row, column))
+CHAMBER_L500_MATTER_FIELDS = (
+    ("client_name", (2, 0), (2, 0)),
+    ("matter_description", (4, 0), (4, 0)),
+    ("matter_value", (6, 0), (5, 1)),
+    ("cross_border", (8, 0), (8, 0)),
+)
+
+# Fixed cells copied with their formatting from a Legal 500 submission into
+# the Chambers template
+L500_CHAMBER_FIELDS = (
+    ("firm_name", (0, 0, 0), (0, 1, 0)),
+    ("department_name", (2, 0, 0), (4, 1, 0)),
+    ("partner_count", (4, 0, 1), (5, 1, 0)),
+    ("other_lawyer_count", (4, 0, 4), (5, 3, 0)),
+    ("department_best_known_for", (5, 0, 0), (9, 1, 0)),
+    ("coverage_feedback", (7, 0, 0), (11, 1, 0)),
+)
+
+# Cells of a Legal 500 matter table copied into a Chambers matter table
+L500_CHAMBER_MATTER_FIELDS = (
+    ("client_name", (2, 0), (3, 0)),
+    ("matter_description", (4, 0), (5, 0)),
+    ("matter_value", (5, 1), (7, 0)),
+)
+
+
+class ConversionPlan:
+    """
+    A field mapping spec resolved against a template.
+
+    Copies are grouped by source table and then by target table, so executing
+    the plan looks every table up once. Target cells are addressed by the
+    position of their ``w:tr`` in the ``w:tbl`` and of their ``w:tc`` in the
+    ``w:tr``, worked out from ``table.rows[r].cells[c]`` (with its merge and
+    gridSpan handling) when the plan is compiled, so no cell grid is built and
+    no range is checked per copy.
+
+    A plan compiled from a table-relative spec (one whose coordinates have no
+    table index) has None for its tables, which are then given to ``execute``.
+    """
+
+    def __init__(self, groups):
+        """
+        Args:
+            groups (list): ``(source_table, [(target_table, copies)])`` pairs,
+                copies being ``(field, source_row, source_col, tr_position, tc_position)`` tuples.
+        """
+        self.groups = groups
+
+    def __len__(self):
+        return sum(len(copies) for _, targets in self.groups for _, copies in targets)
+
+    def execute(self, source_doc, target_doc, copy_cell, source_table=None, target_table=None):
+        """
+        Copies every field of the plan.
+
+        Args:
+            source_doc: The submission being converted.
+            target_doc: The template copy it is converted into. The targeted
+                cells must still be where they were in the template.
+            copy_cell: Function copying a source ``w:tc`` into a target _Cell,
+                given the source document part, i.e. the converter's copy_cell_content.
+            source_table (int): Source table of a table-relative plan.
+            target_table (int): Target table of a table-relative plan.
+
+        Returns:
+            The number of fields copied.
+        """
+        source_cells = get_source_cell_index(source_doc)
+        body_tables = get_body_table_index(target_doc)
+        count("cells_copied", len(self))
+        copied = 0
+        for source_index, targets in self.groups:
+            source_index = source_table if source_index is None else source_index
+            for target_index, copies in targets:
+                target_index = target_table if target_index is None else target_index
+                tbl = body_tables[target_index]
+                table = Table(tbl, target_doc._body)
+                table_text_changed(tbl)
+                for field, source_row, source_col, tr_position, tc_position in copies:
+                    try:
+                        source_cell = source_cells.cell(source_index, source_row, source_col)
+                    except IndexError as e:
+                        print(f"Error: {field}: {e}")
+                        continue
+                    if copy_cell(source_cell, _Cell(tbl[tr_position][tc_position], table), source_doc.part):
+                        copied += 1
+        return copied
+
+
+def _table_relative(spec):
+    return len(spec[0][1]) == 2
+
+
+def compile_plan(spec, template_doc, target_table=None):
+    """
+    Resolves a field mapping spec against a template.
+
+    Args:
+        spec (tuple): ``(field, source, target)`` entries such as
+            CHAMBER_L500_FIELDS, or table-relative ones such as
+            CHAMBER_L500_MATTER_FIELDS.
+        template_doc: The template, or an untouched copy of it.
+        target_table (int): For a table-relative spec, the index of a table of
+            ``template_doc`` with the layout of the tables it will be executed on.
+
+    Returns:
+        A ConversionPlan.
+
+    Raises:
+        ValueError: If a target cell does not exist in the template.
+    """
+    body_tables = get_body_table_index(template_doc)
+    relative = _table_relative(spec)
+    groups = {}
+    for field, source, target in spec:
+        if relative:
+            source, target = (None,) + tuple(source), (target_table,) + tuple(target)
+        source_index, source_row, source_col = source
+        target_index, target_row, target_col = target
+        try:
+            tbl = body_tables[target_index]
+            tc = Table(tbl, template_doc._body).rows[target_row].cells[target_col]._tc
+        except IndexError:
+            raise ValueError(f"Field {field}: the template has no cell {target}") from None
+        tr = tc.getparent()
+        if tr.getparent() is not tbl:
+            raise ValueError(f"Field {field}: cell {target} of the template is not a direct child of its table")
+        key = None if relative else target_index
+        copies = groups.setdefault(source_index, {}).setdefault(key, [])
+        copies.append((field, source_row, source_col, tbl.index(tr), tr.index(tc)))
+    return ConversionPlan([
+        (source_index, list(targets.items())) for source_index, targets in groups.items()
+    ])
+
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def conversion_plan(spec, target_doc, target_table=None):
+    """
+    Returns the plan of ``spec`` for a copy of a template, compiling it on first use.
+
+    Plans are cached per spec and template content (see TemplateCache), so
+    every conversion into the same template reuses them. A table-relative
+    plan is resolved against the first table it is requested for and then
+    reused for every table of the template, which must all share that
+    layout; the matter tables of both templates do. Documents that do not
+    come from the TemplateCache get a new plan each time.
+
+    Args:
+        spec (tuple): The field mapping spec.
+        target_doc: A copy of the template that has not been modified where
+            the spec writes to.
+        target_table (int): For a table-relative spec, the table it is first executed on.
+    """
+    template_sha256 = getattr(target_doc, "_template_sha256", None)
+    if template_sha256 is None:
+        return compile_plan(spec, target_doc, target_table)
+    key = (spec, template_sha256)
+    plan = _plans.get(key)
+    if plan is None:
+        plan = compile_plan(spec, target_doc, target_table)
+        with _plans_lock:
+            plan = _plans.setdefault(key, plan)
+    return plan
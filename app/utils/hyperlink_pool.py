@@ -0,0 +1,80 @@
+import re
+
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+
+
+# Target of copied hyperlinks whose URL cannot be found in the source document
+DEFAULT_HYPERLINK_URL = "http://www.google.com"
+
+
+class HyperlinkPool:
+    """
+    External hyperlink relationships of a document part, one per URL.
+
+    Copied hyperlinks that point to the same URL share one relationship
+    instead of each adding its own to the part's rels, and looking a URL up
+    is a dict access rather than a scan of the rels. New rIds are numbered
+    after the highest ``rId<n>`` of the part, skipping any taken since, so
+    they never collide with existing relationships.
+
+    Code that adds hyperlink relationships to the part by other means should
+    go through the pool, or it may get a second relationship to the same URL.
+    """
+
+    def __init__(self, part):
+        self.part = part
+        self._rids = {}
+        highest = 0
+        for rId, rel in part.rels.items():
+            if rel.is_external and rel.reltype == RT.HYPERLINK:
+                self._rids.setdefault(rel.target_ref, rId)
+            match = re.fullmatch(r"rId(\d+)", rId)
+            if match:
+                highest = max(highest, int(match.group(1)))
+        self._next_number = highest + 1
+
+    def rid(self, url):
+        """Returns the rId of the hyperlink relationship to ``url``, adding it on first use."""
+        rId = self._rids.get(url)
+        if rId is None:
+            rels = self.part.rels
+            while f"rId{self._next_number}" in rels:
+                self._next_number += 1
+            rId = f"rId{self._next_number}"
+            self._next_number += 1
+            rels.add_relationship(RT.HYPERLINK, url, rId, is_external=True)
+            self._rids[url] = rId
+        return rId
+
+
+def get_hyperlink_pool(part):
+    """
+    Returns the HyperlinkPool of a document part, building it on first use.
+
+    Like the table indexes, the pool lives on the object it describes, so it
+    is scoped to a single conversion.
+    """
+    pool = getattr(part, '_hyperlink_pool', None)
+    if pool is None:
+        pool = HyperlinkPool(part)
+        part._hyperlink_pool = pool
+    return pool
+
+
+def source_hyperlink_url(hyperlink, source_part):
+    """
+    Returns the URL a source ``w:hyperlink`` points to, or None.
+
+    Args:
+        hyperlink: The ``w:hyperlink`` element.
+        source_part: The part of the source document holding the element,
+            whose rels resolve its ``r:id``; None if unknown.
+    """
+    rId = hyperlink.get(qn('r:id'))
+    if rId is None or source_part is None:
+        return None
+    rel = source_part.rels.get(rId)
+    if rel is None or not rel.is_external:
+        return None
+    return rel.target_ref
@@ -0,0 +1,443 @@
+import asyncio
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from app.utils.conversion_engine import ConversionError, convert_document
+from app.utils.conversion_pool import ConversionPoolFull
+from app.utils.metrics import observe_conversion
+from app.utils.temp_files import remove_file
+from app.utils.timing import log_timings
+
+
+load_dotenv()
+
+# SQLite file holding the jobs; it survives restarts like the uploads and results in JOB_DIR
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", ".cache/jobs.sqlite3")
+# Directory where the documents of queued jobs and their results are kept
+JOB_DIR = os.getenv("JOB_DIR", ".cache/jobs")
+# Number of jobs this process converts at the same time
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Minutes a finished job and its result are kept before being deleted
+JOB_RESULT_TTL_MINUTES = int(os.getenv("JOB_RESULT_TTL_MINUTES", "60"))
+# Seconds between two looks at the queue when nothing was submitted to this process
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+# Seconds a running job stays claimed without its process renewing the claim;
+# jobs of a process that died are queued again once their lease expires
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# Seconds between two purges of the finished jobs older than the TTL
+JOB_PURGE_INTERVAL = 60
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+INVALID = "invalid"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, INVALID, FAILED, CANCELLED)
+
+
+class JobNotFound(Exception):
+    """Raised for an unknown job id, or a job whose TTL has expired."""
+
+
+class JobQueue:
+    """
+    Restart-safe queue of conversion jobs.
+
+    Jobs and their state live in a SQLite file and the uploaded documents
+    and results in ``directory``, so queued jobs survive a restart. ``workers``
+    asyncio tasks per server process claim jobs one at a time and run them
+    on the conversion pool; several server processes can share the queue
+    since claiming is done in an immediate transaction.
+
+    A claimed job holds a lease of ``lease_seconds`` under the random token
+    of the process that claimed it, which the process renews while the job
+    runs. Jobs whose lease expired, because their process died or could not
+    record their outcome, are queued again by any process sharing the queue.
+    PIDs are not used for this, since a restarted container usually gets the
+    same one.
+
+    Finished jobs are deleted with their files ``ttl_minutes`` after they
+    finished. A running job that is cancelled keeps running on its worker,
+    but its result is thrown away.
+    """
+
+    def __init__(self, path=JOB_QUEUE_PATH, directory=JOB_DIR, workers=JOB_WORKERS,
+                 ttl_minutes=JOB_RESULT_TTL_MINUTES, poll_interval=JOB_POLL_INTERVAL,
+                 lease_seconds=JOB_LEASE_SECONDS):
+        """
+        Args:
+            path (str): SQLite file of the queue.
+            directory (str): Directory for the documents and results of the jobs.
+            workers (int): Number of jobs converted at the same time by this process.
+            ttl_minutes (int): Minutes a finished job is kept.
+            poll_interval (float): Seconds between two looks at an empty queue.
+            lease_seconds (float): Seconds a claim lasts unless it is renewed.
+        """
+        self.path = path
+        self.directory = directory
+        self.workers = workers
+        self.ttl_minutes = ttl_minutes
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        # Identifies the claims of this process in the shared queue
+        self.token = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._wakeup = None
+        self._tasks = []
+        # Ids of the jobs this process is converting, whose leases it renews
+        self._running = set()
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            self._ensure_schema(connection)
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Yields a connection inside an immediate transaction, which takes the write lock up front."""
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _ensure_schema(self, connection):
+        if not self._schema_ready:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, mode TEXT NOT NULL, status TEXT NOT NULL, "
+                "message TEXT NOT NULL DEFAULT '', source_path TEXT NOT NULL, result_path TEXT NOT NULL, "
+                "worker_pid INTEGER, created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+            )
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+            # Added after the first release; queues created before get them here
+            if "worker_token" not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN worker_token TEXT")
+            if "lease_expires_at" not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN lease_expires_at REAL")
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_status_created_at ON jobs (status, created_at)")
+            self._schema_ready = True
+
+    @staticmethod
+    def _view(row):
+        return {
+            "job_id": row["id"],
+            "mode": row["mode"],
+            "status": row["status"],
+            "message": row["message"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+
+    def submit(self, mode, upload):
+        """
+        Queues the conversion of an upload.
+
+        The document is moved (or written) into the job directory, so the
+        UploadBuffer has nothing left to delete afterwards.
+
+        Args:
+            mode (str): Conversion mode, one of the keys of CONVERTERS.
+            upload (UploadBuffer): The uploaded document.
+
+        Returns:
+            dict describing the job, as returned by ``get``.
+        """
+        job_id = uuid.uuid4().hex
+        source_path = os.path.join(self.directory, f"{job_id}.docx")
+        result_path = os.path.join(self.directory, f"{job_id}_result.docx")
+        if upload.path is not None:
+            shutil.move(upload.path, source_path)
+            upload.path = None
+        else:
+            with open(source_path, "wb") as f:
+                f.write(upload.data)
+
+        try:
+            with self._lock, self._transaction() as connection:
+                connection.execute(
+                    "INSERT INTO jobs (id, mode, status, source_path, result_path, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, mode, QUEUED, source_path, result_path, time.time()),
+                )
+        except BaseException:
+            remove_file(source_path)
+            raise
+        return self.get(job_id)
+
+    def _row(self, connection, job_id):
+        row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise JobNotFound(f"Job {job_id} not found")
+        return row
+
+    def get(self, job_id):
+        """
+        Returns a dict describing the job: its id, mode, status, message and timestamps.
+
+        Raises:
+            JobNotFound: If there is no such job.
+        """
+        with self._connect() as connection:
+            return self._view(self._row(connection, job_id))
+
+    def result(self, job_id):
+        """
+        Returns the job, as returned by ``get``, and the path of its result,
+        which only exists when the status is "done".
+        """
+        with self._connect() as connection:
+            row = self._row(connection, job_id)
+            return self._view(row), row["result_path"]
+
+    def cancel(self, job_id):
+        """
+        Cancels a queued or running job; finished jobs are left as they are.
+
+        Returns:
+            dict describing the job, as returned by ``get``.
+        """
+        with self._lock, self._transaction() as connection:
+            row = self._row(connection, job_id)
+            if row["status"] in (QUEUED, RUNNING):
+                connection.execute(
+                    "UPDATE jobs SET status = ?, message = ?, finished_at = ? WHERE id = ?",
+                    (CANCELLED, "The job was cancelled.", time.time(), job_id),
+                )
+                if row["status"] == QUEUED:
+                    remove_file(row["source_path"])
+        return self.get(job_id)
+
+    def counts(self):
+        """Returns the number of jobs in each status."""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: number for status, number in rows}
+
+    def claim(self):
+        """Marks the oldest queued job as running in this process and returns its row, or None."""
+        with self._lock, self._transaction() as connection:
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker_pid = ?, worker_token = ?, started_at = ?, lease_expires_at = ? "
+                "WHERE id = ?",
+                (RUNNING, os.getpid(), self.token, now, now + self.lease_seconds, row["id"]),
+            )
+            return row
+
+    def release(self, job_id):
+        """Puts a job claimed by this process back in the queue, unless it was cancelled meanwhile."""
+        with self._lock, self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker_pid = NULL, worker_token = NULL, started_at = NULL, "
+                "lease_expires_at = NULL WHERE id = ? AND status = ? AND worker_token = ?",
+                (QUEUED, job_id, RUNNING, self.token),
+            )
+
+    def renew_leases(self, job_ids):
+        """Extends the leases of the given jobs, as long as this process still holds them."""
+        if not job_ids:
+            return
+        with self._lock, self._transaction() as connection:
+            connection.executemany(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = ? AND worker_token = ?",
+                [(time.time() + self.lease_seconds, job_id, RUNNING, self.token) for job_id in job_ids],
+            )
+
+    def finish(self, job_id, status, message):
+        """
+        Records the outcome of a job and deletes its input document.
+
+        If the job was cancelled while it ran, or was queued again after its
+        lease expired, its result is deleted instead.
+        """
+        with self._lock, self._transaction() as connection:
+            row = self._row(connection, job_id)
+            updated = connection.execute(
+                "UPDATE jobs SET status = ?, message = ?, finished_at = ?, lease_expires_at = NULL "
+                "WHERE id = ? AND status = ? AND worker_token = ?",
+                (status, message, time.time(), job_id, RUNNING, self.token),
+            ).rowcount
+        if not updated and row["status"] != CANCELLED:
+            # The job was queued again and someone else converts it from its input
+            return
+        remove_file(row["source_path"])
+        if not updated or status != DONE:
+            remove_file(row["result_path"])
+
+    def requeue_abandoned(self):
+        """
+        Queues again the running jobs whose lease expired, e.g. because their process died.
+
+        Returns:
+            Number of jobs queued again.
+        """
+        with self._lock, self._transaction() as connection:
+            return connection.execute(
+                "UPDATE jobs SET status = ?, worker_pid = NULL, worker_token = NULL, started_at = NULL, "
+                "lease_expires_at = NULL WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)",
+                (QUEUED, RUNNING, time.time()),
+            ).rowcount
+
+    def purge_expired(self):
+        """
+        Deletes the finished jobs older than the TTL together with their files.
+
+        Returns:
+            Number of jobs deleted.
+        """
+        cutoff = time.time() - self.ttl_minutes * 60
+        with self._lock, self._transaction() as connection:
+            rows = connection.execute(
+                f"SELECT id, source_path, result_path FROM jobs "
+                f"WHERE status IN ({','.join('?' * len(FINISHED))}) AND finished_at < ?",
+                (*FINISHED, cutoff),
+            ).fetchall()
+            connection.executemany("DELETE FROM jobs WHERE id = ?", [(row["id"],) for row in rows])
+        for row in rows:
+            remove_file(row["source_path"])
+            remove_file(row["result_path"])
+        return len(rows)
+
+    def notify(self):
+        """Wakes up the idle workers of this process. Call it from the event loop after ``submit``."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self, pool):
+        """Starts the workers and the lease and TTL upkeep on the event loop."""
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work(pool)) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._purge()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, pool):
+        while True:
+            # Cleared before looking so that a submit during the lookup is not missed
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self.claim)
+            except sqlite3.Error as e:
+                print(f"Warning: Could not read the job queue: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._running.add(job["id"])
+            try:
+                await self._run(pool, job)
+            except Exception as e:
+                # Keep the worker alive; the job's lease lapses and it is queued again
+                print(f"Error running job {job['id']}: {type(e).__name__}: {e}")
+            finally:
+                self._running.discard(job["id"])
+
+    async def _record(self, method, *args):
+        """
+        Runs ``release`` or ``finish`` off the event loop.
+
+        Returns:
+            False if the queue could not be written; the job then keeps its
+            claim until the lease expires and is queued again.
+        """
+        try:
+            await asyncio.to_thread(method, *args)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not update job {args[0]} in the job queue: {e}")
+            return False
+        return True
+
+    async def _run(self, pool, job):
+        try:
+            size = os.path.getsize(job["source_path"])
+        except OSError:
+            size = None
+        try:
+            is_valid, message, _, summary = await pool.run(
+                convert_document, job["mode"], job["source_path"], job["result_path"]
+            )
+        except ConversionPoolFull:
+            # The pool is busy with direct requests; try again later
+            await self._record(self.release, job["id"])
+            await asyncio.sleep(self.poll_interval)
+            return
+        except asyncio.CancelledError:
+            # Shutting down: the job is picked up again after the restart
+            await asyncio.shield(self._record(self.release, job["id"]))
+            raise
+        except ConversionError as e:
+            print(f"Error converting job {job['id']}: {e}")
+            if await self._record(self.finish, job["id"], FAILED, "The document could not be converted."):
+                observe_conversion("job", job["mode"], "failed", time.time() - job["created_at"], size)
+            return
+        log_timings("conversion", summary, mode=job["mode"], job_id=job["id"])
+        if not await self._record(self.finish, job["id"], DONE if is_valid else INVALID, message):
+            return
+        # Jobs are timed from their submission, so the duration includes their time in the queue
+        outcome = "converted" if is_valid else "invalid"
+        observe_conversion("job", job["mode"], outcome, time.time() - job["created_at"], size, summary)
+
+    async def _purge(self):
+        # Leases are renewed a few times per lease, so one failed write does not lose them
+        interval = min(self.lease_seconds / 4, JOB_PURGE_INTERVAL)
+        last_purge = 0.0
+        while True:
+            try:
+                await asyncio.to_thread(self.renew_leases, list(self._running))
+                requeued = await asyncio.to_thread(self.requeue_abandoned)
+                if requeued:
+                    print(f"Requeued {requeued} abandoned conversion jobs")
+                    self.notify()
+            except sqlite3.Error as e:
+                print(f"Warning: Could not renew the job leases: {e}")
+            if time.monotonic() - last_purge >= JOB_PURGE_INTERVAL:
+                try:
+                    removed = await asyncio.to_thread(self.purge_expired)
+                    if removed:
+                        print(f"Removed {removed} expired conversion jobs")
+                    last_purge = time.monotonic()
+                except sqlite3.Error as e:
+                    print(f"Warning: Could not purge the job queue: {e}")
+            await asyncio.sleep(interval)
+
+
+def create_job_queue():
+    """Builds the queue from the environment, creating its directories."""
+    Path(JOB_QUEUE_PATH).parent.mkdir(parents=True, exist_ok=True)
+    Path(JOB_DIR).mkdir(parents=True, exist_ok=True)
+    return JobQueue()
+
+
+job_queue = create_job_queue()
@@ -3,6 +3,7 @@ from docx.shared import RGBColor, Pt
 from lxml import etree
 from docx.oxml.ns import nsdecls
 from docx.oxml import parse_xml
+import copy
 import zipfile
 from docx.oxml.ns import qn
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_UNDERLINE, WD_LINE_SPACING
@@ -12,6 +13,29 @@ import re
 import os
 from docx.oxml.shared import OxmlElement, qn as oxml_qn
 
+from app.utils.docx_io import open_document, save_document
+from app.utils.docx_index import get_source_cell_index, invalidate_source_cell_index, xpath
+from app.utils.field_mapping import L500_CHAMBER_FIELDS, L500_CHAMBER_MATTER_FIELDS, conversion_plan
+from app.utils.hyperlink_pool import DEFAULT_HYPERLINK_URL, get_hyperlink_pool, source_hyperlink_url
+from app.utils.paragraph_formatting import ParagraphPropertiesTranslator
+from app.utils.run_formatting import run_format_translator
+from app.utils.table_index import (
+    TableView,
+    add_table_row,
+    body_table,
+    clone_element,
+    get_body_table_index,
+    get_table_text_index,
+    new_page_break_paragraph,
+    remove_table_row,
+    replicate_table,
+    set_cell_text,
+    table_rows_changed,
+    table_text_changed,
+    write_cell_text,
+)
+from app.utils.timing import count, stage, timed
+
 def delete_table_row(document: Document, table_index, row_index: int) -> None:
     table = document.tables[table_index]
     try:
@@ -26,25 +50,21 @@ def delete_table_row(document: Document, table_index, row_index: int) -> None:
         
         row_to_delete = rows[row_index]
         table_element.remove(row_to_delete)
+        invalidate_source_cell_index(document)
+        table_rows_changed(table_element)
         
     except Exception as e:
         raise RuntimeError(f"Failed to delete row: {str(e)}") from e
 
-def extract_specific_textbox_text(docx_file, textbox_index):
+def extract_specific_textbox_text(doc, textbox_index):
     try:
-        with zipfile.ZipFile(docx_file) as z:
-            xml_content = z.read('word/document.xml')
-        tree = etree.fromstring(xml_content)
-        ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-              'v': 'urn:schemas-microsoft-com:vml'}
-
-        textboxes = tree.xpath('//v:shape[v:textbox]', namespaces=ns)
+        textboxes = xpath(doc.element, '//v:shape[v:textbox]')
 
         if textbox_index < 0 or textbox_index >= len(textboxes):
             return None
 
         target_textbox = textboxes[textbox_index]
-        text_elements = target_textbox.xpath('.//w:t', namespaces=ns)
+        text_elements = xpath(target_textbox, './/w:t')
         text = "".join([t.text for t in text_elements])
 
         return text
@@ -58,13 +78,15 @@ def copy_cell_content_to_target_cell(source_doc, source_table_index, source_row_
     """
     Copies cell content with formatting from one cell to another cell in a target Document object.
     """
+    count("cells_copied")
     try:
         # ===== TARGET CELL VALIDATION =====
-        if not hasattr(target_doc, 'tables') or target_table_index >= len(target_doc.tables) or target_table_index < 0:
-            print(f"Error: Target table index {target_table_index} out of range (0-{len(target_doc.tables)-1})")
+        target_tables = get_body_table_index(target_doc)
+        if target_table_index >= len(target_tables) or target_table_index < 0:
+            print(f"Error: Target table index {target_table_index} out of range (0-{len(target_tables)-1})")
             return False
             
-        target_table = target_doc.tables[target_table_index]
+        target_table = body_table(target_doc, target_table_index)
         if target_row_index >= len(target_table.rows) or target_row_index < 0:
             print(f"Error: Target row index {target_row_index} out of range (0-{len(target_table.rows)-1})")
             return False
@@ -76,151 +98,51 @@ def copy_cell_content_to_target_cell(source_doc, source_table_index, source_row_
             
         target_cell = target_row.cells[target_col_index]
         
-        # ===== SOURCE CONTENT EXTRACTION =====
+        # ===== SOURCE CELL LOOKUP =====
         try:
-            source_xml_content = source_doc.part.blob
-            source_tree = etree.fromstring(source_xml_content)
-            
-        except Exception as e:
-            print(f"Error parsing source document XML: {str(e)}")
+            source_cell = get_source_cell_index(source_doc).cell(source_table_index, source_row_index, source_col_index)
+        except IndexError as e:
+            print(f"Error: {e}")
             return False
 
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+    table_text_changed(target_table._tbl)
+    return copy_cell_content(source_cell, target_cell, source_doc.part)
+
+def copy_cell_content(source_cell, target_cell, source_part=None):
+    """
+    Copies the paragraphs of a source ``w:tc`` element, with their formatting, into a target _Cell.
+
+    ``source_part`` is the part of the source document holding the cell; it
+    resolves the URLs of the copied hyperlinks.
+    """
+    try:
         ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
               'wp': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
               'xml': 'http://www.w3.org/XML/1998/namespace'}
-        
-        # ===== SOURCE CELL VALIDATION =====
-        source_tables = source_tree.xpath('//w:tbl', namespaces=ns)
-        if source_table_index >= len(source_tables) or source_table_index < 0:
-            print(f"Error: Source table index {source_table_index} out of range (0-{len(source_tables)-1})")
-            return False
 
-        source_rows = source_tables[source_table_index].xpath('.//w:tr', namespaces=ns)
-        if source_row_index >= len(source_rows) or source_row_index < 0:
-            print(f"Error: Source row index {source_row_index} out of range (0-{len(source_rows)-1})")
-            return False
-
-        source_cells = source_rows[source_row_index].xpath('.//w:tc', namespaces=ns)
-        if source_col_index >= len(source_cells) or source_col_index < 0:
-            print(f"Error: Source column index {source_col_index} out of range (0-{len(source_cells)-1})")
-            return False
-
-        source_cell = source_cells[source_col_index]
-        source_paragraphs = source_cell.xpath('.//w:p', namespaces=ns)
+        source_paragraphs = xpath(source_cell, './/w:p')
         
         # ===== CONTENT COPYING =====
         target_cell.text = ""  # Clear target cell
 
 
-        first_paragraph = True
-        n = 0
-        pre_left = ''
-        pre_hanging = ''
+        translator = ParagraphPropertiesTranslator('1', len(source_paragraphs))
         for i, paragraph in enumerate(source_paragraphs):
             
             # Create or get paragraph
-            if first_paragraph:
+            if i == 0:
                 new_paragraph = target_cell.paragraphs[0]
-                first_paragraph = False
             else:
                 new_paragraph = target_cell.add_paragraph()
                     
             # Copy paragraph formatting
-            ppr = paragraph.find('.//w:pPr', namespaces=ns)
-            if ppr is not None:
-                new_ppr = new_paragraph._element.get_or_add_pPr()
-                
-                numpr = ppr.find('.//w:numPr', namespaces=ns)
-                if numpr is not None:
-                    try:
-                        ilvl = numpr.find('.//w:ilvl', namespaces=ns)
-                        numId = numpr.find('.//w:numId', namespaces=ns)
-                        if ilvl is not None and numId is not None:
-                            # new_paragraph.paragraph_format.left_indent = Pt(18 * int(ilvl.get(qn('w:val'))) + 35)
-                            new_numpr = etree.SubElement(new_ppr, qn('w:numPr'))
-                            etree.SubElement(new_numpr, qn('w:ilvl'), {qn('w:val'): ilvl.get(qn('w:val'))})
-                            etree.SubElement(new_numpr, qn('w:numId'), {qn('w:val'): '1'})
-                    except Exception as e:
-                        print(f"Warning: Could not copy numbering - {str(e)}")
-                
-                rpr = ppr.find('.//w:rPr', namespaces=ns)
-                if rpr is not None:
-                    color = rpr.find('.//w:color', namespaces=ns)
-                    if color is not None:
-                        if not new_paragraph.runs:
-                            new_paragraph.add_run('')
-                        
-                        for run in new_paragraph.runs:
-                            rPr = run._r.get_or_add_rPr()
-                            etree.SubElement(rPr, qn('w:color'), {qn('w:val'): color.get(qn('w:val'))})
-                
-                # Copy the pStyle if it exists
-                pstyle = ppr.find('.//w:pStyle', namespaces=ns)
-                if pstyle is not None:
-                    
-                    new_style = etree.SubElement(new_ppr, qn('w:pStyle'))
-                    style_name = pstyle.get(qn('w:val'))
-                    new_style.set(qn('w:val'), style_name)
-                    
-                # indent handling
-                ind = ppr.find('.//w:ind', namespaces=ns)
-                if ind is not None and numpr is None:
-                    new_ind = etree.SubElement(new_ppr, qn('w:ind'))
-                    
-                    left = ind.get(qn('w:left'))
-                    # print(type(left))
-                    if left is not None:
-                        new_ind.set(qn('w:left'), left)
-                        pre_left = left
-                        n = i
-                    hanging = ind.get(qn('w:hanging'))
-                    if hanging is not None:
-                        new_ind.set(qn('w:hanging'), hanging)
-                        pre_hanging = hanging
-                    
-                
-                if i == n + 1 and numpr is None:
-                    # Create new indentation element
-                    new_ind = etree.SubElement(new_ppr, qn('w:ind'))
-                    if pre_left is not None:
-                        new_ind.set(qn('w:left'), pre_left)
-                    if pre_hanging is not None:
-                        new_ind.set(qn('w:hanging'), pre_hanging)
-                
-                # Spacing handling
-                spacing = ppr.find('.//w:spacing', namespaces=ns)
-                is_last_paragraph = (i == len(source_paragraphs) - 1)
-                is_empty = not paragraph.xpath('.//w:r/w:t', namespaces=ns)
-
-                if spacing is not None:
-                    # Space before
-                    before = spacing.get(qn('w:before'))
-                    if before is not None:
-                        new_paragraph.paragraph_format.space_before = Pt(min(int(before)/20, 6))  # Max 6pt
-                    
-                    # Space after (none for last paragraph)
-                    after = spacing.get(qn('w:after'))
-                    if after is not None and not is_last_paragraph:
-                        new_paragraph.paragraph_format.space_after = Pt(min(int(after)/20, 6))  # Max 6pt
-                    else:
-                        new_paragraph.paragraph_format.space_after = Pt(0)
-
-                    # Line spacing
-                    line = spacing.get(qn('w:line'))
-                    if line is not None:
-                        line_rule = spacing.get(qn('w:lineRule'), 'auto')
-                        line_val = int(line)
-                        if line_rule == 'exact':
-                            new_paragraph.paragraph_format.line_spacing = Pt(line_val/20)
-                        elif line_rule == 'atLeast':
-                            new_paragraph.paragraph_format.line_spacing_rule = WD_LINE_SPACING.AT_LEAST
-                            new_paragraph.paragraph_format.line_spacing = Pt(line_val/20)
-                        else:  # auto or multiple
-                            new_paragraph.paragraph_format.line_spacing = line_val/240  # 240 = 12pt*20
-                else:
-                    new_paragraph.paragraph_format.space_after = Pt(0)
+            translator.translate(i, paragraph, new_paragraph._p)
 
-            process_paragraph(paragraph, new_paragraph, ns)
+            process_paragraph(paragraph, new_paragraph, ns, source_part)
             
         return True
 
@@ -228,7 +150,7 @@ def copy_cell_content_to_target_cell(source_doc, source_table_index, source_row_
         print(f"Error: {e}")
         return False
 
-def process_paragraph(paragraph, new_paragraph, ns):
+def process_paragraph(paragraph, new_paragraph, ns, source_part=None):
     # Track both types of hyperlinks
     in_field_hyperlink = False
     in_modern_hyperlink = False
@@ -239,13 +161,13 @@ def process_paragraph(paragraph, new_paragraph, ns):
     }
     
     # Process all elements in original order
-    for element in paragraph.xpath('./*', namespaces=ns):
+    for element in xpath(paragraph, './*'):
         # Reset modern hyperlink flag at start of each element
         in_modern_hyperlink = False
         
         # Check for modern hyperlink (w:hyperlink element)
         if element.tag.endswith('}hyperlink'):
-            process_modern_hyperlink(element, new_paragraph, ns)
+            process_modern_hyperlink(element, new_paragraph, ns, source_part)
             in_modern_hyperlink = True
             continue
         
@@ -284,30 +206,20 @@ def process_paragraph(paragraph, new_paragraph, ns):
                 if not in_field_hyperlink and not in_modern_hyperlink:
                     process_regular_run(run, new_paragraph, ns)
 
-def process_modern_hyperlink(hyperlink, new_paragraph, ns):
-    part = new_paragraph.part
-    rels = part.rels
-    
-    # Generate unique rId
-    next_rId = f"rId{len(rels) + 1}"
-    
-    # Add relationship
-    rels.add_relationship(
-        "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink",
-        "http://www.google.com",  # Default URL
-        is_external=True,
-        rId=next_rId
-    )
+def process_modern_hyperlink(hyperlink, new_paragraph, ns, source_part=None):
+    # One relationship per URL in the target part
+    url = source_hyperlink_url(hyperlink, source_part) or DEFAULT_HYPERLINK_URL
+    next_rId = get_hyperlink_pool(new_paragraph.part).rid(url)
     
     # Create hyperlink element
     hyperlink_copy = OxmlElement('w:hyperlink')
     hyperlink_copy.set(qn('r:id'), next_rId)
     
     # Copy all runs from original hyperlink
-    for run in hyperlink.xpath('.//w:r', namespaces=ns):
+    for run in xpath(hyperlink, './/w:r'):
         run_copy = OxmlElement('w:r')
         for child in run:
-            run_copy.append(etree.fromstring(etree.tostring(child)))
+            run_copy.append(copy.deepcopy(child))
         
         # Apply hyperlink formatting
         rPr = run_copy.find('w:rPr', namespaces=ns) or OxmlElement('w:rPr')
@@ -445,52 +357,8 @@ def process_regular_run(run, new_paragraph, ns):
     if text_element is not None and text_element.text:
         new_run = new_paragraph.add_run(text_element.text)
         
-        # Default formatting
-        new_run.font.name = "Times New Roman"
-        new_run.font.size = Pt(11)
-        
-        # Copy run formatting
-        rpr = run.find('.//w:rPr', namespaces=ns)
-        if rpr is not None:
-            # Color
-            color_element = rpr.find('.//w:color', namespaces=ns)
-            if color_element is not None and color_element.get(qn('w:val')):
-                color_hex = color_element.get(qn('w:val'))
-                try:
-                    new_run.font.color.rgb = RGBColor.from_string(color_hex)
-                except ValueError:
-                    pass
-
-            # Bold/Italic
-            if rpr.find('.//w:b', namespaces=ns) is not None:
-                new_run.bold = True
-            if rpr.find('.//w:i', namespaces=ns) is not None:
-                new_run.italic = True
-                
-            # Underline
-            underline_element = rpr.find('.//w:u', namespaces=ns)
-            if underline_element is not None:
-                underline_val = underline_element.get(qn('w:val'))
-                underline_mapping = {
-                    'single': WD_UNDERLINE.SINGLE,
-                    'double': WD_UNDERLINE.DOUBLE,
-                    'thick': WD_UNDERLINE.THICK,
-                    'dotted': WD_UNDERLINE.DOTTED,
-                    'dash': WD_UNDERLINE.DASH,
-                    'dotDash': WD_UNDERLINE.DOT_DASH,
-                    'dotDotDash': WD_UNDERLINE.DOT_DOT_DASH,
-                    'wave': WD_UNDERLINE.WAVY,
-                    'none': WD_UNDERLINE.NONE,
-                }
-                new_run.font.underline = underline_mapping.get(underline_val, WD_UNDERLINE.SINGLE)
-                
-                # Underline color
-                underline_color = underline_element.get(qn('w:color'))
-                if underline_color:
-                    try:
-                        new_run.font.underline_color.rgb = RGBColor.from_string(underline_color)
-                    except ValueError:
-                        pass
+        # Default font plus the color, bold, italic and underline of the source run
+        new_run._r.insert(0, run_format_translator.run_properties(run.find('.//w:rPr', namespaces=ns)))
 
 def copy_row_formatting(source_row, target_row):
     namespaces = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
@@ -530,20 +398,15 @@ def get_cell_background_color(cell):
         return fill_color
     return None
 
-def extract_specific_dropdown_pre_display_text(docx_file, dropdown_index):
+def extract_specific_dropdown_pre_display_text(doc, dropdown_index):
     try:
-        with zipfile.ZipFile(docx_file) as z:
-            xml_content = z.read('word/document.xml')
-        tree = etree.fromstring(xml_content)
-        ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-
-        dropdowns = tree.xpath('//w:sdt[.//w:dropDownList]', namespaces=ns)
+        dropdowns = xpath(doc.element, '//w:sdt[.//w:dropDownList]')
 
         if dropdown_index < 0 or dropdown_index >= len(dropdowns):
             return None
 
         target_dropdown = dropdowns[dropdown_index]
-        text_elements = target_dropdown.xpath('.//w:sdtContent//w:t', namespaces=ns)
+        text_elements = xpath(target_dropdown, './/w:sdtContent//w:t')
         pre_display_text = "".join([t.text for t in text_elements]) if text_elements else None
 
         return pre_display_text
@@ -553,24 +416,12 @@ def extract_specific_dropdown_pre_display_text(docx_file, dropdown_index):
         return None
     
 def find_tables_with_specific_string(doc, search_string):
-    matching_table_indexes = []
-
-    for i, table in enumerate(doc.tables):
-        for row in table.rows:
-            for cell in row.cells:
-                if search_string in cell.text.strip():
-                    matching_table_indexes.append(i)
-                    break
-            else:
-                continue
-            break
-
-    return matching_table_indexes
+    return get_table_text_index(doc).find(search_string)
 
 def delete_table_with_paragraphs(doc, table_index, num_paragraphs_above=0, num_paragraphs_below=0):
     try:
-        table = doc.tables[table_index]
-        table_xml = table._element
+        tables = get_body_table_index(doc)
+        table_xml = tables[table_index]
         body = doc.element.body
 
         paragraphs_above_xml = []
@@ -595,6 +446,7 @@ def delete_table_with_paragraphs(doc, table_index, num_paragraphs_above=0, num_p
         for element in elements_to_remove:
             if element is not None:
                 body.remove(element)
+        tables.pop(table_index)
 
         doc.part._element = doc.element
 
@@ -605,49 +457,51 @@ def delete_table_with_paragraphs(doc, table_index, num_paragraphs_above=0, num_p
         
 def copy_table_with_paragraphs(source_doc, source_table_index, target_doc, target_index, num_paragraphs_above=0, num_paragraphs_below=0):
     try:
-        source_table = source_doc.tables[source_table_index]
-        table_xml = source_table._element
+        table_xml = get_body_table_index(source_doc)[source_table_index]
 
         paragraphs_above_xml = []
         element = table_xml.getprevious()
-        count = 0
-        while element is not None and count < num_paragraphs_above:
+        found = 0
+        while element is not None and found < num_paragraphs_above:
             if element.tag.endswith('p'):
                 paragraphs_above_xml.insert(0, element)
-                count += 1
+                found += 1
             element = element.getprevious()
 
         paragraphs_below_xml = []
         element = table_xml.getnext()
-        count = 0
-        while element is not None and count < num_paragraphs_below:
+        found = 0
+        while element is not None and found < num_paragraphs_below:
             if element.tag.endswith('p'):
                 paragraphs_below_xml.append(element)
-                count += 1
+                found += 1
             element = element.getnext()
 
-        new_table_xml = etree.fromstring(etree.tostring(table_xml))
+        new_table_xml = clone_element(table_xml)
+        count("tables_cloned")
 
         target_body = target_doc.element.body
 
-        if target_index < len(target_doc.tables):
-            target_table_xml = target_doc.tables[target_index]._element
-            insert_before = target_table_xml
+        target_tables = get_body_table_index(target_doc)
+        if target_index < len(target_tables):
+            insert_before = target_tables[target_index]
         else:
             insert_before = None
 
         if insert_before is not None:
             for p_xml in paragraphs_above_xml:
-                target_body.insert(target_body.index(insert_before), p_xml)
-            target_body.insert(target_body.index(insert_before), new_table_xml)
+                insert_before.addprevious(p_xml)
+            insert_before.addprevious(new_table_xml)
             for p_xml in paragraphs_below_xml:
-                target_body.insert(target_body.index(insert_before), p_xml)
+                insert_before.addprevious(p_xml)
+            target_tables.insert(target_index, new_table_xml)
         else:
             for p_xml in paragraphs_above_xml:
                 target_body.append(p_xml)
             target_body.append(new_table_xml)
             for p_xml in paragraphs_below_xml:
                 target_body.append(p_xml)
+            target_tables.append(new_table_xml)
 
         target_doc.part._element = target_doc.element
 
@@ -658,15 +512,13 @@ def copy_table_with_paragraphs(source_doc, source_table_index, target_doc, targe
         
 def add_page_break_before_table(doc, table_index):
     try:
-        table = doc.tables[table_index]
-        table_element = table._element
-        body = doc.element.body
+        table_element = get_body_table_index(doc)[table_index]
 
         new_paragraph = etree.Element(qn('w:p'))
         new_run = etree.SubElement(new_paragraph, qn('w:r'))
         new_br = etree.SubElement(new_run, qn('w:br'), {qn('w:type'): 'page'})
 
-        body.insert(body.index(table_element), new_paragraph)
+        table_element.addprevious(new_paragraph)
 
         doc.part._element = doc.element
 
@@ -677,38 +529,89 @@ def add_page_break_before_table(doc, table_index):
 
 def write_text_to_cell(doc, table_index, row_index, cell_index, text, font_size, bold=True, alignment="left"):
     try:
-        table = doc.tables[table_index]
-        cell = table.rows[row_index].cells[cell_index]
-        paragraph = cell.paragraphs[0]
-        run = paragraph.clear().add_run(text)
-
-        font = run.font
-        font.name = "Times New Roman"
-        font.size = Pt(font_size)
-        font.bold = bold
-
-        if alignment == "left":
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        elif alignment == "center":
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        elif alignment == "right":
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        else:
-            print("Warning: Invalid alignment specified. Defaulting to left.")
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
+        table = body_table(doc, table_index)
+        table_text_changed(table._tbl)
+        write_text_to_table_cell(table, row_index, cell_index, text, font_size, bold, alignment)
 
     except IndexError:
         print("Error: Table, row, or cell index out of range.")
     except Exception as e:
         print(f"Error: {e}")
-        
+
+def write_text_to_table_cell(table, row_index, cell_index, text, font_size, bold=True, alignment="left"):
+    """
+    Same as write_text_to_cell for a Table object, which may not be part of the
+    document body yet (e.g. a copy being prepared by replicate_table).
+    """
+    cell = table.rows[row_index].cells[cell_index]
+    paragraph = cell.paragraphs[0]
+    run = paragraph.clear().add_run(text)
+
+    font = run.font
+    font.name = "Times New Roman"
+    font.size = Pt(font_size)
+    font.bold = bold
+
+    if alignment == "left":
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    elif alignment == "center":
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    elif alignment == "right":
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    else:
+        print("Warning: Invalid alignment specified. Defaulting to left.")
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
+
+@timed("matter_replication")
+def replicate_matter_tables(doc, table_index, count, heading, title_prefix, before=True, first_page_break=1):
+    """
+    Turns the matter table at table_index into count numbered matter tables.
+
+    The copies are inserted next to the prototype in one go. Every table of
+    the run gets "Matter n" in its second row, the first one also gets the
+    section heading in its first row, and the tables from position
+    first_page_break of the run on (0-based) are preceded by a page break.
+
+    Args:
+        doc (docx.Document): The Document object.
+        table_index (int): The index of the matter table used as prototype.
+        count (int): The total number of matter tables wanted.
+        heading (str): Section heading written in the first table.
+        title_prefix (str): Title text, followed by the matter number.
+        before (bool): Whether the copies go before the prototype, which then ends the run.
+        first_page_break (int): Position in the run of the first table preceded by a page break.
+    """
+    def position(number):
+        return number - 1 if before else number
+
+    # The title runs are formatted once on the prototype, the copies only get their text
+    def format_titles(table):
+        write_text_to_table_cell(table, 0, 0, "", 13, alignment="left")
+        write_text_to_table_cell(table, 1, 0, "", 14, alignment="center")
+
+    def write_titles(table, position):
+        if position == 0:
+            set_cell_text(table, 0, 0, heading)
+        set_cell_text(table, 1, 0, title_prefix + str(position + 1))
+
+    replicate_table(doc, table_index, count - 1, before=before,
+                    separator=lambda number: new_page_break_paragraph() if position(number) >= first_page_break else None,
+                    prepare=lambda table, number: write_titles(table, position(number)),
+                    prepare_prototype=format_titles)
+    if count > 0:
+        prototype_position = count - 1 if before else 0
+        prototype_index = table_index + prototype_position
+        if prototype_position >= first_page_break:
+            add_page_break_before_table(doc, prototype_index)
+        write_text_to_cell(doc, prototype_index, 0, 0, heading if prototype_position == 0 else "", 13, alignment="left")
+        write_text_to_cell(doc, prototype_index, 1, 0, title_prefix + str(prototype_position + 1), 14, alignment="center")
+
 def copy_publishable_matter_to_target(source_doc, target_doc, source_table_index, target_table_index):
-    source_publishableMatter_table = source_doc.tables[source_table_index]
+    source_publishableMatter_table = TableView(source_doc.tables[source_table_index])
     target_publishableMatter_table = target_doc.tables[target_table_index]
     
-    copy_cell_content_to_target_cell(source_doc, source_table_index, 2, 0, target_doc, target_table_index, 3, 0)
-    copy_cell_content_to_target_cell(source_doc, source_table_index, 4, 0, target_doc, target_table_index, 5, 0)
-    copy_cell_content_to_target_cell(source_doc, source_table_index, 5, 1, target_doc, target_table_index, 7, 0)
+    matter_plan = conversion_plan(L500_CHAMBER_MATTER_FIELDS, target_doc, target_table_index)
+    matter_plan.execute(source_doc, target_doc, copy_cell_content, source_table_index, target_table_index)
     
     for i in range(len(source_publishableMatter_table.rows)):
         cell_text = source_publishableMatter_table.cell(i, 0).text.strip()
@@ -838,99 +741,102 @@ def copy_publishable_matter_to_target(source_doc, target_doc, source_table_index
         if "Start date" in cell_text:
             write_text_to_cell(target_doc, target_table_index, 17, 0, source_publishableMatter_table.cell(i + 1, 4).text.strip(), 11, bold=False, alignment="left")
         
-async def l500_chamber_convert(source_docx_path, target_docx_path):
+def l500_chamber_convert(source_docx_path, target_docx_path, output=None):
+    """
+    Converts a Legal 500 submission into the Chambers template.
+
+    Args:
+        source_docx_path: Path, file-like object or loaded Document of the
+            Legal 500 document, normally already normalized by validate_document.
+        target_docx_path: Path, file-like object or loaded Document of the Chambers template.
+        output: Path or file-like object the result is saved to. Defaults to
+            "<source>_result.docx" next to the source file, which requires the
+            source to be a path.
+
+    Returns:
+        The output the result was saved to.
+    """
     # Load the source and target documents
-    source_doc = Document(source_docx_path)
-    target_doc = Document(target_docx_path)
+    source_doc = open_document(source_docx_path)
+    target_doc = open_document(target_docx_path)
 
-    # Extract the Firm Name
-    copy_cell_content_to_target_cell(source_doc, 0, 0, 0,
-                                      target_doc, 0, 1, 0)
+    stage("firm_details")
+    # Copy the fixed fields: firm and department names, department size,
+    # what the department is best known for and the coverage feedback
+    conversion_plan(L500_CHAMBER_FIELDS, target_doc).execute(source_doc, target_doc, copy_cell_content)
     
     # Extract the Practice Area
-    practiceArea_text = extract_specific_dropdown_pre_display_text(source_docx_path, 0)
+    practiceArea_text = extract_specific_dropdown_pre_display_text(source_doc, 0)
     write_text_to_cell(target_doc, 1, 1, 0, practiceArea_text, 11, bold=False, alignment="left")
     
     # Extract the Location
-    location_text = extract_specific_textbox_text(source_docx_path, 0)
+    location_text = extract_specific_textbox_text(source_doc, 0)
     write_text_to_cell(target_doc, 2, 1, 0, location_text, 11, bold=False, alignment="left")
     
     # Extract the Contact Details
-    source_contactDetail_table = source_doc.tables[1]
+    source_contactDetail_table = TableView(source_doc.tables[1])
     target_contactDetail_table = target_doc.tables[3]
     for i in range(len(target_contactDetail_table.rows) - 1, 2, -1):
         temp_row = target_contactDetail_table.rows[i]
-        target_contactDetail_table._element.remove(temp_row._element)
+        remove_table_row(target_contactDetail_table, temp_row)
     for i in range(1, len(source_contactDetail_table.rows)):
         if source_contactDetail_table.cell(i, 0).text.strip() != "":  
             if i < len(source_contactDetail_table.rows) - 1:
                 source_row = target_contactDetail_table.rows[2]
-                new_row = target_contactDetail_table.add_row()
+                new_row = add_table_row(target_contactDetail_table)
                 copy_row_formatting(source_row, new_row)
             copy_cell_content_to_target_cell(source_doc, 1, i, 0, target_doc, 3, i + 1, 0)
             copy_cell_content_to_target_cell(source_doc, 1, i, 2, target_doc, 3, i + 1, 1)
             copy_cell_content_to_target_cell(source_doc, 1, i, 3, target_doc, 3, i + 1, 2)
             
     
-    # Extract the Department Name    
-    copy_cell_content_to_target_cell(source_doc, 2, 0, 0, target_doc, 4, 1, 0)
-    
-    # Extract the Department Information
-    copy_cell_content_to_target_cell(source_doc, 4, 0, 1, target_doc, 5, 1, 0)
-    copy_cell_content_to_target_cell(source_doc, 4, 0, 4, target_doc, 5, 3, 0)
-    
     # Extract the Heads of Team(Department)
-    source_headsOfteam_table = source_doc.tables[3]
+    source_headsOfteam_table = TableView(source_doc.tables[3])
     target_headsOfteam_table = target_doc.tables[6]
     for i in range(len(target_headsOfteam_table.rows) - 1, 2, -1):
         temp_row = target_headsOfteam_table.rows[i]
-        target_headsOfteam_table._element.remove(temp_row._element)
+        remove_table_row(target_headsOfteam_table, temp_row)
     for i in range(1, len(source_headsOfteam_table.rows)):
         if source_headsOfteam_table.cell(i, 0).text.strip() != "":   
             if i < len(source_headsOfteam_table.rows) - 1:
                 source_row = target_headsOfteam_table.rows[2]
-                new_row = target_headsOfteam_table.add_row()
+                new_row = add_table_row(target_headsOfteam_table)
                 copy_row_formatting(source_row, new_row)
             copy_cell_content_to_target_cell(source_doc, 3, i, 0, target_doc, 6, i + 1, 0)
         
-    # Extract the factor of best department
-    copy_cell_content_to_target_cell(source_doc, 5, 0, 0, target_doc, 9, 1, 0)
-    
     # Extract the client's feedback
     feedback_indices = find_tables_with_specific_string(source_doc, search_string="Comments")
     if len(feedback_indices) > 0:
         source_feedback_table_index = feedback_indices[0]
         # print(source_feedback_table_index)
-        source_feedback_table = source_doc.tables[source_feedback_table_index]
+        source_feedback_table = TableView(source_doc.tables[source_feedback_table_index])
         target_feedback_table = target_doc.tables[10]
         for i in range(len(target_feedback_table.rows) - 1, 2, -1):
             temp_row = target_feedback_table.rows[i]
-            target_feedback_table._element.remove(temp_row._element)
+            remove_table_row(target_feedback_table, temp_row)
         for i in range(1, len(source_feedback_table.rows)):
             # print(source_feedback_table.cell(i, 0).text.strip())
             if source_feedback_table.cell(i, 0).text.strip() != "":
                 source_row = target_feedback_table.rows[2]
-                new_row = target_feedback_table.add_row()
+                new_row = add_table_row(target_feedback_table)
                 copy_row_formatting(source_row, new_row)
                 copy_cell_content_to_target_cell(source_doc, source_feedback_table_index, i, 0, target_doc, 10, i + 1, 0)
                 copy_cell_content_to_target_cell(source_doc, source_feedback_table_index, i, 1, target_doc, 10, i + 1, 1)
                 copy_cell_content_to_target_cell(source_doc, source_feedback_table_index, i, 3, target_doc, 10, i + 1, 2)
     
-    # Extract feedback in this practice area
-    copy_cell_content_to_target_cell(source_doc, 7, 0, 0, target_doc, 11, 1, 0)
-    
+    stage("clients")
     # Extract the publishable clients
-    source_publishableClients_table = source_doc.tables[8]
-    target_publishableClients_table = target_doc.tables[12]
+    source_publishableClients_table = TableView(source_doc.tables[8])
+    target_publishableClients_table = TableView(target_doc.tables[12])
     for i in range(len(target_publishableClients_table.rows) - 1, 1, -1):
         temp_row = target_publishableClients_table.rows[i]
-        target_publishableClients_table._element.remove(temp_row._element)
+        remove_table_row(target_publishableClients_table, temp_row)
     for i in range(1, len(source_publishableClients_table.rows) - 1):
         if source_publishableClients_table.cell(i, 0).text.strip() != "":
             source_row = target_publishableClients_table.rows[1]
-            new_row = target_publishableClients_table.add_row()
+            new_row = add_table_row(target_publishableClients_table)
             copy_row_formatting(source_row, new_row)
-            target_publishableClients_table.cell(i + 1, 0).text = str(i)
+            write_cell_text(target_publishableClients_table, i + 1, 0, str(i))
             copy_cell_content_to_target_cell(source_doc, 8, i, 0, target_doc, 12, i + 1, 1)
             copy_cell_content_to_target_cell(source_doc, 8, i, 1, target_doc, 12, i + 1, 2)
     last_publish_index = len(source_publishableClients_table.rows) - 1
@@ -938,26 +844,26 @@ async def l500_chamber_convert(source_docx_path, target_docx_path):
     # print(last__publish_text)
     if "To add more clients, right-click in any field and select" not in last__publish_text and last__publish_text != "":
         source_row = target_publishableClients_table.rows[1]
-        new_row = target_publishableClients_table.add_row()
+        new_row = add_table_row(target_publishableClients_table)
         copy_row_formatting(source_row, new_row)
-        target_publishableClients_table.cell(last_publish_index + 1, 0).text = str(last_publish_index)
+        write_cell_text(target_publishableClients_table, last_publish_index + 1, 0, str(last_publish_index))
         copy_cell_content_to_target_cell(source_doc, 8, last_publish_index, 0, target_doc, 12, last_publish_index + 1, 1)
         copy_cell_content_to_target_cell(source_doc, 8, last_publish_index, 1, target_doc, 12, last_publish_index + 1, 2)
     
     # Extract Confidential clients
-    source_confidentialClients_table = source_doc.tables[9]
+    source_confidentialClients_table = TableView(source_doc.tables[9])
     confidentialClients_table_indexlist = find_tables_with_specific_string(target_doc, search_string="E0 – CONFIDENTIAL CLIENTS")
     confidentialClients_table_index = confidentialClients_table_indexlist[0]
-    target_confidentialClients_table = target_doc.tables[confidentialClients_table_index]
+    target_confidentialClients_table = TableView(target_doc.tables[confidentialClients_table_index])
     for i in range(len(target_confidentialClients_table.rows) - 1, 1, -1):
         temp_row = target_confidentialClients_table.rows[i]
-        target_confidentialClients_table._element.remove(temp_row._element)
+        remove_table_row(target_confidentialClients_table, temp_row)
     for i in range(1, len(source_confidentialClients_table.rows) - 1):
         if source_confidentialClients_table.cell(i, 0).text.strip() != "":
             source_row = target_confidentialClients_table.rows[1]
-            new_row = target_confidentialClients_table.add_row()
+            new_row = add_table_row(target_confidentialClients_table)
             copy_row_formatting(source_row, new_row)
-            target_confidentialClients_table.cell(i + 1, 0).text = str(i)
+            write_cell_text(target_confidentialClients_table, i + 1, 0, str(i))
             copy_cell_content_to_target_cell(source_doc, 9, i, 0, target_doc, confidentialClients_table_index, i + 1, 1)
             copy_cell_content_to_target_cell(source_doc, 9, i, 1, target_doc, confidentialClients_table_index, i + 1, 2)
     last_confidential_index = len(source_confidentialClients_table.rows) - 1
@@ -965,12 +871,13 @@ async def l500_chamber_convert(source_docx_path, target_docx_path):
     # print(last__confidential_text)
     if "To add more clients, right-click in any field and select" not in last__confidential_text and last__confidential_text != "":
         source_row = target_confidentialClients_table.rows[1]
-        new_row = target_confidentialClients_table.add_row()
+        new_row = add_table_row(target_confidentialClients_table)
         copy_row_formatting(source_row, new_row)
-        target_confidentialClients_table.cell(i + 1, 0).text = str(last_confidential_index)
+        write_cell_text(target_confidentialClients_table, i + 1, 0, str(last_confidential_index))
         copy_cell_content_to_target_cell(source_doc, 8, last_confidential_index, 0, target_doc, 12, last_confidential_index + 1, 1)
         copy_cell_content_to_target_cell(source_doc, 8, last_confidential_index, 1, target_doc, 12, last_confidential_index + 1, 2)
         
+    stage("ranked_lawyers")
     # Extract the information of Ranked and Unranked lawyers
     leadingPartner_indices = []
     leadingAssociate_indices = []
@@ -986,17 +893,17 @@ async def l500_chamber_convert(source_docx_path, target_docx_path):
     target_ranked_unrankedLawyers_table = target_doc.tables[8]
     for i in range(len(target_ranked_unrankedLawyers_table.rows) - 1, 2, -1):
         temp_row = target_ranked_unrankedLawyers_table.rows[i]
-        target_ranked_unrankedLawyers_table._element.remove(temp_row._element)
+        remove_table_row(target_ranked_unrankedLawyers_table, temp_row)
     ranked_unrankedLawyers_indices_length = len(ranked_unrankedLawyers_indices)
     leadingAssociate_indices_length = len(leadingAssociate_indices)
     
     if ranked_unrankedLawyers_indices_length > 0:
         for i in range(1, ranked_unrankedLawyers_indices_length):
             temp_index = ranked_unrankedLawyers_indices[i]
-            source_ranked_unrankedLawyers_table = source_doc.tables[temp_index]
+            source_ranked_unrankedLawyers_table = TableView(source_doc.tables[temp_index])
             if source_ranked_unrankedLawyers_table.cell(2, 0).text.strip != "":
                 source_row = target_ranked_unrankedLawyers_table.rows[2]
-                new_row = target_ranked_unrankedLawyers_table.add_row()
+                new_row = add_table_row(target_ranked_unrankedLawyers_table)
                 copy_row_formatting(source_row, new_row)
                 
                 copy_cell_content_to_target_cell(source_doc, temp_index, 2, 0, target_doc, 8, i + 2, 0)
@@ -1005,10 +912,10 @@ async def l500_chamber_convert(source_docx_path, target_docx_path):
     if leadingAssociate_indices_length > 0:        
         for i in range(leadingAssociate_indices_length):
             temp_index = leadingAssociate_indices[i]
-            source_ranked_unrankedLawyers_table = source_doc.tables[temp_index]
+            source_ranked_unrankedLawyers_table = TableView(source_doc.tables[temp_index])
             if source_ranked_unrankedLawyers_table.cell(2, 0).text.strip != "":
                 source_row = target_ranked_unrankedLawyers_table.rows[2]
-                new_row = target_ranked_unrankedLawyers_table.add_row()
+                new_row = add_table_row(target_ranked_unrankedLawyers_table)
                 copy_row_formatting(source_row, new_row)
                 
                 copy_cell_content_to_target_cell(source_doc, temp_index, 2, 0, target_doc, 8, i + ranked_unrankedLawyers_indices_length + 2, 0)
@@ -1020,6 +927,7 @@ async def l500_chamber_convert(source_docx_path, target_docx_path):
         write_text_to_cell(target_doc, 8, 2, 2, "Y", 11, bold=False, alignment="left")
     
     
+    stage("hires_departures")
     # Extract Hires/Departures of partners in last 12 months
     source_hiresDepartures_table_indices = set(find_tables_with_specific_string(source_doc, search_string="Name"))
     temp_indices = set(find_tables_with_specific_string(source_doc, search_string="Position/role"))
@@ -1027,20 +935,21 @@ async def l500_chamber_convert(source_docx_path, target_docx_path):
     source_hiresDepartures_table_indices.sort()
     if len(source_hiresDepartures_table_indices) > 0:
         source_hiresDepartures_table_index = source_hiresDepartures_table_indices[0]
-        source_hiresDepartures_table = source_doc.tables[source_hiresDepartures_table_index]
+        source_hiresDepartures_table = TableView(source_doc.tables[source_hiresDepartures_table_index])
         target_hiresDepartures_table = target_doc.tables[7]
         for i in range(len(target_hiresDepartures_table.rows) - 1, 2, -1):
             row = target_hiresDepartures_table.rows[i]
-            target_hiresDepartures_table._element.remove(row._element)
+            remove_table_row(target_hiresDepartures_table, row)
         for i in range(1, len(source_hiresDepartures_table.rows) - 1):
             if source_hiresDepartures_table.cell(i, 0).text.strip() != "":
                 source_row = target_hiresDepartures_table.rows[2]
-                new_row = target_hiresDepartures_table.add_row()
+                new_row = add_table_row(target_hiresDepartures_table)
                 copy_row_formatting(source_row, new_row)
                 copy_cell_content_to_target_cell(source_doc, source_hiresDepartures_table_index, i, 0, target_doc, 7, i + 1, 0)
                 copy_cell_content_to_target_cell(source_doc, source_hiresDepartures_table_index, i, 2, target_doc, 7, i + 1, 1)
                 copy_cell_content_to_target_cell(source_doc, source_hiresDepartures_table_index, i, 3, target_doc, 7, i + 1, 2)
             
+    stage("matters")
     # Extract Publishable Matter
     publishable_matter_indices = set(find_tables_with_specific_string(source_doc, search_string="Publishable matter"))
     temp_indices = set(find_tables_with_specific_string(source_doc, search_string="Name of client"))
@@ -1069,19 +978,7 @@ async def l500_chamber_convert(source_docx_path, target_docx_path):
     if publishable_matter_list_length == 0 and non_publishable_matter_list_length != 0:
         delete_table_with_paragraphs(target_doc, 13, num_paragraphs_above=0, num_paragraphs_below=3)
         delete_table_with_paragraphs(target_doc, 12, num_paragraphs_above=8, num_paragraphs_below=0)
-        for i in range(non_publishable_matter_list_length - 1):
-            copy_table_with_paragraphs(target_doc, 13, target_doc, 14, num_paragraphs_above=0, num_paragraphs_below=0)
-            
-        for i in range(non_publishable_matter_list_length - 2):
-            add_page_break_before_table(target_doc, 15 + i)  
-            
-        for i in range(non_publishable_matter_list_length):
-            temp_text1 = ""
-            if i == 0:
-                temp_text1 = "Confidential Work Highlights in last 12 months"
-            temp_text2 = "Confidential Matter " + str(i + 1)
-            write_text_to_cell(target_doc, 13 + i, 0, 0, temp_text1, 13, alignment="left")
-            write_text_to_cell(target_doc, 13 + i, 1, 0, temp_text2, 14, alignment="center") 
+        replicate_matter_tables(target_doc, 13, non_publishable_matter_list_length, "Confidential Work Highlights in last 12 months", "Confidential Matter ", before=False, first_page_break=2)
         
         for i in range(non_publishable_matter_list_length):
             copy_publishable_matter_to_target(source_doc, target_doc, non_publishable_matter_indices[i], 13 + i)
@@ -1089,51 +986,15 @@ async def l500_chamber_convert(source_docx_path, target_docx_path):
     elif publishable_matter_list_length != 0 and non_publishable_matter_list_length == 0:
         delete_table_with_paragraphs(target_doc, 15, num_paragraphs_above=0, num_paragraphs_below=3)
         delete_table_with_paragraphs(target_doc, 14, num_paragraphs_above=8, num_paragraphs_below=0)
-        for i in range(publishable_matter_list_length - 1):
-            copy_table_with_paragraphs(target_doc, 13, target_doc, 13, num_paragraphs_above=0, num_paragraphs_below=0)
-
-        for i in range(publishable_matter_list_length - 1):
-            add_page_break_before_table(target_doc, 14 + i)  
-        
-        for i in range(publishable_matter_list_length):
-            temp_text1 = ""
-            if i == 0:
-                temp_text1 = "Publishable Work Highlights in last 12 months"
-            temp_text2 = "Publishable Matter " + str(i + 1)
-            write_text_to_cell(target_doc, 13 + i, 0, 0, temp_text1, 13, alignment="left")
-            write_text_to_cell(target_doc, 13 + i, 1, 0, temp_text2, 14, alignment="center")
+        replicate_matter_tables(target_doc, 13, publishable_matter_list_length, "Publishable Work Highlights in last 12 months", "Publishable Matter ")
         
         for i in range(publishable_matter_list_length):
             copy_publishable_matter_to_target(source_doc, target_doc, publishable_matter_indices[i], 13 + i)
         
     else:    
-        for i in range(publishable_matter_list_length - 1):
-            copy_table_with_paragraphs(target_doc, 13, target_doc, 13, num_paragraphs_above=0, num_paragraphs_below=0)
-
-        for i in range(publishable_matter_list_length - 1):
-            add_page_break_before_table(target_doc, 14 + i)  
-        
-        for i in range(publishable_matter_list_length):
-            temp_text1 = ""
-            if i == 0:
-                temp_text1 = "Publishable Work Highlights in last 12 months"
-            temp_text2 = "Publishable Matter " + str(i + 1)
-            write_text_to_cell(target_doc, 13 + i, 0, 0, temp_text1, 13, alignment="left")
-            write_text_to_cell(target_doc, 13 + i, 1, 0, temp_text2, 14, alignment="center")
+        replicate_matter_tables(target_doc, 13, publishable_matter_list_length, "Publishable Work Highlights in last 12 months", "Publishable Matter ")
     
-        for i in range(non_publishable_matter_list_length - 1):
-            copy_table_with_paragraphs(target_doc, 14 + publishable_matter_list_length, target_doc, 14 + publishable_matter_list_length, num_paragraphs_above=0, num_paragraphs_below=0)
-            
-        for i in range(non_publishable_matter_list_length - 1):
-            add_page_break_before_table(target_doc, 15 + publishable_matter_list_length + i)  
-            
-        for i in range(non_publishable_matter_list_length):
-            temp_text1 = ""
-            if i == 0:
-                temp_text1 = "Confidential Work Highlights in last 12 months"
-            temp_text2 = "Confidential Matter " + str(i + 1)
-            write_text_to_cell(target_doc, 14 + publishable_matter_list_length + i, 0, 0, temp_text1, 13, alignment="left")
-            write_text_to_cell(target_doc, 14 + publishable_matter_list_length + i, 1, 0, temp_text2, 14, alignment="center")        
+        replicate_matter_tables(target_doc, 14 + publishable_matter_list_length, non_publishable_matter_list_length, "Confidential Work Highlights in last 12 months", "Confidential Matter ")
      
         for i in range(publishable_matter_list_length):
             copy_publishable_matter_to_target(source_doc, target_doc, publishable_matter_indices[i], 13 + i)
@@ -1142,19 +1003,35 @@ async def l500_chamber_convert(source_docx_path, target_docx_path):
             copy_publishable_matter_to_target(source_doc, target_doc, non_publishable_matter_indices[i], 14 + publishable_matter_list_length + i)
         
         
+    stage("save")
     # Save the modified target document
-    file_name_without_extension = os.path.splitext(source_docx_path)[0]
-    file_name = f"{file_name_without_extension}_result.docx"
-    target_doc.save(file_name)
+    if output is None:
+        file_name_without_extension = os.path.splitext(source_docx_path)[0]
+        output = f"{file_name_without_extension}_result.docx"
+    save_document(target_doc, output)
+    stage(None)
     print("Content copied to the target document successfully.")
     
-    return file_name
+    return output
     
 
 
-async def validate_document(source_path):
-    
-    source_doc = Document(source_path)
+def validate_document(source_doc):
+    """
+    Validates the matter numbering of a Legal 500 submission and normalizes it in place.
+
+    Rows above the matter headings are removed from the matter tables (along with the rows
+    after their start date) and from the ranked lawyer tables so
+    the document can be handed straight to l500_chamber_convert.
+
+    Args:
+        source_doc: Loaded Document, path or file-like object of the submission.
+            A Document is modified in place.
+
+    Returns:
+        (is_valid, message)
+    """
+    source_doc = open_document(source_doc)
     publishable_matter_indices = set(find_tables_with_specific_string(source_doc, search_string="Publishable matter"))
     temp_indices = set(find_tables_with_specific_string(source_doc, search_string="Name of client"))
     publishable_matter_indices = list(publishable_matter_indices.intersection(temp_indices))
@@ -1175,7 +1052,7 @@ async def validate_document(source_path):
     # print(matter_indices)
     for i in range(matter_indices_length):
         matter_table_index = matter_indices[i]
-        matter_table = source_doc.tables[matter_table_index]
+        matter_table = TableView(source_doc.tables[matter_table_index])
         matter_table_length = len(matter_table.rows)
         top = 0
         bottom = 0
@@ -1261,7 +1138,7 @@ async def validate_document(source_path):
         leadingPartner_indices_length = len(leadingPartner_indices)
         for i in range(leadingPartner_indices_length):
             leadingPartner_table_index = leadingPartner_indices[i]
-            leadingPartner_table = source_doc.tables[leadingPartner_table_index]
+            leadingPartner_table = TableView(source_doc.tables[leadingPartner_table_index])
             leadingPartner_table_length = len(leadingPartner_table.rows)
             top = 0
             for j in range(leadingPartner_table_length):
@@ -1272,14 +1149,7 @@ async def validate_document(source_path):
             if top != 0:
                 for k in range(top):
                     delete_table_row(source_doc, leadingPartner_table_index, 0)
-        # # Save the modified target document
-        try:
-            file_name_without_extension = os.path.splitext(source_path)[0]
-            source_doc.save(f"{file_name_without_extension}_processed.docx")
-            return True, "The document is valid."
-        except Exception as e:
-            print(f"Error saving the document: {e}")
-            sys.exit(1)
+    return True, "The document is valid."
 
 # # Example usage
 # if __name__ == "__main__":
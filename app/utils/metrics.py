@@ -0,0 +1,210 @@
+import glob
+import os
+import time
+from contextlib import contextmanager
+
+from fastapi import HTTPException
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from app.utils.temp_files import disk_usage, temp_file_paths
+
+
+CONVERSIONS = Counter(
+    "tigerdoc_conversions_total",
+    "Conversions by entry point, mode and outcome.",
+    ["endpoint", "mode", "outcome"],
+)
+CONVERSION_SECONDS = Histogram(
+    "tigerdoc_conversion_duration_seconds",
+    "Wall-clock time of a conversion, from upload to response, including time spent waiting for a worker.",
+    ["endpoint", "mode"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+STAGE_SECONDS = Histogram(
+    "tigerdoc_conversion_stage_seconds",
+    "Time spent in each stage of a conversion inside a worker.",
+    ["mode", "stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+INPUT_BYTES = Histogram(
+    "tigerdoc_input_document_bytes",
+    "Size of the uploaded documents.",
+    ["mode"],
+    buckets=(16 << 10, 64 << 10, 256 << 10, 1 << 20, 4 << 20, 16 << 20, 64 << 20),
+)
+INPUT_TABLES = Histogram(
+    "tigerdoc_input_document_tables",
+    "Number of tables in the uploaded documents.",
+    ["mode"],
+    buckets=(5, 10, 20, 30, 50, 75, 100, 200),
+)
+OPENAI_REQUESTS = Counter(
+    "tigerdoc_openai_requests_total",
+    "Requests sent to OpenAI to normalize text.",
+    ["mode"],
+)
+OPENAI_SECONDS = Counter(
+    "tigerdoc_openai_request_seconds_total",
+    "Time spent waiting for OpenAI replies; divided by the number of requests it gives their mean latency.",
+    ["mode"],
+)
+NORMALIZATION_CACHE_LOOKUPS = Counter(
+    "tigerdoc_normalization_cache_lookups_total",
+    "Texts looked up in the normalization cache, i.e. those no rule could normalize.",
+    ["mode"],
+)
+NORMALIZATION_CACHE_HITS = Counter(
+    "tigerdoc_normalization_cache_hits_total",
+    "Texts found in the normalization cache.",
+    ["mode"],
+)
+
+# Stages whose time is reported by a metric of their own
+_NOT_STAGES = ("llm_request",)
+
+_OUTCOMES = {400: "invalid", 413: "too_large", 503: "rejected"}
+
+
+def observe_worker_timings(mode, summary):
+    """
+    Records what a conversion worker measured, from the Timings.as_dict()
+    summary returned by convert_document; empty when CONVERSION_TIMING is off.
+    """
+    if not summary:
+        return
+    durations = summary.get("durations_ms", {})
+    counts = summary.get("counts", {})
+    for stage, milliseconds in durations.items():
+        if stage not in _NOT_STAGES:
+            STAGE_SECONDS.labels(mode, stage).observe(milliseconds / 1000)
+    if "source_tables" in counts:
+        INPUT_TABLES.labels(mode).observe(counts["source_tables"])
+    OPENAI_REQUESTS.labels(mode).inc(counts.get("llm_calls", 0))
+    OPENAI_SECONDS.labels(mode).inc(durations.get("llm_request", 0) / 1000)
+    NORMALIZATION_CACHE_LOOKUPS.labels(mode).inc(counts.get("normalization_cache_lookups", 0))
+    NORMALIZATION_CACHE_HITS.labels(mode).inc(counts.get("normalization_cache_hits", 0))
+
+
+def observe_conversion(endpoint, mode, outcome, seconds=None, size=None, summary=None):
+    """
+    Records one conversion.
+
+    Args:
+        endpoint (str): Entry point: "convert", "batch" or "job".
+        mode (str): Conversion mode, one of the keys of CONVERTERS.
+        outcome (str): "converted", "cached", "invalid", "too_large", "rejected" or "failed".
+        seconds (float): Duration of the conversion, if it was attempted.
+        size (int): Size in bytes of the uploaded document, if it was read.
+        summary (dict): Timings summary returned by convert_document, if it ran.
+    """
+    CONVERSIONS.labels(endpoint, mode, outcome).inc()
+    if seconds is not None:
+        CONVERSION_SECONDS.labels(endpoint, mode).observe(seconds)
+    if size is not None:
+        INPUT_BYTES.labels(mode).observe(size)
+    if summary:
+        observe_worker_timings(mode, summary)
+
+
+class TrackedConversion:
+    """What a request found out about its conversion, filled in by the endpoint."""
+
+    def __init__(self):
+        self.outcome = "converted"
+        self.size = None
+        self.summary = None
+
+
+@contextmanager
+def track_conversion(endpoint, mode):
+    """
+    Records the conversion made in a ``with`` block.
+
+    The outcome of a block left by an HTTPException is derived from its
+    status code; any other exception counts as "failed".
+    """
+    tracked = TrackedConversion()
+    start = time.perf_counter()
+    try:
+        yield tracked
+    except HTTPException as e:
+        tracked.outcome = _OUTCOMES.get(e.status_code, "failed")
+        raise
+    except BaseException:
+        tracked.outcome = "failed"
+        raise
+    finally:
+        observe_conversion(endpoint, mode, tracked.outcome, time.perf_counter() - start, tracked.size, tracked.summary)
+
+
+class ServiceCollector:
+    """
+    Reads the state of the service when the metrics are scraped: conversions
+    in flight and waiting on the pool, jobs per status, result cache hits and
+    the disk taken by temporary files, queued jobs and cached results.
+    """
+
+    def __init__(self, pool, job_queue, result_cache):
+        self.pool = pool
+        self.job_queue = job_queue
+        self.result_cache = result_cache
+
+    def collect(self):
+        in_flight = GaugeMetricFamily("tigerdoc_conversions_in_flight", "Conversions running on a worker.")
+        in_flight.add_metric([], self.pool.in_flight)
+        yield in_flight
+
+        queue_depth = GaugeMetricFamily("tigerdoc_conversion_queue_depth", "Conversions waiting for a free worker.")
+        queue_depth.add_metric([], self.pool.queue_depth)
+        yield queue_depth
+
+        workers = GaugeMetricFamily("tigerdoc_conversion_workers", "Size of the conversion pool.")
+        workers.add_metric([], self.pool.workers)
+        yield workers
+
+        jobs = GaugeMetricFamily("tigerdoc_jobs", "Jobs in the conversion job queue, by status.", labels=["status"])
+        try:
+            for status, number in sorted(self.job_queue.counts().items()):
+                jobs.add_metric([status], number)
+        except Exception as e:
+            print(f"Warning: Could not count the queued jobs: {e}")
+        yield jobs
+
+        stats = self.result_cache.stats()
+        for name, value in stats.items():
+            counter = CounterMetricFamily(f"tigerdoc_result_cache_{name}", f"Result cache {name} of this process.")
+            counter.add_metric([], value)
+            yield counter
+
+        usage = GaugeMetricFamily(
+            "tigerdoc_disk_usage_bytes", "Disk taken by the files of the service.", labels=["area"],
+        )
+        files = GaugeMetricFamily(
+            "tigerdoc_disk_usage_files", "Number of files of the service.", labels=["area"],
+        )
+        areas = {"temp": temp_file_paths(), "jobs": glob.glob(os.path.join(self.job_queue.directory, "*"))}
+        if self.result_cache.enabled:
+            areas["result_cache"] = glob.glob(os.path.join(self.result_cache.directory, "*.docx"))
+        for area, paths in areas.items():
+            number, size = disk_usage(paths)
+            usage.add_metric([area], size)
+            files.add_metric([area], number)
+        yield usage
+        yield files
+
+
+_collector = None
+
+
+def register_service_metrics(pool, job_queue, result_cache):
+    """Adds the ServiceCollector of the given components to the registry served on /metrics; only the first call counts."""
+    global _collector
+    if _collector is None:
+        _collector = ServiceCollector(pool, job_queue, result_cache)
+        REGISTRY.register(_collector)
+
+
+def render_metrics():
+    """Returns the body and content type of a /metrics response."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
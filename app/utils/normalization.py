@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+
+from app.utils.normalization_cache import cache_key, normalization_cache
+from app.utils.timing import count, span
+
+
+load_dotenv()
+
+NORMALIZATION_MODEL = os.getenv("NORMALIZATION_MODEL", "gpt-3.5-turbo")
+# Maximum number of strings sent to the model in one request
+NORMALIZATION_BATCH_SIZE = int(os.getenv("NORMALIZATION_BATCH_SIZE", "20"))
+# Maximum number of requests in flight for one document
+NORMALIZATION_CONCURRENCY = int(os.getenv("NORMALIZATION_CONCURRENCY", "4"))
+# Minimum confidence for a rule-based result to be used instead of asking the model
+NORMALIZATION_RULES_THRESHOLD = float(os.getenv("NORMALIZATION_RULES_THRESHOLD", "0.9"))
+
+INSTRUCTIONS = "You are a helpful assistant that can handle various strings."
+
+
+def build_prompt(input_str, template):
+    # Construct the prompt with detailed instructions for formatting
+    return f"""
+    In order to process strings, strings must be converted into a specific form according to their meaning.
+    Given the following template rules:
+    {template}
+
+    Now, please format the following input according to these rules:
+    {input_str}
+
+    Return only the formatted output in the required format. No explanation is necessary.
+    """
+
+
+def build_batch_prompt(input_strs, template):
+    return f"""
+    In order to process strings, strings must be converted into a specific form according to their meaning.
+    Given the following template rules:
+    {template}
+
+    Now, please format each of the following inputs according to these rules. The inputs are given as a JSON array of strings:
+    {json.dumps(input_strs, ensure_ascii=False)}
+
+    Return only a JSON array of strings containing the formatted outputs, one per input and in the same order. No explanation is necessary.
+    """
+
+
+def parse_batch_output(output_text, expected_length):
+    """Returns the list of outputs of a batch request, or None if the reply is unusable."""
+    text = output_text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[len("json"):]
+    try:
+        outputs = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(outputs, list) or len(outputs) != expected_length:
+        return None
+    if not all(isinstance(output, str) for output in outputs):
+        return None
+    return outputs
+
+
+class NormalizationService:
+    """
+    Normalizes lawyer and firm strings with the OpenAI API.
+
+    All strings of a document are submitted together: empty inputs are
+    answered locally, duplicates are sent once, the rest are grouped by
+    template into batches of up to ``batch_size`` strings per request, and
+    at most ``concurrency`` requests run at the same time.
+
+    Strings whose template has local rules registered (see register_rules)
+    are normalized by those rules when they are at least ``rules_threshold``
+    confident. The rest are looked up in and written to ``cache``, so strings
+    seen in earlier conversions never reach the API again.
+
+    The client honours the OPENAI_BASE_URL environment variable, so the
+    service can be pointed at a local stub server.
+    """
+
+    def __init__(self, model=NORMALIZATION_MODEL, batch_size=NORMALIZATION_BATCH_SIZE,
+                 concurrency=NORMALIZATION_CONCURRENCY, client_factory=None, cache=normalization_cache,
+                 rules_threshold=NORMALIZATION_RULES_THRESHOLD):
+        self.model = model
+        self.cache = cache
+        self.rules_threshold = rules_threshold
+        self.rules = {}
+        self.rule_hits = 0
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self._client_factory = client_factory or (lambda: AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")))
+
+    def register_rules(self, template, normalizer):
+        """
+        Registers a local normalizer for a template.
+
+        Args:
+            template (str): The template text the rules implement.
+            normalizer (callable): Takes the input string and returns a
+                RuleResult.
+        """
+        self.rules[template] = normalizer
+
+    def _apply_rules(self, input_str, template):
+        normalizer = self.rules.get(template)
+        if normalizer is None:
+            return None
+        result = normalizer(input_str)
+        if result.confidence < self.rules_threshold:
+            return None
+        self.rule_hits += 1
+        count("normalization_rule_hits")
+        return result.output
+
+    async def _request(self, client, semaphore, prompt):
+        count("llm_calls")
+        async with semaphore:
+            with span("llm_request"):
+                response = await client.responses.create(
+                    model=self.model,
+                    instructions=INSTRUCTIONS,
+                    input=prompt,
+                )
+        return response.output_text
+
+    async def _normalize_batch(self, client, semaphore, input_strs, template):
+        if len(input_strs) > 1:
+            output_text = await self._request(client, semaphore, build_batch_prompt(input_strs, template))
+            outputs = parse_batch_output(output_text, len(input_strs))
+            if outputs is not None:
+                return outputs
+            print(f"Warning: Unusable batch normalization reply, retrying {len(input_strs)} strings one by one")
+        return await asyncio.gather(*[
+            self._request(client, semaphore, build_prompt(input_str, template)) for input_str in input_strs
+        ])
+
+    async def normalize_many(self, items):
+        """
+        Normalizes a list of ``(input_str, template)`` pairs.
+
+        Returns:
+            The normalized strings, in the order of ``items``. Empty or None
+            inputs give "".
+        """
+        results = {}
+        keys = {}
+        for input_str, template in items:
+            if input_str and (input_str, template) not in keys and (input_str, template) not in results:
+                output = self._apply_rules(input_str, template)
+                if output is not None:
+                    results[(input_str, template)] = output
+                else:
+                    keys[(input_str, template)] = cache_key(input_str, template)
+
+        cached = self.cache.get_many(list(keys.values())) if self.cache is not None and keys else {}
+        count("normalization_cache_lookups", len(keys))
+        count("normalization_cache_hits", len(cached))
+        pending = {}
+        for (input_str, template), key in keys.items():
+            if key in cached:
+                results[(input_str, template)] = cached[key]
+            else:
+                pending.setdefault(template, []).append(input_str)
+
+        if pending:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            client = self._client_factory()
+            try:
+                batches = [
+                    (template, input_strs[i:i + self.batch_size])
+                    for template, input_strs in pending.items()
+                    for i in range(0, len(input_strs), self.batch_size)
+                ]
+                outputs = await asyncio.gather(*[
+                    self._normalize_batch(client, semaphore, input_strs, template)
+                    for template, input_strs in batches
+                ])
+            finally:
+                await client.close()
+            fresh = {}
+            for (template, input_strs), batch_outputs in zip(batches, outputs):
+                for input_str, output in zip(input_strs, batch_outputs):
+                    results[(input_str, template)] = output
+                    fresh[keys[(input_str, template)]] = output
+            if self.cache is not None:
+                self.cache.put_many(fresh)
+
+        return [results[(input_str, template)] if input_str else "" for input_str, template in items]
+
+    def normalize_all(self, items):
+        """Blocking wrapper around normalize_many for the (synchronous) converters."""
+        if not any(input_str for input_str, _ in items):
+            return ["" for _ in items]
+        return asyncio.run(self.normalize_many(items))
+
+
+normalization_service = NormalizationService()
@@ -0,0 +1,202 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+# SQLite file shared by every worker; empty keeps the cache in memory only
+NORMALIZATION_CACHE_PATH = os.getenv("NORMALIZATION_CACHE_PATH", ".cache/normalization.sqlite3")
+# Seconds a normalized string stays valid (default 30 days)
+NORMALIZATION_CACHE_TTL = int(os.getenv("NORMALIZATION_CACHE_TTL", str(30 * 24 * 3600)))
+# Maximum number of entries kept on disk
+NORMALIZATION_CACHE_MAX_ENTRIES = int(os.getenv("NORMALIZATION_CACHE_MAX_ENTRIES", "100000"))
+# Maximum number of entries kept in the in-process LRU
+NORMALIZATION_CACHE_MEMORY_ENTRIES = int(os.getenv("NORMALIZATION_CACHE_MEMORY_ENTRIES", "4096"))
+
+
+def cache_key(input_str, template):
+    """Returns the content address of a (template, input) pair."""
+    digest = hashlib.sha256()
+    for part in (template, input_str):
+        data = part.encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class NormalizationCache:
+    """
+    Two-level cache of normalized strings.
+
+    Lookups go to an in-process LRU first and then to a SQLite file, which is
+    shared by all conversion workers and survives restarts. Entries expire
+    ``ttl`` seconds after they were written, and the least recently used ones
+    are evicted once either level holds more than its maximum size.
+    """
+
+    def __init__(self, path=NORMALIZATION_CACHE_PATH, ttl=NORMALIZATION_CACHE_TTL,
+                 max_entries=NORMALIZATION_CACHE_MAX_ENTRIES,
+                 memory_entries=NORMALIZATION_CACHE_MEMORY_ENTRIES):
+        """
+        Args:
+            path (str): SQLite file of the disk layer, or "" to disable it.
+            ttl (int): Lifetime of an entry in seconds.
+            max_entries (int): Maximum number of entries on disk.
+            memory_entries (int): Maximum number of entries in memory.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            with connection:
+                self._ensure_schema(connection)
+                yield connection
+        finally:
+            connection.close()
+
+    def _ensure_schema(self, connection):
+        if not self._schema_ready:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS normalization_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS normalization_cache_used_at ON normalization_cache (used_at)"
+            )
+            self._schema_ready = True
+
+    def _remember(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """
+        Looks up several keys at once.
+
+        Returns:
+            dict mapping every key that was found to its normalized string.
+        """
+        now = time.time()
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and now - entry[1] < self.ttl:
+                    self._memory.move_to_end(key)
+                    found[key] = entry[0]
+                else:
+                    self._memory.pop(key, None)
+                    missing.append(key)
+
+        if missing and self.path:
+            try:
+                with self._lock, self._connect() as connection:
+                    for i in range(0, len(missing), 500):
+                        chunk = missing[i:i + 500]
+                        rows = connection.execute(
+                            f"SELECT key, value, created_at FROM normalization_cache "
+                            f"WHERE key IN ({','.join('?' * len(chunk))}) AND created_at > ?",
+                            (*chunk, now - self.ttl),
+                        ).fetchall()
+                        for key, value, created_at in rows:
+                            found[key] = value
+                            self._remember(key, value, created_at)
+                        if rows:
+                            connection.executemany(
+                                "UPDATE normalization_cache SET used_at = ? WHERE key = ?",
+                                [(now, key) for key, _, _ in rows],
+                            )
+            except sqlite3.Error as e:
+                print(f"Warning: Normalization cache lookup failed: {e}")
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, values):
+        """
+        Stores several normalized strings.
+
+        Args:
+            values (dict): Maps a cache key to its normalized string.
+        """
+        if not values:
+            return
+        now = time.time()
+        with self._lock:
+            for key, value in values.items():
+                self._remember(key, value, now)
+
+        if self.path:
+            try:
+                with self._lock, self._connect() as connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO normalization_cache (key, value, created_at, used_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(key, value, now, now) for key, value in values.items()],
+                    )
+                    self._evict(connection, now)
+            except sqlite3.Error as e:
+                print(f"Warning: Normalization cache write failed: {e}")
+
+    def _evict(self, connection, now):
+        connection.execute("DELETE FROM normalization_cache WHERE created_at <= ?", (now - self.ttl,))
+        count = connection.execute("SELECT COUNT(*) FROM normalization_cache").fetchone()[0]
+        if count > self.max_entries:
+            connection.execute(
+                "DELETE FROM normalization_cache WHERE key IN ("
+                "SELECT key FROM normalization_cache ORDER BY used_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self):
+        """Drops every entry from both levels."""
+        with self._lock:
+            self._memory.clear()
+            if self.path:
+                with self._connect() as connection:
+                    connection.execute("DELETE FROM normalization_cache")
+
+    def stats(self):
+        """Returns the hit/miss counters of this process."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+            }
+
+
+def create_normalization_cache():
+    """Builds the cache from the environment, creating the directory of the SQLite file."""
+    if NORMALIZATION_CACHE_PATH:
+        Path(NORMALIZATION_CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+    return NormalizationCache()
+
+
+normalization_cache = create_normalization_cache()
@@ -0,0 +1,244 @@
+import re
+
+
+# Job titles recognised after a lawyer's name
+ROLE_PATTERN = re.compile(
+    r"^(?:(?:senior|junior|managing|principal|equity|salaried|associate|trainee|legal|"
+    r"executive|deputy|assistant|local|of)\s+)*"
+    r"(?:partner|associate|counsel|director|consultant|solicitor|barrister|trainee|paralegal|"
+    r"lawyer|attorney|advocate|assistant|jurist|notary|head\s+of\s+.+)$",
+    re.IGNORECASE,
+)
+NAME_WORD = r"(?:[A-Z][\w'’.-]*|van|von|de|der|den|da|di|du|la|le|bin|al|y)"
+NAME_PATTERN = re.compile(rf"^{NAME_WORD}(?:\s+{NAME_WORD}){{1,5}}$")
+# "Name - Role (Area)": a hyphen needs spaces around it so double-barrelled names survive
+LAWYER_DASH = re.compile(r"\s+-\s+|\s*[–—]\s*")
+ADVISING_DASH = re.compile(r"\s+-\s+|\s*[–—]\s*")
+ADVISING_KEYWORD = re.compile(r"\s+(advising|acting for|counsel for|representing)\s+", re.IGNORECASE)
+# Words of a job title, which make a "name" a role ("Head Of Department") rather than a person
+ROLE_WORD = re.compile(
+    r"\b(?:partner|associate|counsel|director|consultant|solicitor|barrister|trainee|paralegal|"
+    r"lawyer|attorney|advocate|assistant|jurist|notary|head|department|team|group)s?\b",
+    re.IGNORECASE,
+)
+# What a co-counsel description says the party did; descriptions without it
+# ("Defendant’s solicitors") are not written consistently in the template
+ADVISING_PHRASE = re.compile(r"\b(?:advis\w*|acting\s+for|(?:co-)?counsel\w*|represent\w*)\b", re.IGNORECASE)
+# A party starting with one of these is the tail of a list, not a party of its own
+LEADING_CONJUNCTION = re.compile(r"^(?:and|or|then|but|plus|&)\b", re.IGNORECASE)
+
+
+class RuleResult:
+    """Output of a rule-based normalizer and how sure it is about it (0.0 to 1.0)."""
+
+    def __init__(self, output, confidence):
+        self.output = output
+        self.confidence = confidence
+
+    def __repr__(self):
+        return f"RuleResult({self.output!r}, {self.confidence})"
+
+
+UNSURE = RuleResult("", 0.0)
+# Confidence of an output the rules could build but would likely get wrong,
+# which leaves the string to the LLM at any sensible threshold
+AMBIGUOUS_CONFIDENCE = 0.5
+
+
+def split_top_level(text, separators):
+    """Splits text on any of the given characters, ignoring those inside parentheses."""
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif depth == 0 and char in separators:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def top_level_matches(pattern, text):
+    """Returns the matches of ``pattern`` that are not inside parentheses."""
+    matches = []
+    for match in pattern.finditer(text):
+        before = text[:match.start()]
+        if before.count("(") <= before.count(")"):
+            matches.append(match)
+    return matches
+
+
+def is_role(text):
+    return bool(ROLE_PATTERN.match(text.strip()))
+
+
+def is_name(text):
+    return bool(NAME_PATTERN.match(text.strip())) and not ROLE_WORD.search(text)
+
+
+def is_ambiguous_entry(party, description):
+    """
+    Tells whether a "Party - description" entry may have been split wrongly.
+
+    That is the case when the party is not a firm or person (it is empty,
+    starts in lower case or with a conjunction, holds a separator or is a
+    job title) or when the description does not say what the party did.
+    """
+    party = party.strip()
+    if not party or not (party[0].isupper() or party[0].isdigit()):
+        return True
+    if LEADING_CONJUNCTION.match(party) or len(split_top_level(party, ";:\n")) > 1 or is_role(party):
+        return True
+    return not ADVISING_PHRASE.search(description)
+
+
+def format_lawyer(name, role=None, area=None):
+    output = name
+    if role:
+        output += f" ({role})"
+    if area:
+        output += f", {area}"
+    return output
+
+
+def parse_lawyer(text):
+    """
+    Parses one lawyer entry.
+
+    Returns:
+        The formatted entry, or None if it does not follow a known pattern.
+    """
+    text = text.strip()
+    role = area = None
+
+    dashes = top_level_matches(LAWYER_DASH, text)
+    if dashes:
+        # "Name - Role (Area)"
+        if len(dashes) > 1:
+            return None
+        text, details = text[:dashes[0].start()], text[dashes[0].end():].strip()
+        match = re.match(r"^(.*?)\s*\(([^()]*)\)$", details)
+        role, area = (match.group(1), match.group(2).strip()) if match else (details, None)
+    else:
+        # "Name (Role)" or "Name (Role, Area)"
+        match = re.match(r"^(.*?)\s*\(([^()]*)\)$", text)
+        if match:
+            text = match.group(1)
+            details = [part.strip() for part in match.group(2).split(",")]
+            if len(details) > 2:
+                return None
+            role = details[0]
+            area = details[1] if len(details) == 2 else None
+
+    if role is not None and not is_role(role) or area == "":
+        return None
+    if not is_name(text):
+        return None
+    return format_lawyer(text.strip(), role, area)
+
+
+def normalize_lawyers(input_str):
+    """
+    Normalizes a list of lawyers following ``template_Lawyer``.
+
+    Handles comma, semicolon, newline and "and" separated lists whose entries
+    are a name optionally followed by ", Role", "(Role)", "(Role, Area)" or
+    "- Role (Area)". Anything else, including "names" made of job title words
+    ("Head Of Department"), is left to the LLM with zero confidence.
+    """
+    entries = []
+    for chunk in split_top_level(input_str, ";\n"):
+        if not chunk.strip():
+            continue
+        for part in re.split(r"\s+and\s+(?![^(]*\))", chunk):
+            # Commas separate people unless the next piece is a job title
+            # ("Steve Bobbins, Partner") or a bracketed one ("Ted Smith, (Associate)")
+            people = []
+            for piece in split_top_level(part, ","):
+                piece = piece.strip()
+                if not piece:
+                    return UNSURE
+                if people and (is_role(piece) or piece.startswith("(")):
+                    people[-1] += f" ({piece.strip('()')})" if is_role(piece) else f" {piece}"
+                else:
+                    people.append(piece)
+            entries.extend(people)
+
+    if not entries:
+        return UNSURE
+    outputs = [parse_lawyer(entry) for entry in entries]
+    if any(output is None for output in outputs):
+        return UNSURE
+    return RuleResult("; ".join(outputs), 1.0)
+
+
+def normalize_advising(input_str):
+    """
+    Normalizes a list of co-counsel following ``template_advising``.
+
+    Every entry becomes "Party - description". Entries are recognised by a
+    dash ("Firm – Advising X"), a colon ("Firm: counsel for X") or, with lower
+    confidence, a leading verb ("Firm advising X"). Entries that may have been
+    split wrongly (see is_ambiguous_entry), and descriptions holding more
+    than one comma before the next party, which could be either part of the
+    description or parties of their own, get AMBIGUOUS_CONFIDENCE.
+    """
+    text = input_str.strip().rstrip(";").strip()
+    if not text:
+        return UNSURE
+
+    dashes = top_level_matches(ADVISING_DASH, text)
+    if dashes:
+        # The party of every entry but the first one follows the last comma or
+        # semicolon before its dash
+        entries = []
+        confidence = 1.0
+        party = text[:dashes[0].start()]
+        for i, dash in enumerate(dashes):
+            end = dashes[i + 1].start() if i + 1 < len(dashes) else len(text)
+            segment = text[dash.end():end]
+            if i + 1 < len(dashes):
+                pieces = split_top_level(segment, ",;\n")
+                if len(pieces) < 2:
+                    return UNSURE
+                if len(pieces) > 2:
+                    confidence = AMBIGUOUS_CONFIDENCE
+                description = segment[:len(segment) - len(pieces[-1]) - 1]
+                next_party = pieces[-1]
+            else:
+                description, next_party = segment, None
+            if not party.strip() or not description.strip():
+                return UNSURE
+            if is_ambiguous_entry(party, description):
+                confidence = AMBIGUOUS_CONFIDENCE
+            entries.append(f"{party.strip()} - {description.strip().rstrip(',;')}")
+            party = next_party
+        return RuleResult("; ".join(entries), confidence)
+
+    entries = []
+    confidence = 1.0
+    for chunk in split_top_level(text, ";\n"):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        pieces = split_top_level(chunk, ":")
+        if len(pieces) == 2 and pieces[0].strip() and pieces[1].strip():
+            if is_ambiguous_entry(pieces[0], pieces[1]):
+                confidence = min(confidence, AMBIGUOUS_CONFIDENCE)
+            entries.append(f"{pieces[0].strip()} - {pieces[1].strip()}")
+            continue
+        keywords = top_level_matches(ADVISING_KEYWORD, chunk)
+        if keywords and keywords[0].start() > 0:
+            keyword = keywords[0]
+            party, description = chunk[:keyword.start()], chunk[keyword.start():]
+            confidence = min(confidence, AMBIGUOUS_CONFIDENCE if is_ambiguous_entry(party, description) else 0.8)
+            entries.append(f"{party.strip()} - {description.strip()}")
+            continue
+        return UNSURE
+    if not entries:
+        return UNSURE
+    return RuleResult("; ".join(entries), confidence)
@@ -0,0 +1,163 @@
+from docx.oxml.ns import qn
+from docx.oxml.simpletypes import ST_SignedTwipsMeasure, ST_TwipsMeasure
+from docx.shared import Emu, Pt, Twips
+from lxml import etree
+
+
+# Children of a source w:pPr the translation reads, by tag
+PPR_CHILDREN = {
+    qn('w:numPr'): 'numPr',
+    qn('w:rPr'): 'rPr',
+    qn('w:pStyle'): 'pStyle',
+    qn('w:ind'): 'ind',
+    qn('w:spacing'): 'spacing',
+}
+
+# Largest space before/after a copied paragraph, in points
+MAX_PARAGRAPH_SPACING = 6
+
+_PPR = qn('w:pPr')
+_NUMPR = qn('w:numPr')
+_ILVL = qn('w:ilvl')
+_NUMID = qn('w:numId')
+_COLOR = qn('w:color')
+_PSTYLE = qn('w:pStyle')
+_IND = qn('w:ind')
+_SPACING = qn('w:spacing')
+_VAL = qn('w:val')
+_LEFT = qn('w:left')
+_HANGING = qn('w:hanging')
+_BEFORE = qn('w:before')
+_AFTER = qn('w:after')
+_LINE = qn('w:line')
+_LINE_RULE = qn('w:lineRule')
+
+
+def _clamped_spacing(value):
+    return ST_TwipsMeasure.to_xml(Pt(min(int(value) / 20, MAX_PARAGRAPH_SPACING)))
+
+
+class ParagraphPropertiesTranslator:
+    """
+    Translates the ``w:pPr`` of the paragraphs of one source cell for the
+    copies made in a template cell.
+
+    The children of each source ``w:pPr`` are read in one pass and the target
+    ``w:pPr`` is written as XML:
+
+    - numbering keeps its level but uses the template's list ``num_id``;
+    - the color of the paragraph mark goes to the runs already in the target paragraph;
+    - the style is kept;
+    - indentation is kept for paragraphs that are not numbered, and the last
+      indent is repeated on the paragraph right after the one it was read from;
+    - space before and after are capped at MAX_PARAGRAPH_SPACING points,
+      there is no space after the last paragraph or after a paragraph
+      without spacing, and line spacing is kept.
+
+    A translator holds the indent carried between paragraphs, so a new one is
+    needed for every cell.
+    """
+
+    def __init__(self, num_id, paragraph_count):
+        """
+        Args:
+            num_id (str): w:numId of the template list numbered paragraphs are put in.
+            paragraph_count (int): Number of paragraphs of the source cell.
+        """
+        self.num_id = num_id
+        self.last_paragraph = paragraph_count - 1
+        self.indented = 0
+        self.left = ''
+        self.hanging = ''
+
+    def translate(self, index, paragraph, new_p):
+        """
+        Writes the paragraph properties of a source paragraph to its copy.
+
+        Args:
+            index (int): Position of the paragraph in the source cell.
+            paragraph: The source ``w:p`` element.
+            new_p: The ``w:p`` element of the copy, which has no ``w:pPr`` yet.
+        """
+        ppr = paragraph.find(_PPR)
+        if ppr is None:
+            return
+        found = {}
+        for child in ppr:
+            name = PPR_CHILDREN.get(child.tag)
+            if name is not None and name not in found:
+                found[name] = child
+
+        # makeelement keeps the python-docx element classes
+        new_ppr = new_p.makeelement(_PPR)
+        new_p.insert(0, new_ppr)
+
+        numpr = found.get('numPr')
+        if numpr is not None:
+            ilvl = numpr.find(_ILVL)
+            num_id = numpr.find(_NUMID)
+            if ilvl is not None and num_id is not None:
+                level = ilvl.get(_VAL)
+                if level is None:
+                    print("Warning: Could not copy numbering - w:ilvl has no value")
+                else:
+                    new_numpr = etree.SubElement(new_ppr, _NUMPR)
+                    etree.SubElement(new_numpr, _ILVL, {_VAL: level})
+                    etree.SubElement(new_numpr, _NUMID, {_VAL: self.num_id})
+
+        rpr = found.get('rPr')
+        if rpr is not None:
+            color = rpr.find(_COLOR)
+            if color is not None:
+                for r in new_p.r_lst or [new_p.add_r()]:
+                    etree.SubElement(r.get_or_add_rPr(), _COLOR, {_VAL: color.get(_VAL)})
+
+        pstyle = found.get('pStyle')
+        if pstyle is not None:
+            etree.SubElement(new_ppr, _PSTYLE, {_VAL: pstyle.get(_VAL)})
+
+        self._spacing(index, found.get('spacing'), etree.SubElement(new_ppr, _SPACING))
+
+        if numpr is None:
+            ind = found.get('ind')
+            if ind is not None:
+                new_ind = etree.SubElement(new_ppr, _IND)
+                left = ind.get(_LEFT)
+                if left is not None:
+                    new_ind.set(_LEFT, left)
+                    self.left = left
+                    self.indented = index
+                hanging = ind.get(_HANGING)
+                if hanging is not None:
+                    new_ind.set(_HANGING, hanging)
+                    self.hanging = hanging
+            if index == self.indented + 1:
+                etree.SubElement(new_ppr, _IND, {_LEFT: self.left, _HANGING: self.hanging})
+
+    def _spacing(self, index, spacing, new_spacing):
+        if spacing is None:
+            new_spacing.set(_AFTER, '0')
+            return
+
+        before = spacing.get(_BEFORE)
+        if before is not None:
+            new_spacing.set(_BEFORE, _clamped_spacing(before))
+        after = spacing.get(_AFTER)
+        if after is not None and index != self.last_paragraph:
+            new_spacing.set(_AFTER, _clamped_spacing(after))
+        else:
+            new_spacing.set(_AFTER, '0')
+
+        line = spacing.get(_LINE)
+        if line is not None:
+            line_rule = spacing.get(_LINE_RULE, 'auto')
+            line_val = int(line)
+            if line_rule == 'exact':
+                new_spacing.set(_LINE, ST_SignedTwipsMeasure.to_xml(Pt(line_val / 20)))
+                new_spacing.set(_LINE_RULE, 'exact')
+            elif line_rule == 'atLeast':
+                new_spacing.set(_LINE_RULE, 'atLeast')
+                new_spacing.set(_LINE, ST_SignedTwipsMeasure.to_xml(Pt(line_val / 20)))
+            else:  # auto or multiple, in 240ths of a line
+                new_spacing.set(_LINE, ST_SignedTwipsMeasure.to_xml(Emu(line_val / 240 * Twips(240))))
+                new_spacing.set(_LINE_RULE, 'auto')
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from app.utils.conversion_engine import CONVERTER_VERSION, template_cache
+from app.utils.temp_files import remove_file
+from app.utils.upload_buffer import UPLOAD_CHUNK_SIZE
+
+
+load_dotenv()
+
+# Directory of the cached conversion results; empty disables the cache
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", ".cache/results")
+# Maximum total size in bytes of the cached results
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+def result_key(source, mode, template_sha256, version=CONVERTER_VERSION):
+    """
+    Returns the content address of a conversion.
+
+    Args:
+        source (bytes or str): The uploaded .docx package, or its path.
+        mode (str): Conversion mode.
+        template_sha256 (str): SHA-256 of the template the mode converts into.
+        version (str): Converter version, so that results of older code are not served.
+    """
+    digest = hashlib.sha256()
+    for part in (mode, template_sha256, version):
+        data = part.encode("utf-8")
+        # Length-prefix each part so that they cannot run into each other
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    if isinstance(source, bytes):
+        digest.update(source)
+    else:
+        with open(source, "rb") as f:
+            while chunk := f.read(UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def conversion_key(mode, source):
+    """Returns the result cache key of converting ``source`` with the current template of ``mode``."""
+    return result_key(source, mode, template_cache.sha256(mode))
+
+
+class ResultCache:
+    """
+    Size-bounded disk cache of converted documents, keyed by result_key.
+
+    Every result is a file named after its key. Reading an entry bumps its
+    mtime and, once the files take more than ``max_bytes``, the entries with
+    the oldest mtime are deleted, which makes the eviction least recently
+    used. Files are written under a temporary name and renamed into place, so
+    several server processes can share the directory.
+    """
+
+    def __init__(self, directory=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_MAX_BYTES):
+        """
+        Args:
+            directory (str): Directory of the cached files, or "" to disable the cache.
+            max_bytes (int): Maximum total size of the cached files.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.directory)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.docx")
+
+    def get(self, key):
+        """Returns the path of the cached result for ``key``, or None."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put(self, key, output):
+        """
+        Stores a conversion result.
+
+        Args:
+            key (str): The result_key of the conversion.
+            output (bytes or str): The converted package, or the path of a file holding it.
+        """
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=self.directory, prefix=".", suffix=".tmp", delete=False) as temp:
+                temp_path = temp.name
+                if isinstance(output, bytes):
+                    temp.write(output)
+                else:
+                    with open(output, "rb") as f:
+                        shutil.copyfileobj(f, temp)
+            os.replace(temp_path, self._path(key))
+            self._evict()
+        except OSError as e:
+            if temp_path is not None:
+                remove_file(temp_path)
+            print(f"Warning: Could not cache the conversion result: {e}")
+
+    def _evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".docx"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            remove_file(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        """Returns the hit/miss counters of this process."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def create_result_cache():
+    """Builds the cache from the environment, creating its directory."""
+    if RESULT_CACHE_DIR:
+        Path(RESULT_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+    return ResultCache()
+
+
+result_cache = create_result_cache()
@@ -0,0 +1,99 @@
+import copy
+
+from docx.enum.text import WD_UNDERLINE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Pt, RGBColor
+from docx.text.run import Run
+from lxml import etree
+
+
+NS = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+
+# Font of every run copied into a template
+DEFAULT_FONT_NAME = "Times New Roman"
+DEFAULT_FONT_SIZE = Pt(11)
+
+UNDERLINES = {
+    'single': WD_UNDERLINE.SINGLE,
+    'double': WD_UNDERLINE.DOUBLE,
+    'thick': WD_UNDERLINE.THICK,
+    'dotted': WD_UNDERLINE.DOTTED,
+    'dash': WD_UNDERLINE.DASH,
+    'dotDash': WD_UNDERLINE.DOT_DASH,
+    'dotDotDash': WD_UNDERLINE.DOT_DOT_DASH,
+    'wave': WD_UNDERLINE.WAVY,
+    'none': WD_UNDERLINE.NONE,
+}
+
+
+def translate_run_properties(source_rpr):
+    """
+    Builds the ``w:rPr`` of a run copied into a template.
+
+    The run gets the default font and size, plus the color, bold, italic and
+    underline (with its color) of ``source_rpr``, which may be None.
+
+    Args:
+        source_rpr: The ``w:rPr`` element of the source run, or None.
+
+    Returns:
+        A new ``w:rPr`` element.
+    """
+    run = Run(OxmlElement('w:r'), None)
+    run.font.name = DEFAULT_FONT_NAME
+    run.font.size = DEFAULT_FONT_SIZE
+    if source_rpr is not None:
+        color_element = source_rpr.find('.//w:color', namespaces=NS)
+        if color_element is not None and color_element.get(qn('w:val')):
+            try:
+                run.font.color.rgb = RGBColor.from_string(color_element.get(qn('w:val')))
+            except ValueError:
+                pass
+
+        if source_rpr.find('.//w:b', namespaces=NS) is not None:
+            run.bold = True
+        if source_rpr.find('.//w:i', namespaces=NS) is not None:
+            run.italic = True
+
+        underline_element = source_rpr.find('.//w:u', namespaces=NS)
+        if underline_element is not None:
+            run.font.underline = UNDERLINES.get(underline_element.get(qn('w:val')), WD_UNDERLINE.SINGLE)
+            underline_color = underline_element.get(qn('w:color'))
+            if underline_color:
+                try:
+                    run._r.rPr.u.set(qn('w:color'), str(RGBColor.from_string(underline_color)))
+                except ValueError:
+                    pass
+    return run._r.rPr
+
+
+class RunFormatTranslator:
+    """
+    Memoizes translate_run_properties.
+
+    Most runs of a submission share a handful of formatting combinations, so
+    the translated ``w:rPr`` is built once per distinct source ``w:rPr`` (keyed
+    by its serialization) and every run then gets a copy of it, instead of
+    going through the python-docx font setters, each of which looks up and
+    creates elements of its own. The cache holds XML only, so it is shared by
+    every conversion of the process; it is emptied once it holds
+    ``max_entries`` translations.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._rprs = {}
+
+    def run_properties(self, source_rpr):
+        """Returns a new ``w:rPr`` element equal to translate_run_properties(source_rpr)."""
+        key = None if source_rpr is None else etree.tostring(source_rpr)
+        rpr = self._rprs.get(key)
+        if rpr is None:
+            if len(self._rprs) >= self.max_entries:
+                self._rprs.clear()
+            rpr = self._rprs[key] = translate_run_properties(source_rpr)
+        return copy.deepcopy(rpr)
+
+
+run_format_translator = RunFormatTranslator()
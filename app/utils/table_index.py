@@ -0,0 +1,465 @@
+import copy
+import weakref
+from collections import deque
+
+from docx.oxml.ns import qn
+from docx.oxml.parser import element_class_lookup
+from docx.table import Table, _Cell
+from lxml import etree
+
+from app.utils.timing import count as count_stat
+
+
+# Strings the converters look for to locate the sections of Chambers and
+# Legal 500 submissions. They are matched in a single pass over the tables;
+# any other string is answered from the cached cell texts.
+SECTION_MARKERS = (
+    "D0 – PUBLISHABLE CLIENTS",
+    "E0 – CONFIDENTIAL CLIENTS",
+    "Partner: leading partner",
+    "Partner: leading individual",
+    "Partner: next generation",
+    "Partner: next generation partner",
+    "Associate: leading associate",
+    "Associate: rising star",
+    "Name (English)",
+    "Name",
+    "Position/role",
+    "Publishable Matter",
+    "Publishable matter",
+    "Confidential Matter",
+    "Non-publishable matter",
+    "Name of client",
+    "D1 Name of client",
+    "E1 Name of client",
+    "Comments",
+    "Supporting information",
+)
+
+
+class PatternMatcher:
+    """
+    Aho–Corasick automaton that finds which of a fixed set of patterns occur
+    in a text with a single scan of the text.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(patterns))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [set()]
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(set())
+                state = next_state
+            self._output[state].add(pattern_id)
+
+        # Breadth-first pass to link every state to its longest proper suffix
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def search(self, text):
+        """Returns the set of pattern ids (indices into ``patterns``) found in ``text``."""
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                found |= self._output[state]
+        return found
+
+
+_section_matcher = PatternMatcher(SECTION_MARKERS)
+
+# Same as lxml's default parser apart from producing python-docx element classes
+_clone_parser = etree.XMLParser(resolve_entities=False)
+_clone_parser.set_element_class_lookup(element_class_lookup)
+
+
+# Number of times rows of each ``w:tbl`` were inserted or deleted, and of
+# times its text changed (row changes included), recorded by the helpers
+# below. Keyed by element: whoever caches something derived from a table
+# holds its element, which keeps the entries alive as long as they matter.
+_row_versions = weakref.WeakKeyDictionary()
+_text_versions = weakref.WeakKeyDictionary()
+
+
+def table_row_version(tbl):
+    return _row_versions.get(tbl, 0)
+
+
+def table_text_version(tbl):
+    return _text_versions.get(tbl, 0)
+
+
+def table_rows_changed(tbl):
+    """
+    Records that rows of a ``w:tbl`` were inserted or deleted.
+
+    Code that changes the rows of a table other than through add_table_row
+    and remove_table_row must call it, so that TableViews and the
+    TableTextIndex of the table notice.
+    """
+    _row_versions[tbl] = _row_versions.get(tbl, 0) + 1
+    table_text_changed(tbl)
+
+
+def table_text_changed(tbl):
+    """Records that the text of a ``w:tbl`` changed, for the TableTextIndex."""
+    _text_versions[tbl] = _text_versions.get(tbl, 0) + 1
+
+
+def add_table_row(table):
+    """Adds a row at the end of a Table (or TableView), like ``table.add_row()``, and returns it."""
+    row = table.add_row()
+    table_rows_changed(table._tbl)
+    return row
+
+
+def remove_table_row(table, row):
+    """Removes a row from a Table (or TableView)."""
+    table._tbl.remove(row._tr)
+    table_rows_changed(table._tbl)
+
+
+def write_cell_text(table, row_idx, col_idx, text):
+    """Replaces the text of a cell, like ``table.cell(row_idx, col_idx).text = text``."""
+    table.cell(row_idx, col_idx).text = text
+    table_text_changed(table._tbl)
+
+
+def table_cell_texts(tbl):
+    """
+    Returns the stripped text of every cell of a ``w:tbl`` element.
+
+    Matches what iterating ``row.cells`` and reading ``cell.text`` yields,
+    without building python-docx's cell objects for every grid position:
+    vertically merged continuation cells are skipped since python-docx
+    resolves them to the cell they continue.
+    """
+    texts = []
+    for tr in tbl.tr_lst:
+        for tc in tr.tc_lst:
+            if tc.vMerge == "continue":
+                continue
+            texts.append(_Cell(tc, None).text.strip())
+    return texts
+
+
+class TableTextIndex:
+    """
+    Which top-level tables of a document contain which strings.
+
+    The text of every cell is extracted once and run through the section
+    marker matcher, so looking up any of SECTION_MARKERS is a dictionary
+    access. The index remembers the ``w:tbl`` elements it was built from and
+    their table_text_version: get_table_text_index re-reads only the tables
+    whose rows or text changed since, and rebuilds the index when tables
+    were inserted or deleted.
+    """
+
+    def __init__(self, doc, matcher=_section_matcher):
+        self._matcher = matcher
+        self._markers = set(matcher.patterns)
+        self._tbls = list(doc.element.body.tbl_lst)
+        self._texts = [None] * len(self._tbls)
+        self._versions = [None] * len(self._tbls)
+        self._matches = {pattern: set() for pattern in matcher.patterns}
+        for table_index in range(len(self._tbls)):
+            self._index_table(table_index)
+
+    def _index_table(self, table_index):
+        tbl = self._tbls[table_index]
+        self._versions[table_index] = table_text_version(tbl)
+        texts = self._texts[table_index] = table_cell_texts(tbl)
+        found = set()
+        for text in texts:
+            found |= self._matcher.search(text)
+        markers = {self._matcher.patterns[pattern_id] for pattern_id in found}
+        for pattern, indices in self._matches.items():
+            if pattern in self._markers:
+                contains = pattern in markers
+            else:
+                contains = any(pattern in text for text in texts)
+            if contains:
+                indices.add(table_index)
+            else:
+                indices.discard(table_index)
+
+    def _same_tables(self, doc):
+        tbls = doc.element.body.tbl_lst
+        return len(tbls) == len(self._tbls) and all(a is b for a, b in zip(tbls, self._tbls))
+
+    def is_current(self, doc):
+        """Returns whether the document still has the tables the index was built from, with the same text."""
+        return self._same_tables(doc) and all(
+            table_text_version(tbl) == version for tbl, version in zip(self._tbls, self._versions)
+        )
+
+    def refresh(self, doc):
+        """
+        Re-reads the tables whose rows or text changed since they were indexed.
+
+        Returns:
+            False if tables were inserted or deleted, which needs a new index.
+        """
+        if not self._same_tables(doc):
+            return False
+        for table_index, tbl in enumerate(self._tbls):
+            if table_text_version(tbl) != self._versions[table_index]:
+                self._index_table(table_index)
+        return True
+
+    def find(self, search_string):
+        """Returns the indices of the tables having a cell that contains ``search_string``."""
+        indices = self._matches.get(search_string)
+        if indices is None:
+            indices = self._matches[search_string] = {
+                table_index for table_index, texts in enumerate(self._texts)
+                if any(search_string in text for text in texts)
+            }
+        return sorted(indices)
+
+
+def get_table_text_index(doc):
+    """
+    Returns the TableTextIndex of a document, building it when missing or
+    when the document's tables were inserted, deleted or replaced, and
+    refreshing the tables whose rows or text changed otherwise.
+    """
+    index = getattr(doc, '_table_text_index', None)
+    if index is None or not index.refresh(doc):
+        index = TableTextIndex(doc)
+        doc._table_text_index = index
+    return index
+
+
+def invalidate_table_text_index(doc):
+    """Drops the cached index, e.g. after changes not reported with table_text_changed."""
+    doc._table_text_index = None
+
+
+class TableView:
+    """
+    python-docx Table wrapper whose ``cell(row, col)`` reuses one cell grid.
+
+    ``Table.cell`` rebuilds the grid of the whole table on every call, which
+    makes row-by-row loops quadratic. The view builds it with the same
+    merge and gridSpan handling on first use and keeps it until the table's
+    table_row_version changes, i.e. until rows are inserted or deleted through
+    add_table_row, remove_table_row or code calling table_rows_changed, so a
+    lookup costs O(1). Everything else is delegated to the table, so a view
+    can stand in for it.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self._version = None
+        self._cells = None
+        self._column_count = None
+
+    def __getattr__(self, name):
+        return getattr(self.table, name)
+
+    def _grid(self):
+        version = table_row_version(self.table._tbl)
+        if self._cells is None or version != self._version:
+            self._version = version
+            self._cells = self.table._cells
+            self._column_count = self.table._column_count
+        return self._cells
+
+    def add_row(self):
+        """Adds a row like ``Table.add_row``, recording it with table_rows_changed."""
+        return add_table_row(self.table)
+
+    def cell(self, row_idx, col_idx):
+        """Returns the cell at ``(row_idx, col_idx)``, like ``Table.cell``."""
+        cells = self._grid()
+        return cells[col_idx + row_idx * self._column_count]
+
+    def invalidate(self):
+        """Forces the grid to be rebuilt, e.g. after cells were merged."""
+        self._cells = None
+
+
+class BodyTableIndex:
+    """
+    Positions of the body-level ``w:tbl`` elements of a document.
+
+    ``doc.tables[i]`` builds a Table for every table in the body and
+    ``body.index(element)`` scans the body, and the converters do both for
+    every table they copy, delete or write to. This index lists the table
+    elements once and is updated in place by the helpers that insert or
+    delete tables, so finding table ``i`` is a list lookup and new elements are
+    placed with ``addprevious`` relative to their neighbour.
+
+    The index is a plain list on purpose: lookups are O(1), and inserts and
+    deletions by position are O(n) but only move pointers, which for the tens
+    to few hundred tables of a submission is cheaper than maintaining a tree.
+    Nothing searches it or the body for an element's position.
+
+    Code that adds or removes body tables by other means must call
+    invalidate_body_table_index.
+    """
+
+    def __init__(self, doc):
+        self._tbls = list(doc.element.body.tbl_lst)
+
+    def __len__(self):
+        return len(self._tbls)
+
+    def __getitem__(self, table_index):
+        """Returns the ``w:tbl`` element of table ``table_index``, like ``doc.tables[i]._element``."""
+        return self._tbls[table_index]
+
+    def insert(self, table_index, tbl):
+        """Records that ``tbl`` was inserted so that it is now table ``table_index``."""
+        self._tbls.insert(table_index, tbl)
+
+    def insert_many(self, table_index, tbls):
+        """Records that ``tbls`` were inserted in a run starting at table ``table_index``."""
+        self._tbls[table_index:table_index] = tbls
+
+    def append(self, tbl):
+        self._tbls.append(tbl)
+
+    def pop(self, table_index):
+        """Records that table ``table_index`` was removed from the body and returns its element."""
+        return self._tbls.pop(table_index)
+
+
+def get_body_table_index(doc):
+    """Returns the BodyTableIndex of a document, building it on first use."""
+    index = getattr(doc, '_body_table_index', None)
+    if index is None:
+        index = BodyTableIndex(doc)
+        doc._body_table_index = index
+    return index
+
+
+def invalidate_body_table_index(doc):
+    doc._body_table_index = None
+
+
+def clone_element(element):
+    """
+    Returns a detached copy of an element, serialized and re-parsed like
+    ``etree.fromstring(etree.tostring(element))``, with python-docx element
+    classes so the copy can be kept in a BodyTableIndex.
+    """
+    return etree.fromstring(etree.tostring(element), _clone_parser)
+
+
+def body_table(doc, table_index):
+    """Returns table ``table_index`` of the document body, like ``doc.tables[table_index]``."""
+    return Table(get_body_table_index(doc)[table_index], doc._body)
+
+
+def new_page_break_paragraph():
+    """Returns a ``w:p`` holding only a page break."""
+    paragraph = etree.Element(qn('w:p'))
+    run = etree.SubElement(paragraph, qn('w:r'))
+    etree.SubElement(run, qn('w:br'), {qn('w:type'): 'page'})
+    return paragraph
+
+
+def new_empty_paragraph():
+    """Returns an empty ``w:p``, which renders as a single blank line."""
+    return etree.Element(qn('w:p'))
+
+
+def set_cell_text(table, row_index, cell_index, text):
+    """
+    Replaces the text of the first run of a cell's first paragraph, keeping
+    the run's formatting.
+    """
+    table.rows[row_index].cells[cell_index].paragraphs[0].runs[0].text = text
+
+
+def replicate_table(doc, table_index, count, before=False, separator=None, prepare=None, prepare_prototype=None):
+    """
+    Inserts ``count`` copies of a body table in one pass.
+
+    The prototype is serialized once and every copy is a deepcopy of the
+    parsed result, so the document ends up the same as after ``count`` calls
+    to copy_table_with_paragraphs without paragraphs, followed by the page
+    break, line space and title writes the converters used to do one table
+    at a time.
+
+    Args:
+        doc (docx.Document): The Document object.
+        table_index (int): Index of the table to copy.
+        count (int): Number of copies; nothing happens if it is 0 or less.
+        before (bool): If True the copies go right before the prototype
+            (like copying table i to index i), otherwise right before the next
+            body table or at the end of the body (like copying it to i + 1).
+        separator (callable): Called with the 1-based number of each copy;
+            may return an element (e.g. new_page_break_paragraph()) to put
+            right before that copy.
+        prepare (callable): Called with a python-docx Table for each copy and
+            its 1-based number before it is inserted, e.g. to write its title.
+        prepare_prototype (callable): Called once with a python-docx Table for
+            the detached prototype before it is copied, for the changes every
+            copy shares (e.g. formatting the title runs that prepare then
+            fills in with set_cell_text).
+
+    Returns:
+        List of the table indices of the copies.
+    """
+    if count <= 0:
+        return []
+    try:
+        tables = get_body_table_index(doc)
+        prototype = clone_element(tables[table_index])
+        if prepare_prototype is not None:
+            prepare_prototype(Table(prototype, doc._body))
+
+        elements = []
+        copies = []
+        for number in range(1, count + 1):
+            tbl = copy.deepcopy(prototype)
+            if prepare is not None:
+                prepare(Table(tbl, doc._body), number)
+            if separator is not None:
+                element = separator(number)
+                if element is not None:
+                    elements.append(element)
+            elements.append(tbl)
+            copies.append(tbl)
+
+        body = doc.element.body
+        first_index = table_index if before else table_index + 1
+        if first_index < len(tables):
+            following = tables[first_index]
+            for element in elements:
+                following.addprevious(element)
+        else:
+            first_index = len(tables)
+            body.extend(elements)
+        tables.insert_many(first_index, copies)
+        count_stat("tables_cloned", len(copies))
+
+        doc.part._element = doc.element
+        return list(range(first_index, first_index + count))
+
+    except IndexError:
+        print("Error: Table index out of range.")
+        return []
@@ -0,0 +1,89 @@
+import asyncio
+import glob
+import os
+import tempfile
+import time
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+# Prefix of every temporary file written by the conversion pipeline
+TEMP_FILE_PREFIX = "tigerdoc_"
+# Temporary files older than this many minutes are considered orphaned
+TEMP_FILE_MAX_AGE_MINUTES = int(os.getenv("TEMP_FILE_MAX_AGE_MINUTES", "60"))
+# Minutes between two janitor runs
+TEMP_JANITOR_INTERVAL_MINUTES = int(os.getenv("TEMP_JANITOR_INTERVAL_MINUTES", "15"))
+
+# Files left behind by the pipeline: spooled uploads, results written next
+# to them and batch archives, plus the <tmp>_result.docx / <tmp>_processed.docx
+# files of earlier versions that never deleted them
+ORPHAN_PATTERNS = (
+    f"{TEMP_FILE_PREFIX}*.docx",
+    f"{TEMP_FILE_PREFIX}*.zip",
+    "tmp*_result.docx",
+    "tmp*_processed.docx",
+)
+
+
+def remove_file(path):
+    """Deletes a file, ignoring files that are already gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def temp_file_paths(directory=None):
+    """Returns the paths of the conversion temp files in ``directory``, the system temp directory by default."""
+    directory = directory or tempfile.gettempdir()
+    paths = set()
+    for pattern in ORPHAN_PATTERNS:
+        paths.update(glob.glob(os.path.join(directory, pattern)))
+    return paths
+
+
+def disk_usage(paths):
+    """Returns the number and total size in bytes of the files among ``paths``, skipping vanished ones."""
+    files = 0
+    size = 0
+    for path in paths:
+        try:
+            size += os.path.getsize(path)
+            files += 1
+        except OSError:
+            continue
+    return files, size
+
+
+def purge_temp_files(max_age_minutes=TEMP_FILE_MAX_AGE_MINUTES, directory=None):
+    """
+    Deletes conversion temp files older than ``max_age_minutes``.
+
+    Args:
+        max_age_minutes (int): Minimum age of a file to be deleted.
+        directory (str): Directory to clean, the system temp directory by default.
+
+    Returns:
+        Number of files deleted.
+    """
+    cutoff = time.time() - max_age_minutes * 60
+    removed = 0
+    for path in temp_file_paths(directory):
+        try:
+            if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError as e:
+            print(f"Warning: Could not remove {path}: {e}")
+    return removed
+
+
+async def run_janitor(interval_minutes=TEMP_JANITOR_INTERVAL_MINUTES, max_age_minutes=TEMP_FILE_MAX_AGE_MINUTES):
+    """Purges orphaned temp files now and then every ``interval_minutes`` until cancelled."""
+    while True:
+        removed = await asyncio.to_thread(purge_temp_files, max_age_minutes)
+        if removed:
+            print(f"Removed {removed} orphaned temp files")
+        await asyncio.sleep(interval_minutes * 60)
@@ -0,0 +1,83 @@
+import copy
+import hashlib
+import io
+import os
+import threading
+
+from docx import Document
+
+from app.utils.docx_writer import TemplatePackage
+
+
+class _Template:
+    def __init__(self, path):
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            raw = f.read()
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.sha256 = hashlib.sha256(raw).hexdigest()
+        self.document = Document(io.BytesIO(raw))
+        # Carried over to every copy, so that work derived from the template
+        # (see field_mapping.conversion_plan) can be cached per template
+        self.document._template_sha256 = self.sha256
+        self.package = TemplatePackage(raw, self.document)
+
+    def is_stale(self, path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns != self.mtime_ns or stat.st_size != self.size
+
+
+class TemplateCache:
+    """
+    Keeps the conversion templates parsed in memory.
+
+    Each template package is loaded from disk once; every conversion then gets
+    its own mutable copy through ``get``, which deep-copies the parsed package
+    instead of unzipping and re-parsing the file. The file's mtime and size are
+    checked on every ``get`` so an edited template is picked up without a
+    restart. Copies also carry the template's compressed package, which
+    ``docx_io.save_document`` reuses for the parts a conversion left alone.
+    """
+
+    def __init__(self, paths):
+        """
+        Args:
+            paths (dict): Maps a template name to its .docx path.
+        """
+        self._paths = dict(paths)
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Loads (or reloads) every template."""
+        for name in self._paths:
+            self._reload(name)
+
+    def _reload(self, name):
+        with self._lock:
+            template = self._templates.get(name)
+            path = self._paths[name]
+            if template is None or template.is_stale(path):
+                if template is not None:
+                    print(f"Template {path} changed on disk, reloading")
+                template = self._templates[name] = _Template(path)
+            return template
+
+    def _current(self, name):
+        template = self._templates.get(name)
+        if template is None or template.is_stale(self._paths[name]):
+            template = self._reload(name)
+        return template
+
+    def get(self, name):
+        """Returns a fresh, mutable copy of a template Document."""
+        template = self._current(name)
+        document = copy.deepcopy(template.document)
+        # Shared rather than copied: the package is never modified
+        document._template_package = template.package
+        return document
+
+    def sha256(self, name):
+        """Returns the SHA-256 of the template file currently in use."""
+        return self._current(name).sha256
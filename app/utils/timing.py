@@ -0,0 +1,172 @@
+import functools
+import json
+import os
+import re
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+# Set to "false" to stop recording per-stage timings of conversions
+CONVERSION_TIMING = os.getenv("CONVERSION_TIMING", "true").lower() in ("1", "true", "yes")
+
+
+class Timings:
+    """
+    Durations and counters of the stages of one conversion.
+
+    Durations are summed per name, so a span entered several times (e.g. once
+    per matter) reports its total time and the number of times it ran.
+    ``stage`` times the consecutive sections of a long function without
+    wrapping each of them in a ``with`` block: every call ends the previous
+    stage.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.calls = {}
+        self.counts = {}
+        self._stage = None
+        self._stage_start = 0.0
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def stage(self, name):
+        """Ends the current stage, if any, and starts ``name``; None just ends it."""
+        now = time.perf_counter()
+        if self._stage is not None:
+            self.add(self._stage, now - self._stage_start)
+        self._stage = name
+        self._stage_start = now
+
+    def count(self, name, amount=1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def merge(self, summary, prefix=""):
+        """Adds the durations and counts of a summary returned by ``as_dict``."""
+        for name, milliseconds in summary.get("durations_ms", {}).items():
+            self.durations[prefix + name] = self.durations.get(prefix + name, 0.0) + milliseconds / 1000
+            self.calls[prefix + name] = self.calls.get(prefix + name, 0) + summary.get("calls", {}).get(name, 1)
+        for name, amount in summary.get("counts", {}).items():
+            self.count(prefix + name, amount)
+
+    def as_dict(self):
+        """Returns the durations (in milliseconds), call numbers and counts as plain, picklable dicts."""
+        self.stage(None)
+        return {
+            "durations_ms": {name: round(seconds * 1000, 2) for name, seconds in self.durations.items()},
+            "calls": dict(self.calls),
+            "counts": dict(self.counts),
+        }
+
+    def server_timing(self):
+        """Returns the value of a Server-Timing header listing every duration, then every count."""
+        self.stage(None)
+        metrics = [f"{_metric_name(name)};dur={seconds * 1000:.1f}" for name, seconds in self.durations.items()]
+        metrics += [f'{_metric_name(name)};desc="{amount}"' for name, amount in self.counts.items()]
+        return ", ".join(metrics)
+
+    def log(self, event, **fields):
+        """Prints the timings as one JSON log line, together with ``fields``."""
+        log_timings(event, self.as_dict(), **fields)
+
+
+class _DisabledTimings:
+    """Stand-in used when timing is off; every method is a no-op."""
+
+    durations = calls = counts = {}
+
+    def add(self, name, seconds):
+        pass
+
+    def span(self, name):
+        return nullcontext()
+
+    def stage(self, name):
+        pass
+
+    def count(self, name, amount=1):
+        pass
+
+    def merge(self, summary, prefix=""):
+        pass
+
+    def as_dict(self):
+        return {}
+
+    def server_timing(self):
+        return ""
+
+    def log(self, event, **fields):
+        pass
+
+
+DISABLED = _DisabledTimings()
+
+_current = ContextVar("conversion_timings", default=DISABLED)
+
+
+def _metric_name(name):
+    # Server-Timing metric names are HTTP tokens
+    return re.sub(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]", "_", name)
+
+
+def new_timings():
+    """Returns a Timings, or the no-op stand-in when CONVERSION_TIMING is off."""
+    return Timings() if CONVERSION_TIMING else DISABLED
+
+
+@contextmanager
+def recording(timings):
+    """Makes ``timings`` the one span, stage and count report to in this context."""
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def log_timings(event, summary, **fields):
+    """Prints a summary returned by ``Timings.as_dict`` as one JSON log line; empty summaries are skipped."""
+    if summary:
+        print(json.dumps({"event": event, **fields, **summary}))
+
+
+def span(name):
+    """Times a ``with`` block in the current timings."""
+    return _current.get().span(name)
+
+
+def stage(name):
+    """Starts the stage ``name`` of the current timings, ending the previous one."""
+    _current.get().stage(name)
+
+
+def count(name, amount=1):
+    """Adds ``amount`` to the counter ``name`` of the current timings."""
+    _current.get().count(name, amount)
+
+
+def timed(name):
+    """Decorator timing every call of a function as the span ``name``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _current.get().span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,102 @@
+import os
+import tempfile
+
+from dotenv import load_dotenv
+
+from app.utils.temp_files import TEMP_FILE_PREFIX, remove_file
+
+
+load_dotenv()
+
+# Uploads larger than this many bytes are rejected
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(20 * 1024 * 1024)))
+# Uploads larger than this many bytes are spilled to a temporary file instead of kept in memory
+UPLOAD_SPOOL_THRESHOLD = int(os.getenv("UPLOAD_SPOOL_THRESHOLD", str(4 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+class UploadBuffer:
+    """
+    An upload read exactly once, held in memory or, above the spool threshold,
+    in a temporary file.
+
+    ``source`` is what the converters should open: the bytes themselves or the
+    path of the temporary file. Both are cheap to hand to a worker process.
+    Call ``close`` (or use the buffer as a context manager) to delete the
+    temporary file.
+    """
+
+    def __init__(self, data=None, path=None, size=0):
+        self.data = data
+        self.path = path
+        self.size = size
+
+    @property
+    def source(self):
+        return self.data if self.path is None else self.path
+
+    def close(self):
+        if self.path is not None:
+            remove_file(self.path)
+            self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+async def read_upload(upload, max_size=MAX_UPLOAD_SIZE, spool_threshold=UPLOAD_SPOOL_THRESHOLD):
+    """
+    Reads an UploadFile into an UploadBuffer in fixed-size chunks.
+
+    Args:
+        upload: The FastAPI UploadFile.
+        max_size (int): Maximum accepted size in bytes.
+        spool_threshold (int): Size above which the data goes to a temporary file.
+
+    Returns:
+        UploadBuffer holding the upload.
+
+    Raises:
+        UploadTooLarge: If the upload is larger than ``max_size``. The check
+            runs before the document is parsed, and as early as the declared
+            size allows.
+    """
+    if upload.size is not None and upload.size > max_size:
+        raise UploadTooLarge(f"The file exceeds the maximum upload size of {max_size} bytes.")
+
+    data = bytearray()
+    spool = None
+    size = 0
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLarge(f"The file exceeds the maximum upload size of {max_size} bytes.")
+            if spool is None and size > spool_threshold:
+                spool = tempfile.NamedTemporaryFile(prefix=TEMP_FILE_PREFIX, suffix=".docx", delete=False)
+                spool.write(data)
+                data = None
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                data += chunk
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            remove_file(spool.name)
+        raise
+
+    if spool is not None:
+        spool.close()
+        return UploadBuffer(path=spool.name, size=size)
+    return UploadBuffer(data=bytes(data), size=size)
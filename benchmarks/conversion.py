@@ -0,0 +1,211 @@
+"""
+Times validate_document and the converters end to end and per stage on
+synthetic submissions (see benchmarks.synthetic_documents).
+
+Every mode is run on documents of each selected size; a parameter given on
+the command line overrides it in all of them. The LLM is replaced by an
+in-process stub that answers after ``--llm-latency`` seconds, and the
+normalization cache is off, so every run does the same work. Results are
+written as JSON and can be compared with those of another commit:
+
+    python -m benchmarks.conversion --output before.json
+    git checkout my-branch
+    python -m benchmarks.conversion --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import re
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.utils.conversion_engine import CONVERTERS, template_cache
+from app.utils.docx_io import open_document
+from app.utils.normalization import normalization_service
+from app.utils.timing import Timings, count, recording, span
+from benchmarks.synthetic_documents import DEFAULT_SHAPE, add_shape_arguments, generate
+
+
+SIZES = {
+    "small": {"contacts": 1, "heads": 1, "ranked_lawyers": 2, "publishable": 2, "confidential": 1, "rows_per_matter": 1},
+    "medium": DEFAULT_SHAPE,
+    "large": {"contacts": 10, "heads": 6, "ranked_lawyers": 24, "publishable": 30, "confidential": 20, "rows_per_matter": 4},
+}
+
+
+class StubResponses:
+    """Answers normalization requests like the model would, keeping the strings as they are."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def create(self, model, instructions, input):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        batch = re.search(r"JSON array of strings:\n\s*(\[.*\])\n", input)
+        if batch:
+            output_text = json.dumps([s.replace(",", ";") for s in json.loads(batch.group(1))])
+        else:
+            single = re.search(r"according to these rules:\n\s*(.*)\n\n\s*Return only", input, re.S)
+            output_text = single.group(1).replace(",", ";") if single else ""
+        return SimpleNamespace(output_text=output_text)
+
+
+class StubClient:
+    def __init__(self, latency):
+        self.responses = StubResponses(latency)
+
+    async def close(self):
+        pass
+
+
+def stub_llm(latency):
+    """Points the normalization service at StubClient and turns its cache off."""
+    normalization_service._client_factory = lambda: StubClient(latency)
+    normalization_service.cache = None
+
+
+def convert_once(mode, source):
+    """Validates and converts ``source`` once; returns the Timings and the size of the result."""
+    validate, convert = CONVERTERS[mode]
+    timings = Timings()
+    output = io.BytesIO()
+    # The converters print progress; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()), recording(timings), span("total"):
+        with span("parse"):
+            source_doc = open_document(io.BytesIO(source))
+        count("source_tables", len(source_doc.tables))
+        with span("validate"):
+            is_valid, message = validate(source_doc)
+        if not is_valid:
+            raise ValueError(f"The synthetic {mode} document is invalid: {message}")
+        with span("template_copy"):
+            target_doc = template_cache.get(mode)
+        with span("convert"):
+            convert(source_doc, target_doc, output)
+    return timings, len(output.getvalue())
+
+
+def run_case(mode, size, shape, seed, repeat, warmup):
+    source = generate(mode, seed, **shape)
+    for _ in range(warmup):
+        convert_once(mode, source)
+    runs = []
+    for _ in range(repeat):
+        timings, output_bytes = convert_once(mode, source)
+        runs.append(timings.as_dict())
+
+    stages = {}
+    for name in runs[0]["durations_ms"]:
+        values = [run["durations_ms"].get(name, 0.0) for run in runs]
+        stages[name] = {"median": round(statistics.median(values), 2), "min": round(min(values), 2)}
+    return {
+        "mode": mode,
+        "size": size,
+        "shape": shape,
+        "source_bytes": len(source),
+        "output_bytes": output_bytes,
+        "stages_ms": stages,
+        "counts": runs[-1]["counts"],
+    }
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def print_results(results):
+    print(f"{'mode':14} {'size':8} {'tables':>6} {'total ms':>10} {'validate':>10} {'convert':>10}  slowest stages")
+    for result in results:
+        stages = result["stages_ms"]
+        slowest = sorted(
+            (name for name in stages if name not in ("total", "parse", "validate", "template_copy", "convert")),
+            key=lambda name: stages[name]["median"], reverse=True,
+        )[:3]
+        print(
+            f"{result['mode']:14} {result['size']:8} {result['counts'].get('source_tables', ''):>6} "
+            f"{stages['total']['median']:>10} {stages['validate']['median']:>10} {stages['convert']['median']:>10}  "
+            + ", ".join(f"{name} {stages[name]['median']}" for name in slowest)
+        )
+
+
+def print_comparison(baseline, results):
+    """Prints the median stage times of ``results`` next to those of a previous run."""
+    previous = {(result["mode"], result["size"]): result for result in baseline["results"]}
+    print(f"\ncompared with {baseline.get('commit') or 'the baseline'}:")
+    for result in results:
+        old = previous.get((result["mode"], result["size"]))
+        if old is None:
+            continue
+        if old["shape"] != result["shape"]:
+            print(f"{result['mode']} {result['size']}: documents differ, skipped")
+            continue
+        for name, stage in result["stages_ms"].items():
+            if name not in old["stages_ms"]:
+                continue
+            before = old["stages_ms"][name]["median"]
+            after = stage["median"]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else ""
+            print(f"  {result['mode']:14} {result['size']:8} {name:20} {before:>10} -> {after:>10} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=sorted(CONVERTERS), default=sorted(CONVERTERS))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    add_shape_arguments(parser)
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated text")
+    parser.add_argument("--repeat", type=int, default=5, help="Measured runs per document, the median is reported")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs per document")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the stubbed LLM takes per request")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare with")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    stub_llm(args.llm_latency)
+    overrides = {key: getattr(args, key) for key in DEFAULT_SHAPE if getattr(args, key) is not None}
+
+    results = []
+    for mode in args.modes:
+        for size in args.sizes:
+            shape = {**SIZES[size], **overrides}
+            results.append(run_case(mode, size, shape, args.seed, args.repeat, args.warmup))
+
+    commit, dirty = git_revision()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "llm_latency": args.llm_latency,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_results(results)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
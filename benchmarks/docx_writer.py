@@ -0,0 +1,106 @@
+"""
+Compares saving a converted document with python-docx's Document.save, which
+compresses every part of the package again, with docx_io.save_document, which
+copies the parts the conversion did not change from the template still
+compressed and compresses the others at the given zlib level (0 stores them).
+
+Each mode converts one synthetic submission (see benchmarks.synthetic_documents),
+with the LLM stubbed as in benchmarks.conversion, and the result is then saved
+repeatedly. For every writer the output size is reported and its
+document.xml is checked to be the one python-docx writes:
+
+    python -m benchmarks.docx_writer [--levels 0 1 6 9] [--repeat 20]
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+import zipfile
+
+from app.utils.conversion_engine import CONVERTERS, template_cache
+from app.utils.docx_io import open_document, save_document
+from benchmarks.conversion import stub_llm
+from benchmarks.synthetic_documents import generate
+
+
+def converted_document(mode, seed):
+    """Returns the template copy ``mode`` fills from a synthetic submission."""
+    convert = CONVERTERS[mode][1]
+    source_doc = open_document(io.BytesIO(generate(mode, seed)))
+    target_doc = template_cache.get(mode)
+    # The converters print progress; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        convert(source_doc, target_doc, io.BytesIO())
+    return target_doc
+
+
+def measure(save, repeat):
+    """Returns the best time in seconds over ``repeat`` runs and the last output."""
+    best = None
+    for _ in range(repeat):
+        output = io.BytesIO()
+        start = time.perf_counter()
+        save(output)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output.getvalue()
+
+
+def document_xml(package):
+    with zipfile.ZipFile(io.BytesIO(package)) as archive:
+        return archive.read("word/document.xml")
+
+
+def run_case(mode, levels, seed, repeat):
+    target_doc = converted_document(mode, seed)
+    save_seconds, saved = measure(target_doc.save, repeat)
+    expected = document_xml(saved)
+    results = [{
+        "mode": mode,
+        "writer": "Document.save",
+        "save_ms": round(save_seconds * 1000, 2),
+        "bytes": len(saved),
+        "speedup": 1.0,
+        "identical": True,
+    }]
+    for level in levels:
+        seconds, written = measure(lambda output: save_document(target_doc, output, level), repeat)
+        results.append({
+            "mode": mode,
+            "writer": f"save_document({level})",
+            "save_ms": round(seconds * 1000, 2),
+            "bytes": len(written),
+            "speedup": round(save_seconds / seconds, 1) if seconds else None,
+            "identical": document_xml(written) == expected,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=sorted(CONVERTERS), default=sorted(CONVERTERS))
+    parser.add_argument("--levels", type=int, nargs="+", default=[0, 1, 6, 9], help="zlib levels of the changed parts")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated text")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement, the best one is kept")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    stub_llm(0)
+    results = []
+    for mode in args.modes:
+        results.extend(run_case(mode, args.levels, args.seed, args.repeat))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':14} {'writer':18} {'save ms':>9} {'bytes':>9} {'speedup':>8} identical")
+        for result in results:
+            print(
+                f"{result['mode']:14} {result['writer']:18} {result['save_ms']:>9} {result['bytes']:>9} "
+                f"{result['speedup']:>8} {result['identical']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Compares copying the mapped fields of a submission with one
+copy_cell_content_to_target_cell call per field, as the converters used to,
+with executing the compiled conversion plans of app.utils.field_mapping.
+
+For each mode the fixed fields are copied once and the matter fields of every
+matter of a synthetic submission (see benchmarks.synthetic_documents) are
+copied into the first matter table of the template. Both paths start from
+the same template copy and the resulting documents are checked to be
+identical. The time to compile the plans, paid once per template, is
+reported separately:
+
+    python -m benchmarks.field_mapping [--matters 5 50] [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from lxml import etree
+
+from app.utils import chamber_l500_converter, l500_chamber_converter
+from app.utils.conversion_engine import CONVERTERS, template_cache
+from app.utils.docx_io import open_document
+from app.utils.field_mapping import (
+    CHAMBER_L500_FIELDS,
+    CHAMBER_L500_MATTER_FIELDS,
+    L500_CHAMBER_FIELDS,
+    L500_CHAMBER_MATTER_FIELDS,
+    compile_plan,
+)
+from benchmarks.synthetic_documents import generate
+
+
+# Per mode: converter module, fixed and matter specs, and the strings marking
+# the matter tables of the submission and of the template
+MODES = {
+    "chamber_l500": (chamber_l500_converter, CHAMBER_L500_FIELDS, CHAMBER_L500_MATTER_FIELDS, "D1 Name of client", "Publishable matter"),
+    "l500_chamber": (l500_chamber_converter, L500_CHAMBER_FIELDS, L500_CHAMBER_MATTER_FIELDS, "Publishable matter", "D1 Name of client"),
+}
+
+
+def copy_by_calls(mode, source_doc, target_doc, source_matters, target_matter):
+    """The converters' former path: one lookup and validation per field."""
+    converter, fields, matter_fields = MODES[mode][:3]
+    for _, (source_table, source_row, source_col), (target_table, target_row, target_col) in fields:
+        converter.copy_cell_content_to_target_cell(source_doc, source_table, source_row, source_col,
+                                                   target_doc, target_table, target_row, target_col)
+    for source_matter in source_matters:
+        for _, (source_row, source_col), (target_row, target_col) in matter_fields:
+            converter.copy_cell_content_to_target_cell(source_doc, source_matter, source_row, source_col,
+                                                       target_doc, target_matter, target_row, target_col)
+
+
+def copy_by_plan(mode, source_doc, target_doc, source_matters, target_matter, plans):
+    converter = MODES[mode][0]
+    plan, matter_plan = plans
+    plan.execute(source_doc, target_doc, converter.copy_cell_content)
+    for source_matter in source_matters:
+        matter_plan.execute(source_doc, target_doc, converter.copy_cell_content, source_matter, target_matter)
+
+
+def measure(copy, mode, source, repeat, *args):
+    """Returns the best time in seconds over ``repeat`` runs and the resulting document XML."""
+    best = None
+    for _ in range(repeat):
+        source_doc = open_document(io.BytesIO(source))
+        target_doc = template_cache.get(mode)
+        start = time.perf_counter()
+        copy(mode, source_doc, target_doc, *args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, etree.tostring(target_doc.element)
+
+
+def run_case(mode, matters, seed, repeat):
+    converter, fields, matter_fields, source_marker, target_marker = MODES[mode]
+    source = generate(mode, seed, publishable=matters, confidential=0)
+    source_doc = open_document(io.BytesIO(source))
+    source_matters = converter.find_tables_with_specific_string(source_doc, search_string=source_marker)
+    target_doc = template_cache.get(mode)
+    target_matter = converter.find_tables_with_specific_string(target_doc, search_string=target_marker)[0]
+
+    start = time.perf_counter()
+    plans = (compile_plan(fields, target_doc), compile_plan(matter_fields, target_doc, target_matter))
+    compile_seconds = time.perf_counter() - start
+
+    calls_seconds, calls_xml = measure(copy_by_calls, mode, source, repeat, source_matters, target_matter)
+    plan_seconds, plan_xml = measure(copy_by_plan, mode, source, repeat, source_matters, target_matter, plans)
+    return {
+        "mode": mode,
+        "matters": len(source_matters),
+        "fields": len(plans[0]) + len(plans[1]) * len(source_matters),
+        "compile_ms": round(compile_seconds * 1000, 2),
+        "calls_ms": round(calls_seconds * 1000, 2),
+        "plan_ms": round(plan_seconds * 1000, 2),
+        "speedup": round(calls_seconds / plan_seconds, 1) if plan_seconds else None,
+        "identical": calls_xml == plan_xml,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=sorted(CONVERTERS), default=sorted(CONVERTERS))
+    parser.add_argument("--matters", type=int, nargs="+", default=[5, 50], help="Numbers of matters in the submission")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated text")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement, the best one is kept")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    # The copy functions print errors for cells missing from the synthetic documents
+    with contextlib.redirect_stdout(io.StringIO()):
+        for mode in args.modes:
+            for matters in args.matters:
+                results.append(run_case(mode, matters, args.seed, args.repeat))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':14} {'matters':>8} {'fields':>7} {'compile ms':>11} {'calls ms':>10} {'plan ms':>10} {'speedup':>8} identical")
+        for result in results:
+            print(
+                f"{result['mode']:14} {result['matters']:>8} {result['fields']:>7} {result['compile_ms']:>11} "
+                f"{result['calls_ms']:>10} {result['plan_ms']:>10} {result['speedup']:>8} {result['identical']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Measures how many lawyer/firm strings the rule-based normalizer handles
+without calling the LLM.
+
+The corpus is made of the examples documented in ``template_Lawyer`` and
+``template_advising``, which the rules were written against, held-out
+strings they were not (HELD_OUT), and the matter cells of any Chambers
+submissions passed on the command line. Agreement is reported separately for
+the template examples and the held-out strings, together with the held-out
+strings the rules got wrong above the threshold:
+
+    python -m benchmarks.normalization_rules [submission.docx ...] [--measure-llm]
+
+Latency saved is estimated from ``--llm-latency`` seconds per call, or
+measured with one real request per template when ``--measure-llm`` is given
+(the request honours OPENAI_BASE_URL).
+"""
+import argparse
+import json
+import time
+
+from app.utils.chamber_l500_converter import extract_cell_text, template_advising, template_Lawyer
+from app.utils.docx_index import get_source_cell_index
+from app.utils.docx_io import open_document
+from app.utils.normalization import NORMALIZATION_RULES_THRESHOLD, NormalizationService
+from app.utils.normalization_rules import normalize_advising, normalize_lawyers
+
+
+NORMALIZERS = {
+    "lawyer": (template_Lawyer, normalize_lawyers),
+    "advising": (template_advising, normalize_advising),
+}
+# Strings the rules were not written against, with the output the templates
+# call for; None marks strings too ambiguous for the rules, which must be
+# left to the LLM
+HELD_OUT = [
+    ("advising", "Clifford Chance – advising the lenders", "Clifford Chance - advising the lenders"),
+    ("advising", "Slaughter and May – Counsel for the target, Herbert Smith Freehills – advising the bidder",
+     "Slaughter and May - Counsel for the target; Herbert Smith Freehills - advising the bidder"),
+    ("advising", "Baker McKenzie: counsel for the seller; Loyens & Loeff: advising the buyer",
+     "Baker McKenzie - counsel for the seller; Loyens & Loeff - advising the buyer"),
+    ("advising", "NautaDutilh advising the pension fund", "NautaDutilh - advising the pension fund"),
+    ("advising", "Time: 10am; firm - x", None),
+    ("advising", "Firm A – advising the buyer, Firm B, Firm C – advising the seller", None),
+    ("advising", "Linklaters (London) – advising X, and Y – advising Z", None),
+    ("advising", "Partner – advising the bank", None),
+    ("advising", "Stibbe – Claimant’s solicitors", None),
+    ("lawyer", "Mary Smith - Senior Associate (Banking)", "Mary Smith (Senior Associate), Banking"),
+    ("lawyer", "Pieter van der Berg, Counsel; Anna Lee (Associate)", "Pieter van der Berg (Counsel); Anna Lee (Associate)"),
+    ("lawyer", "Tom Green and Sarah White", "Tom Green; Sarah White"),
+    ("lawyer", "Head Of Department", None),
+    ("lawyer", "Managing Partner", None),
+    ("lawyer", "Jane Doe (Partner) and Head Of Department", None),
+]
+# Rows of a Chambers matter table holding the lead lawyers, other team
+# members and co-counsel, as read by normalize_matter_texts
+MATTER_ROWS = {10: "lawyer", 12: "lawyer", 14: "advising"}
+
+
+def template_examples(template):
+    """Returns the ``(input, expected)`` pairs documented in a template."""
+    examples = []
+    pending = ""
+    for line in template.strip().splitlines():
+        # Some inputs contain a newline, which splits their example over two lines
+        line = pending + line.strip()
+        if "->" not in line:
+            pending = line + "\n"
+            continue
+        pending = ""
+        input_str, expected = line.split("->", 1)
+        input_str = input_str.strip()
+        if input_str and input_str != "''":
+            examples.append((input_str, expected.strip()))
+    return examples
+
+
+def submission_values(path):
+    """Returns the non-empty matter cells of a Chambers submission."""
+    doc = open_document(path)
+    index = get_source_cell_index(doc)
+    values = []
+    for table_index in range(13, index.table_count):
+        if len(index.rows(table_index)) <= max(MATTER_ROWS):
+            continue
+        for row_index, kind in MATTER_ROWS.items():
+            text = extract_cell_text(doc, table_index, row_index, 0)
+            if text and text.strip():
+                values.append(("submission", kind, text, None))
+    return values
+
+
+def measure_llm_latency():
+    service = NormalizationService(cache=None, rules_threshold=float("inf"))
+    latencies = []
+    for kind, (template, _) in NORMALIZERS.items():
+        input_str = template_examples(template)[0][0]
+        start = time.perf_counter()
+        service.normalize_all([(input_str, template)])
+        latencies.append(time.perf_counter() - start)
+    return sum(latencies) / len(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("submissions", nargs="*", help="Chambers .docx files to take matter cells from")
+    parser.add_argument("--threshold", type=float, default=NORMALIZATION_RULES_THRESHOLD)
+    parser.add_argument("--llm-latency", type=float, default=1.5, help="Assumed seconds per LLM call")
+    parser.add_argument("--measure-llm", action="store_true", help="Measure the LLM latency instead")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    corpus = []
+    for kind, (template, _) in NORMALIZERS.items():
+        corpus += [("template", kind, input_str, expected) for input_str, expected in template_examples(template)]
+    corpus += [("held_out", kind, input_str, expected) for kind, input_str, expected in HELD_OUT]
+    for path in args.submissions:
+        corpus += submission_values(path)
+
+    handled = 0
+    # Per source: strings handled by the rules with an expected output, and those that agree with it
+    checked = {"template": 0, "held_out": 0}
+    agreed = {"template": 0, "held_out": 0}
+    held_out_wrong = 0
+    rule_seconds = 0.0
+    for source, kind, input_str, expected in corpus:
+        normalizer = NORMALIZERS[kind][1]
+        start = time.perf_counter()
+        result = normalizer(input_str)
+        rule_seconds += time.perf_counter() - start
+        if result.confidence < args.threshold:
+            continue
+        handled += 1
+        if source == "submission":
+            continue
+        if expected is not None:
+            checked[source] += 1
+            agreed[source] += result.output == expected
+        if result.output != expected:
+            held_out_wrong += source == "held_out"
+            if not args.json:
+                print(f"differs from expected ({source}): {input_str!r}\n  rules:    {result.output!r}\n  expected: {expected!r}")
+
+    llm_latency = measure_llm_latency() if args.measure_llm else args.llm_latency
+    summary = {
+        "strings": len(corpus),
+        "handled_by_rules": handled,
+        "llm_call_avoidance_rate": round(handled / len(corpus), 3) if corpus else 0.0,
+        "agreement_with_template_examples": f"{agreed['template']}/{checked['template']}",
+        "agreement_with_held_out": f"{agreed['held_out']}/{checked['held_out']}",
+        "held_out_wrong_above_threshold": f"{held_out_wrong}/{len(HELD_OUT)}",
+        "rule_time_per_string_ms": round(rule_seconds / len(corpus) * 1000, 4) if corpus else 0.0,
+        "llm_latency_per_call_s": round(llm_latency, 3),
+        "latency_saved_s": round(handled * llm_latency, 2),
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for key, value in summary.items():
+            print(f"{key:36} {value}")
+
+
+if __name__ == "__main__":
+    main()
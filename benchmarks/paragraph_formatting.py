@@ -0,0 +1,191 @@
+"""
+Compares the former paragraph formatting code of copy_cell_content, which
+searched the source w:pPr once per property and applied spacing through the
+python-docx paragraph_format setters, with ParagraphPropertiesTranslator.
+
+Source cells hold N paragraphs: mostly list bullets, with some indented,
+styled, colored and spaced paragraphs among them. Only the paragraph
+properties are copied, into the first cell of a fresh document, and the
+resulting cells are checked to be identical:
+
+    python -m benchmarks.paragraph_formatting [--paragraphs 10 50 200] [--repeat 20]
+"""
+import argparse
+import json
+import random
+import time
+
+from docx import Document
+from docx.enum.text import WD_LINE_SPACING
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from lxml import etree
+
+from app.utils.docx_index import W_NS, xpath
+from app.utils.paragraph_formatting import ParagraphPropertiesTranslator
+
+
+NS = {'w': W_NS}
+NUM_ID = '2'
+
+
+def source_cell(paragraphs, seed):
+    """Returns a w:tc of ``paragraphs`` paragraphs with varied formatting."""
+    rng = random.Random(seed)
+    parts = []
+    for i in range(paragraphs):
+        ppr = []
+        kind = rng.random()
+        if kind < 0.7:
+            ppr.append('<w:pStyle w:val="ListParagraph"/>')
+            ppr.append(f'<w:numPr><w:ilvl w:val="{rng.randint(0, 2)}"/><w:numId w:val="7"/></w:numPr>')
+        elif kind < 0.85:
+            ppr.append(f'<w:ind w:left="{rng.choice((360, 720))}" w:hanging="360"/>')
+        ppr.append(rng.choice((
+            '<w:spacing w:after="160" w:line="259" w:lineRule="auto"/>',
+            '<w:spacing w:before="240" w:after="60"/>',
+            '<w:spacing w:after="0" w:line="280" w:lineRule="exact"/>',
+            '<w:spacing w:line="300" w:lineRule="atLeast"/>',
+        )))
+        if rng.random() < 0.2:
+            ppr.append('<w:rPr><w:color w:val="1F3864"/></w:rPr>')
+        parts.append(f'<w:p><w:pPr>{"".join(ppr)}</w:pPr><w:r><w:t>Item {i}</w:t></w:r></w:p>')
+    return etree.fromstring(f'<w:tc xmlns:w="{W_NS}">{"".join(parts)}</w:tc>')
+
+
+def copy_by_setters(source_paragraphs, target_cell):
+    """The former paragraph formatting code of copy_cell_content."""
+    first_paragraph = True
+    n = 0
+    pre_left = ''
+    pre_hanging = ''
+    for i, paragraph in enumerate(source_paragraphs):
+        if first_paragraph:
+            new_paragraph = target_cell.paragraphs[0]
+            first_paragraph = False
+        else:
+            new_paragraph = target_cell.add_paragraph()
+
+        ppr = paragraph.find('.//w:pPr', namespaces=NS)
+        if ppr is not None:
+            new_ppr = new_paragraph._element.get_or_add_pPr()
+
+            numpr = ppr.find('.//w:numPr', namespaces=NS)
+            if numpr is not None:
+                ilvl = numpr.find('.//w:ilvl', namespaces=NS)
+                numId = numpr.find('.//w:numId', namespaces=NS)
+                if ilvl is not None and numId is not None:
+                    new_numpr = etree.SubElement(new_ppr, qn('w:numPr'))
+                    etree.SubElement(new_numpr, qn('w:ilvl'), {qn('w:val'): ilvl.get(qn('w:val'))})
+                    etree.SubElement(new_numpr, qn('w:numId'), {qn('w:val'): NUM_ID})
+
+            rpr = ppr.find('.//w:rPr', namespaces=NS)
+            if rpr is not None:
+                color = rpr.find('.//w:color', namespaces=NS)
+                if color is not None:
+                    if not new_paragraph.runs:
+                        new_paragraph.add_run('')
+                    for run in new_paragraph.runs:
+                        rPr = run._r.get_or_add_rPr()
+                        etree.SubElement(rPr, qn('w:color'), {qn('w:val'): color.get(qn('w:val'))})
+
+            pstyle = ppr.find('.//w:pStyle', namespaces=NS)
+            if pstyle is not None:
+                new_style = etree.SubElement(new_ppr, qn('w:pStyle'))
+                new_style.set(qn('w:val'), pstyle.get(qn('w:val')))
+
+            ind = ppr.find('.//w:ind', namespaces=NS)
+            if ind is not None and numpr is None:
+                new_ind = etree.SubElement(new_ppr, qn('w:ind'))
+                left = ind.get(qn('w:left'))
+                if left is not None:
+                    new_ind.set(qn('w:left'), left)
+                    pre_left = left
+                    n = i
+                hanging = ind.get(qn('w:hanging'))
+                if hanging is not None:
+                    new_ind.set(qn('w:hanging'), hanging)
+                    pre_hanging = hanging
+
+            if i == n + 1 and numpr is None:
+                new_ind = etree.SubElement(new_ppr, qn('w:ind'))
+                new_ind.set(qn('w:left'), pre_left)
+                new_ind.set(qn('w:hanging'), pre_hanging)
+
+            spacing = ppr.find('.//w:spacing', namespaces=NS)
+            is_last_paragraph = (i == len(source_paragraphs) - 1)
+            if spacing is not None:
+                before = spacing.get(qn('w:before'))
+                if before is not None:
+                    new_paragraph.paragraph_format.space_before = Pt(min(int(before)/20, 6))
+                after = spacing.get(qn('w:after'))
+                if after is not None and not is_last_paragraph:
+                    new_paragraph.paragraph_format.space_after = Pt(min(int(after)/20, 6))
+                else:
+                    new_paragraph.paragraph_format.space_after = Pt(0)
+                line = spacing.get(qn('w:line'))
+                if line is not None:
+                    line_rule = spacing.get(qn('w:lineRule'), 'auto')
+                    line_val = int(line)
+                    if line_rule == 'exact':
+                        new_paragraph.paragraph_format.line_spacing = Pt(line_val/20)
+                    elif line_rule == 'atLeast':
+                        new_paragraph.paragraph_format.line_spacing_rule = WD_LINE_SPACING.AT_LEAST
+                        new_paragraph.paragraph_format.line_spacing = Pt(line_val/20)
+                    else:
+                        new_paragraph.paragraph_format.line_spacing = line_val/240
+            else:
+                new_paragraph.paragraph_format.space_after = Pt(0)
+
+
+def copy_by_translator(source_paragraphs, target_cell):
+    translator = ParagraphPropertiesTranslator(NUM_ID, len(source_paragraphs))
+    for i, paragraph in enumerate(source_paragraphs):
+        new_paragraph = target_cell.paragraphs[0] if i == 0 else target_cell.add_paragraph()
+        translator.translate(i, paragraph, new_paragraph._p)
+
+
+def measure(copy, source_paragraphs, repeat):
+    """Returns the best time in seconds over ``repeat`` runs and the resulting cell XML."""
+    best = None
+    for _ in range(repeat):
+        target_cell = Document().add_table(rows=1, cols=1).cell(0, 0)
+        target_cell.text = ""
+        start = time.perf_counter()
+        copy(source_paragraphs, target_cell)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, etree.tostring(target_cell._tc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, nargs="+", default=[10, 50, 200], help="Paragraphs per source cell")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated formatting")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement, the best one is kept")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for paragraphs in args.paragraphs:
+        source_paragraphs = xpath(source_cell(paragraphs, args.seed), './/w:p')
+        setters_seconds, setters_xml = measure(copy_by_setters, source_paragraphs, args.repeat)
+        translator_seconds, translator_xml = measure(copy_by_translator, source_paragraphs, args.repeat)
+        results.append({
+            "paragraphs": paragraphs,
+            "setters_ms": round(setters_seconds * 1000, 3),
+            "translator_ms": round(translator_seconds * 1000, 3),
+            "speedup": round(setters_seconds / translator_seconds, 1) if translator_seconds else None,
+            "identical": setters_xml == translator_xml,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'paragraphs':>10} {'setters ms':>11} {'translator ms':>14} {'speedup':>8} identical")
+        for result in results:
+            print(f"{result['paragraphs']:>10} {result['setters_ms']:>11} {result['translator_ms']:>14} {result['speedup']:>8} {result['identical']}")
+
+
+if __name__ == "__main__":
+    main()
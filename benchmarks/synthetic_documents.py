@@ -0,0 +1,338 @@
+"""
+Generates synthetic Chambers and Legal 500 submissions for the benchmarks.
+
+Each submission is built from the template of the opposite direction (the
+Chambers form is what l500_chamber converts into and the source of
+chamber_l500, and the other way round). Its repeated sections are resized
+and every field is filled with text drawn from a seeded generator, so the
+same parameters always give the same document:
+
+    python -m benchmarks.synthetic_documents chamber_l500 out.docx --publishable 20 --rows-per-matter 4
+"""
+import argparse
+import copy
+import io
+import random
+
+from app.utils.conversion_engine import TEMPLATE_PATHS
+from app.utils.docx_io import open_document
+
+
+# Source form of each conversion mode
+SOURCE_TEMPLATES = {
+    "chamber_l500": TEMPLATE_PATHS["l500_chamber"],
+    "l500_chamber": TEMPLATE_PATHS["chamber_l500"],
+}
+
+DEFAULT_SHAPE = {
+    "contacts": 3,
+    "heads": 2,
+    "ranked_lawyers": 6,
+    "publishable": 5,
+    "confidential": 3,
+    "rows_per_matter": 2,
+}
+
+# Blank rows left at the end of the contact and head of team tables
+TRAILING_BLANK_ROWS = 2
+
+FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Eva", "Frank", "Grace", "Hugo", "Iris", "Jonas", "Kate", "Liam"]
+LAST_NAMES = ["Bakker", "Dubois", "Fischer", "Jansen", "Meyer", "Novak", "Rossi", "Smith", "Vos", "Weber"]
+FIRMS = ["Lawson & Associates", "De Brauw", "Allen & Overy", "Loyens & Loeff", "NautaDutilh", "Stibbe"]
+ROLES = ["Partner", "Counsel", "Senior associate", "Associate"]
+WORDS = (
+    "advised the board on the acquisition of a listed target including the financing structure "
+    "merger control filings employee consultation and the post closing integration of the business"
+).split()
+
+
+class TextSource:
+    """Seeded generator of the names and sentences written into the forms."""
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+
+    def name(self):
+        return f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}"
+
+    def firm(self):
+        return self.random.choice(FIRMS)
+
+    def role(self):
+        return self.random.choice(ROLES)
+
+    def email(self):
+        return f"{self.random.choice(FIRST_NAMES).lower()}.{self.random.choice(LAST_NAMES).lower()}@example.com"
+
+    def phone(self):
+        return f"+31 20 {self.random.randint(100, 999)} {self.random.randint(1000, 9999)}"
+
+    def sentence(self, words=12):
+        text = " ".join(self.random.choice(WORDS) for _ in range(words))
+        return text[0].upper() + text[1:] + "."
+
+    def paragraph(self, sentences=4):
+        return " ".join(self.sentence() for _ in range(sentences))
+
+
+def set_text(table, row_index, cell_index, text):
+    table.rows[row_index].cells[cell_index].text = text
+
+
+def ensure_rows(table, first_row, count):
+    """Copies row ``first_row`` right after itself until the table has ``count`` rows from ``first_row`` on."""
+    insert_rows(table, first_row, first_row + count - len(table.rows))
+
+
+def insert_rows(table, row_index, count):
+    """Inserts ``count`` copies of row ``row_index`` right after it."""
+    prototype = table.rows[row_index]._tr
+    for _ in range(count):
+        prototype.addnext(copy.deepcopy(prototype))
+
+
+def resize_tables(tables, count, number_cell, label):
+    """
+    Turns a run of numbered tables into ``count`` of them.
+
+    Tables past ``count`` are removed and the last one is copied to add the
+    missing ones. The numbered cell of every table is rewritten as
+    ``label`` followed by its 1-based number.
+
+    Args:
+        tables (list): python-docx Tables of the run, in document order.
+        count (int): Number of tables wanted.
+        number_cell (tuple): (row, column) of the cell holding the number.
+        label (str): Text before the number.
+
+    Returns:
+        List of the ``count`` tables' XML elements, in document order.
+    """
+    elements = [table._tbl for table in tables]
+    for tbl in elements[count:]:
+        tbl.getparent().remove(tbl)
+    elements = elements[:count]
+    if elements:
+        last = elements[-1]
+        for _ in range(count - len(elements)):
+            tbl = copy.deepcopy(last)
+            last.addnext(tbl)
+            elements.append(tbl)
+            last = tbl
+    for number, tbl in enumerate(elements, start=1):
+        row, column = number_cell
+        cell = tbl.tr_lst[row].tc_lst[column]
+        for paragraph in cell.p_lst[1:]:
+            cell.remove(paragraph)
+        texts = cell.xpath(".//w:t")
+        if texts:
+            texts[0].text = f"{label}{number}"
+            for t in texts[1:]:
+                t.text = ""
+    return elements
+
+
+def ranked_lawyer_groups(ranked_lawyers):
+    """Splits the ranked lawyers round-robin into (leading partners, next generation partners, associates)."""
+    return tuple(len(range(group, ranked_lawyers, 3)) for group in range(3))
+
+
+def tables_of(doc, elements):
+    by_element = {table._tbl: table for table in doc.tables}
+    return [by_element[tbl] for tbl in elements]
+
+
+def fill_chambers_matter(table, text, rows_per_matter):
+    set_text(table, 3, 0, f"{text.firm()} Holding B.V.")
+    set_text(table, 5, 0, text.paragraph())
+    set_text(table, 7, 0, f"EUR {text.random.randint(1, 900)} million")
+    set_text(table, 9, 0, "Yes, " + ", ".join(text.random.choice(["Germany", "Belgium", "France"]) for _ in range(2)))
+    set_text(table, 11, 0, ", ".join(f"{text.name()}, {text.role()}" for _ in range(rows_per_matter)))
+    set_text(table, 13, 0, "\n".join(f"{text.name()} ({text.role()})" for _ in range(rows_per_matter)))
+    set_text(table, 15, 0, "\n".join(f"{text.firm()} – Advising the {text.random.choice(['buyer', 'seller', 'lenders'])}" for _ in range(rows_per_matter)))
+    set_text(table, 17, 0, "Completed in March 2025")
+    set_text(table, 19, 0, text.sentence())
+
+
+def build_chambers_submission(text, contacts, heads, ranked_lawyers, publishable, confidential, rows_per_matter):
+    doc = open_document(str(SOURCE_TEMPLATES["chamber_l500"]))
+    # The Table objects keep pointing at their tables while others are added and removed
+    tables = doc.tables
+    confidential_tables = resize_tables(tables[24:34], confidential, (1, 0), "Confidential Matter ")
+    publishable_tables = resize_tables(tables[13:23], publishable, (1, 0), "Publishable Matter ")
+    for tbl in tables_of(doc, publishable_tables + confidential_tables):
+        fill_chambers_matter(tbl, text, rows_per_matter)
+
+    set_text(tables[0], 1, 0, f"{text.firm()} N.V.")
+    set_text(tables[1], 1, 0, "Corporate/M&A")
+    set_text(tables[2], 1, 0, "Netherlands")
+    for table, count in ((tables[3], contacts), (tables[6], heads)):
+        # Forms keep a couple of blank rows at the end, which the converter relies on
+        ensure_rows(table, 2, count + TRAILING_BLANK_ROWS)
+        for row in range(2, 2 + count):
+            set_text(table, row, 0, text.name())
+            set_text(table, row, 1, text.email())
+            set_text(table, row, 2, text.phone())
+    set_text(tables[4], 1, 0, "Corporate")
+    set_text(tables[5], 1, 0, str(text.random.randint(5, 40)))
+    set_text(tables[5], 3, 0, str(text.random.randint(10, 120)))
+
+    hires = tables[7]
+    for row in range(2, len(hires.rows) - 1):
+        set_text(hires, row, 0, text.name())
+        set_text(hires, row, 1, text.random.choice(["Joined", "Departed"]))
+        set_text(hires, row, 2, text.firm())
+
+    partners, next_generation, associates = ranked_lawyer_groups(ranked_lawyers)
+    lawyers = tables[8]
+    ensure_rows(lawyers, 2, ranked_lawyers)
+    for row in range(2, 2 + ranked_lawyers):
+        set_text(lawyers, row, 0, text.name())
+        set_text(lawyers, row, 1, text.sentence())
+        set_text(lawyers, row, 2, "Y" if row - 2 < partners + next_generation else "N")
+        set_text(lawyers, row, 3, text.random.choice(["Y", "N"]))
+
+    set_text(tables[9], 1, 0, text.paragraph())
+    set_text(tables[11], 1, 0, text.paragraph(2))
+    for table in (tables[12], tables[23]):
+        for row in range(2, len(table.rows)):
+            set_text(table, row, 1, f"{text.firm()} {text.random.randint(1, 99)} B.V.")
+            set_text(table, row, 2, text.random.choice(["Yes", "No"]))
+    return doc
+
+
+def fill_l500_person_rows(table, header_row, rows_per_matter, columns):
+    """Fills ``rows_per_matter`` rows of the section whose column headings follow ``header_row``."""
+    first = header_row + 2
+    # The empty rows of a section end at the next heading; missing ones are copies of the first
+    free = 0
+    while first + free < len(table.rows) and table.rows[first + free].cells[0].text.strip() == "":
+        free += 1
+    insert_rows(table, first, max(rows_per_matter - free, 0))
+    for row in range(first, first + rows_per_matter):
+        for column, value in columns():
+            set_text(table, row, column, value)
+
+
+def fill_l500_matter(table, text, rows_per_matter):
+    # Bottom-up, so the row indices of the sections above stay valid
+    set_text(table, 22, 0, "01/2024")
+    set_text(table, 22, 4, "03/2025")
+    fill_l500_person_rows(table, 18, rows_per_matter, lambda: [
+        (0, text.firm()), (2, text.random.choice(["Counsel to the seller", "Counsel to the lenders"])),
+        (4, text.random.choice(["Seller", "Lenders", "Target"])),
+    ])
+    fill_l500_person_rows(table, 14, rows_per_matter, lambda: [(0, text.name()), (2, "Amsterdam"), (4, "Corporate")])
+    fill_l500_person_rows(table, 10, rows_per_matter, lambda: [(0, text.name()), (2, "Amsterdam"), (4, "Corporate")])
+    set_text(table, 8, 0, text.random.choice(["Germany", "Belgium", "France"]))
+    set_text(table, 5, 1, f"EUR {text.random.randint(1, 900)} million")
+    set_text(table, 4, 0, text.paragraph())
+    set_text(table, 2, 0, f"{text.firm()} Holding B.V.")
+    set_text(table, 2, 2, "Financial services")
+
+
+def build_l500_submission(text, contacts, heads, ranked_lawyers, publishable, confidential, rows_per_matter):
+    doc = open_document(str(SOURCE_TEMPLATES["l500_chamber"]))
+    # The Table objects keep pointing at their tables while others are added and removed
+    tables = doc.tables
+    confidential_tables = resize_tables(tables[23:24], confidential, (0, 0), "Non-publishable matter ")
+    publishable_tables = resize_tables(tables[22:23], publishable, (0, 0), "Publishable matter ")
+    for tbl in tables_of(doc, publishable_tables + confidential_tables):
+        fill_l500_matter(tbl, text, rows_per_matter)
+
+    partners, next_generation, associates = ranked_lawyer_groups(ranked_lawyers)
+    ranked_tables = []
+    for run, count, label in (
+        (tables[18:20], associates, "Associate: leading associate "),
+        (tables[15:17], next_generation, "Partner: next generation partner "),
+        (tables[11:14], partners, "Partner: leading partner "),
+    ):
+        ranked_tables += resize_tables(run, count, (0, 0), label)
+    for table in tables_of(doc, ranked_tables):
+        set_text(table, 2, 0, text.name())
+        set_text(table, 2, 1, "Amsterdam")
+        set_text(table, 4, 0, text.paragraph(2))
+
+    set_text(tables[0], 0, 0, f"{text.firm()} N.V.")
+    contacts_table = tables[1]
+    ensure_rows(contacts_table, 1, contacts)
+    for row in range(1, 1 + contacts):
+        set_text(contacts_table, row, 0, text.name())
+        set_text(contacts_table, row, 1, text.role())
+        set_text(contacts_table, row, 2, text.email())
+        set_text(contacts_table, row, 3, text.phone())
+    set_text(tables[2], 0, 0, "Corporate")
+    heads_table = tables[3]
+    ensure_rows(heads_table, 1, heads)
+    for row in range(1, 1 + heads):
+        set_text(heads_table, row, 0, text.name())
+        set_text(heads_table, row, 1, "Amsterdam")
+    set_text(tables[4], 0, 1, str(text.random.randint(5, 40)))
+    set_text(tables[4], 0, 4, str(text.random.randint(10, 120)))
+    set_text(tables[5], 0, 0, text.paragraph())
+    set_text(tables[7], 0, 0, text.paragraph(2))
+    for table in (tables[8], tables[9]):
+        # The last row holds the "To add more clients" note
+        for row in range(1, len(table.rows) - 1):
+            set_text(table, row, 0, f"{text.firm()} {text.random.randint(1, 99)} B.V.")
+            set_text(table, row, 1, text.random.choice(["Yes", "No"]))
+    hires = tables[20]
+    for row in range(1, 4):
+        set_text(hires, row, 0, text.name())
+        set_text(hires, row, 1, "Partner")
+        set_text(hires, row, 2, text.random.choice(["Joined", "Departed"]))
+        set_text(hires, row, 3, text.firm())
+    return doc
+
+
+BUILDERS = {
+    "chamber_l500": build_chambers_submission,
+    "l500_chamber": build_l500_submission,
+}
+
+
+def generate(mode, seed=0, **shape):
+    """
+    Builds a synthetic source document for a conversion mode.
+
+    Args:
+        mode (str): Conversion mode the document is a source of, one of the keys of CONVERTERS.
+        seed (int): Seed of the generated text.
+        **shape: Any of the keys of DEFAULT_SHAPE: contacts, heads (heads of
+            team), ranked_lawyers, publishable and confidential (matters) and
+            rows_per_matter (lawyers, team members and other firms per matter).
+
+    Returns:
+        The .docx package as bytes.
+    """
+    unknown = set(shape) - set(DEFAULT_SHAPE)
+    if unknown:
+        raise ValueError(f"Unknown document parameters: {', '.join(sorted(unknown))}")
+    doc = BUILDERS[mode](TextSource(seed), **{**DEFAULT_SHAPE, **shape})
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+
+def add_shape_arguments(parser, defaults=None):
+    """Adds one option per key of DEFAULT_SHAPE to an argparse parser, defaulting to ``defaults`` or None."""
+    for key in DEFAULT_SHAPE:
+        default = defaults[key] if defaults else None
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, default=default)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=sorted(BUILDERS), help="Conversion mode the document is a source of")
+    parser.add_argument("output", help="Path of the .docx to write")
+    parser.add_argument("--seed", type=int, default=0)
+    add_shape_arguments(parser, DEFAULT_SHAPE)
+    args = parser.parse_args()
+
+    shape = {key: getattr(args, key) for key in DEFAULT_SHAPE}
+    with open(args.output, "wb") as f:
+        f.write(generate(args.mode, args.seed, **shape))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compares the one-table-at-a-time matter replication of the converters with
+replicate_table.
+
+Both build N numbered matter tables from the matter table of the Chambers
+template (what l500_chamber_convert does for N publishable matters) and the
+resulting documents are checked to be identical; the command exits with
+status 1 if they are not:
+
+    python -m benchmarks.table_replication [--counts 1 10 50 200] [--repeat 3]
+"""
+import argparse
+import io
+import json
+import time
+
+from lxml import etree
+
+from app.utils.conversion_engine import TEMPLATE_PATHS
+from app.utils.docx_io import open_document
+from app.utils.l500_chamber_converter import (
+    add_page_break_before_table,
+    copy_table_with_paragraphs,
+    replicate_matter_tables,
+    write_text_to_cell,
+)
+
+
+MATTER_TABLE_INDEX = 13
+HEADING = "Publishable Work Highlights in last 12 months"
+
+
+def replicate_loop(doc, count):
+    """The converters' former per-table loop."""
+    tables = len(doc.tables)
+    for i in range(count - 1):
+        copy_table_with_paragraphs(doc, MATTER_TABLE_INDEX, doc, MATTER_TABLE_INDEX)
+    # copy_table_with_paragraphs prints its errors instead of raising them
+    if len(doc.tables) != tables + count - 1:
+        raise RuntimeError(f"copy_table_with_paragraphs added {len(doc.tables) - tables} tables instead of {count - 1}")
+    for i in range(count - 1):
+        add_page_break_before_table(doc, MATTER_TABLE_INDEX + 1 + i)
+    for i in range(count):
+        write_text_to_cell(doc, MATTER_TABLE_INDEX + i, 0, 0, HEADING if i == 0 else "", 13, alignment="left")
+        write_text_to_cell(doc, MATTER_TABLE_INDEX + i, 1, 0, "Publishable Matter " + str(i + 1), 14, alignment="center")
+
+
+def replicate_batch(doc, count):
+    replicate_matter_tables(doc, MATTER_TABLE_INDEX, count, HEADING, "Publishable Matter ")
+
+
+def measure(replicate, template, count, repeat):
+    """Returns the best time in seconds over ``repeat`` runs and the resulting document XML."""
+    best = None
+    for _ in range(repeat):
+        doc = open_document(io.BytesIO(template))
+        start = time.perf_counter()
+        replicate(doc, count)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, etree.tostring(doc.element)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 50, 200], help="Numbers of matters")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the best one is kept")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    with open(TEMPLATE_PATHS["l500_chamber"], "rb") as f:
+        template = f.read()
+
+    results = []
+    for count in args.counts:
+        loop_seconds, loop_xml = measure(replicate_loop, template, count, args.repeat)
+        batch_seconds, batch_xml = measure(replicate_batch, template, count, args.repeat)
+        results.append({
+            "matters": count,
+            "loop_ms": round(loop_seconds * 1000, 2),
+            "batch_ms": round(batch_seconds * 1000, 2),
+            "speedup": round(loop_seconds / batch_seconds, 1) if batch_seconds else None,
+            "identical": loop_xml == batch_xml,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'matters':>8} {'loop ms':>10} {'batch ms':>10} {'speedup':>8} identical")
+        for result in results:
+            print(f"{result['matters']:>8} {result['loop_ms']:>10} {result['batch_ms']:>10} {result['speedup']:>8} {result['identical']}")
+
+    if not all(result["identical"] for result in results):
+        parser.exit(1, "Error: replicate_matter_tables and the per-table loop built different documents\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,35 @@
-from fastapi import APIRouter, FastAPI
+import asyncio
+
+from fastapi import APIRouter, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import process, test, user
+from app.utils.conversion_pool import conversion_pool
+from app.utils.job_queue import job_queue
+from app.utils.metrics import register_service_metrics, render_metrics
+from app.utils.result_cache import result_cache
+from app.utils.temp_files import run_janitor
 # from app.db.database import connect_to_mongo, close_mongo_connection
 
 app = FastAPI()
+janitor_task = None
+register_service_metrics(conversion_pool, job_queue, result_cache)
 
 @app.on_event("startup")
 async def startup_db_client():
     # await connect_to_mongo()
+    global janitor_task
+    await conversion_pool.start()
+    await job_queue.start(conversion_pool)
+    janitor_task = asyncio.create_task(run_janitor())
     print('startup')
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
     # await close_mongo_connection()
+    if janitor_task is not None:
+        janitor_task.cancel()
+    await job_queue.stop()
+    conversion_pool.shutdown()
     print('shutdown')
 
 # Add CORS middleware
@@ -30,4 +47,10 @@ backend_router.include_router(test.router, prefix="/test", tags=["test"])
 backend_router.include_router(user.router, prefix="/users", tags=["users"])
 backend_router.include_router(process.router, prefix="/process", tags=["process"])
 
-app.include_router(backend_router)
\ No newline at end of file
+app.include_router(backend_router)
+
+# Prometheus metrics of this process
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)